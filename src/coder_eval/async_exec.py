@@ -0,0 +1,176 @@
+import asyncio
+import os
+import signal
+import time
+from typing import Any
+from coder_eval.types import ExecResult
+
+# Bytes kept per output stream, half from the start and half from the end
+OUTPUT_LIMIT_BYTES = 64 * 1024
+# Total output across both streams after which the process is killed
+HARD_OUTPUT_LIMIT_BYTES = 16 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class BoundedBuffer:
+    """Collects a stream's bytes, keeping only its head and tail past a limit."""
+
+    def __init__(self, limit: int | None) -> None:
+        self.limit = limit
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    @property
+    def truncated(self) -> bool:
+        return self.limit is not None and self.total > self.limit
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        if self.limit is None:
+            self._head += data
+            return
+        head_room = self.limit // 2 - len(self._head)
+        if head_room > 0:
+            self._head += data[:head_room]
+            data = data[head_room:]
+        if data:
+            self._tail += data
+            excess = len(self._tail) - (self.limit - self.limit // 2)
+            if excess > 0:
+                del self._tail[:excess]
+
+    def getvalue(self) -> bytes:
+        if not self.truncated:
+            return bytes(self._head + self._tail)
+        dropped = self.total - len(self._head) - len(self._tail)
+        marker = f"\n... [{dropped} bytes truncated] ...\n".encode()
+        return bytes(self._head) + marker + bytes(self._tail)
+
+    def decode(self) -> str:
+        return self.getvalue().decode("utf-8", errors="replace").strip()
+
+
+def _kill(proc: asyncio.subprocess.Process, kill_group: bool) -> None:
+    try:
+        if kill_group:
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except ProcessLookupError:
+        pass
+
+
+async def execute(
+    cmd: list[str],
+    script: str,
+    timeout: float,
+    stdin: bytes | None = None,
+    kill_group: bool = False,
+    output_limit: int | None = OUTPUT_LIMIT_BYTES,
+    hard_output_limit: int | None = HARD_OUTPUT_LIMIT_BYTES,
+    **kwargs: Any,
+) -> ExecResult:
+    """Run a command without blocking the event loop and return an ExecResult.
+
+    The process is killed when it runs past ``timeout`` or when the calling
+    task is cancelled. With ``kill_group`` it is started in its own session
+    and the whole process group is killed, so stray children die with it.
+
+    Output is streamed from the pipes rather than buffered whole: each stream
+    keeps at most ``output_limit`` bytes (its head and tail, with
+    ``truncated`` set), and the process is killed as soon as it writes more
+    than ``hard_output_limit`` bytes in total. ``None`` disables either cap.
+    """
+    start_time = time.monotonic()
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=(
+                asyncio.subprocess.PIPE
+                if stdin is not None
+                else asyncio.subprocess.DEVNULL
+            ),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=kill_group,
+            **kwargs,
+        )
+        out = BoundedBuffer(output_limit)
+        err = BoundedBuffer(output_limit)
+        over_limit = False
+
+        async def drain(stream: asyncio.StreamReader, buffer: BoundedBuffer) -> None:
+            nonlocal over_limit
+            while not over_limit:
+                chunk = await stream.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    return
+                buffer.write(chunk)
+                if (
+                    hard_output_limit is not None
+                    and out.total + err.total > hard_output_limit
+                ):
+                    over_limit = True
+                    _kill(proc, kill_group)
+
+        async def feed() -> None:
+            if stdin is None or proc.stdin is None:
+                return
+            try:
+                proc.stdin.write(stdin)
+                await proc.stdin.drain()
+                proc.stdin.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        async def communicate() -> None:
+            assert proc.stdout is not None and proc.stderr is not None
+            await asyncio.gather(
+                feed(), drain(proc.stdout, out), drain(proc.stderr, err)
+            )
+            await proc.wait()
+
+        try:
+            await asyncio.wait_for(communicate(), timeout)
+        except asyncio.TimeoutError:
+            _kill(proc, kill_group)
+            await proc.wait()
+            return ExecResult(
+                script=script,
+                stdout="",
+                stderr="TimeoutExpired",
+                returncode=-1,
+                exec_time=float(timeout),
+                error="timeout",
+            )
+        except asyncio.CancelledError:
+            _kill(proc, kill_group)
+            # Reap it before the loop that owns its transport can close
+            await asyncio.shield(proc.wait())
+            raise
+
+        result = ExecResult(
+            script=script,
+            stdout=out.decode(),
+            stderr=err.decode(),
+            returncode=proc.returncode if proc.returncode is not None else -1,
+            exec_time=time.monotonic() - start_time,
+        )
+        if over_limit:
+            result["returncode"] = -1
+            result["error"] = "output_limit"
+        if over_limit or out.truncated or err.truncated:
+            result["truncated"] = True
+        return result
+
+    except Exception as e:
+        return ExecResult(
+            script=script,
+            stdout="",
+            stderr=str(e),
+            returncode=-1,
+            exec_time=0.0,
+            error="exception",
+        )
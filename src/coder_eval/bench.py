@@ -0,0 +1,177 @@
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+import typer
+from coder_eval import evaluate
+
+app = typer.Typer(help="Measure evaluation throughput on synthetic samples.")
+
+
+def write_synthetic_benchmark(
+    path: Path, num_completions: int, completions_per_task: int
+) -> tuple[Path, Path]:
+    """Write a HumanEval-style tasks.jsonl and matching samples.jsonl.
+
+    Every completion is distinct after normalization, so deduplication
+    doesn't shrink the workload. Returns the benchmark and samples paths.
+    """
+    bench_path = path / "bench"
+    bench_path.mkdir(parents=True, exist_ok=True)
+    samples_path = path / "samples.jsonl"
+    num_tasks = -(-num_completions // completions_per_task)
+
+    with (
+        (bench_path / "tasks.jsonl").open("w", encoding="utf-8") as tasks_file,
+        samples_path.open("w", encoding="utf-8") as samples_file,
+    ):
+        for task_idx in range(num_tasks):
+            task_id = f"bench_{task_idx}"
+            task = {
+                "id": task_id,
+                "benchmark": "humaneval",
+                "prompt": "def add(a, b):\n",
+                "entry_point": "add",
+                "reference_solution": "    return a + b\n",
+                "tests": ["def check(f):\n    assert f(1, 2) == 3"],
+            }
+            first = task_idx * completions_per_task
+            count = min(completions_per_task, num_completions - first)
+            sample = {
+                "task_id": task_id,
+                "model_name": "bench-model",
+                "completions": [
+                    f"    return a + b + {first + i} - {first + i}\n"
+                    for i in range(count)
+                ],
+            }
+            tasks_file.write(json.dumps(task) + "\n")
+            samples_file.write(json.dumps(sample) + "\n")
+
+    return bench_path, samples_path
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def simulated_exec_time(results_path: Path) -> tuple[int, float]:
+    """Count the completions in a results file and sum the time they ran."""
+    num_completions = 0
+    total = 0.0
+    with results_path.open("r", encoding="utf-8") as f:
+        for line in f:
+            for er in json.loads(line).get("results", []):
+                num_completions += 1
+                if "duplicate_of" not in er:
+                    total += er.get("exec_time", 0.0)
+    return num_completions, total
+
+
+@app.callback(invoke_without_command=True)
+def main(
+    completions: int = typer.Option(
+        10_000, min=1, help="Total number of synthetic completions."
+    ),
+    completions_per_task: int = typer.Option(
+        10, min=1, help="Completions generated for each synthetic task."
+    ),
+    workers: int = typer.Option(
+        64, min=1, help="Number of completions to execute in parallel."
+    ),
+    latency: float = typer.Option(
+        0.0, min=0.0, help="Mean simulated seconds per script."
+    ),
+    failure_rate: float = typer.Option(
+        0.1, min=0.0, max=1.0, help="Fraction of scripts that fail."
+    ),
+    batch: bool = typer.Option(
+        False, help="Run all completions of a task in a single sandbox."
+    ),
+    cache: bool = typer.Option(
+        False, help="Include the execution cache in the measured pipeline."
+    ),
+    dedup: bool = typer.Option(
+        True, help="Include deduplication in the measured pipeline."
+    ),
+    report: str = typer.Option(None, help="Path to write the report as JSON."),
+):
+    """Run evaluate end to end against a stub sandbox and report throughput."""
+    with tempfile.TemporaryDirectory(prefix="coder_eval_bench_") as temp_dir:
+        root = Path(temp_dir)
+        typer.echo(f"Generating {completions} synthetic completions")
+        bench_path, samples_path = write_synthetic_benchmark(
+            root, completions, completions_per_task
+        )
+
+        args = [
+            "--path",
+            str(bench_path),
+            "--samples",
+            str(samples_path),
+            "--output-dir",
+            str(root / "results"),
+            "--workers",
+            str(workers),
+            "--sandbox",
+            "stub",
+            "--stub-latency",
+            str(latency),
+            "--stub-failure-rate",
+            str(failure_rate),
+            "--cache-dir",
+            str(root / "cache"),
+            "--batch" if batch else "--no-batch",
+            "--cache" if cache else "--no-cache",
+            "--dedup" if dedup else "--no-dedup",
+        ]
+        command = typer.main.get_command(evaluate.app)
+        typer.echo(f"Evaluating with {workers} workers")
+        start = time.monotonic()
+        # Keep evaluate's per-task output out of the report, though it's still
+        # formatted and written, as in a real run
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            command.main(args, standalone_mode=False)
+        elapsed = time.monotonic() - start
+
+        results_path = next((root / "results").glob("*/results.jsonl"))
+        num_completions, simulated = simulated_exec_time(results_path)
+
+    # Anything beyond perfectly packing the simulated work onto every worker
+    # is time spent in the pipeline itself
+    ideal = simulated / workers
+    overhead = max(elapsed - ideal, 0.0)
+    stats = {
+        "completions": num_completions,
+        "workers": workers,
+        "latency": latency,
+        "failure_rate": failure_rate,
+        "elapsed": elapsed,
+        "completions_per_sec": num_completions / elapsed,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "ideal_elapsed": ideal,
+        "scheduler_overhead": overhead,
+        "overhead_per_completion_us": overhead / num_completions * 1e6,
+    }
+
+    print("────────────────────────────────────────────")
+    print(f"Evaluated {num_completions} completions in {elapsed:.2f}s")
+    print(f"   • Throughput: {stats['completions_per_sec']:,.0f} completions/sec")
+    print(f"   • Peak RSS: {stats['peak_rss_bytes'] / (1024 * 1024):.1f} MB")
+    print(
+        f"   • Scheduler overhead: {overhead:.2f}s over an ideal {ideal:.2f}s "
+        f"({stats['overhead_per_completion_us']:.0f} µs per completion)"
+    )
+    print("────────────────────────────────────────────")
+
+    if report:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        typer.echo(f"Wrote report to {report}")
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from coder_eval.types import ExecResult
+
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "coder-eval"
+    / "exec"
+)
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Outcomes that depend on the host rather than the script: a failure of the
+# sandbox itself, or a timeout that host load may have caused
+UNCACHED_ERRORS: list[str] = ["exception", "timeout"]
+
+
+class ExecCache:
+    """On-disk cache of ExecResults keyed by script content.
+
+    Keys hash the fully built script together with a namespace describing the
+    sandbox (image digest, resource limits, timeout), so results are reused
+    only when the same code would run under the same conditions. A timeout
+    other than the sandbox's default is part of the key too. Entries are
+    touched on every hit and the least recently used ones are evicted once
+    the cache grows past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        root: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._namespace = namespace.encode("utf-8")
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*/*.json"))
+
+    def _path(self, script: str, timeout: float | None = None) -> Path:
+        namespace = self._namespace
+        if timeout is not None:
+            namespace += f"\0timeout={float(timeout)!r}".encode("utf-8")
+        digest = hashlib.sha256(namespace + b"\0" + script.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def get(self, script: str, timeout: float | None = None) -> ExecResult | None:
+        """Return the cached result for a script, if any."""
+        path = self._path(script, timeout)
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                result: ExecResult = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        result["script"] = script
+        return result
+
+    def put(
+        self, script: str, result: ExecResult, timeout: float | None = None
+    ) -> None:
+        """Store a result, skipping sandbox failures and timeouts."""
+        if result.get("error") in UNCACHED_ERRORS:
+            return
+
+        path = self._path(script, timeout)
+        path.parent.mkdir(exist_ok=True)
+        # Phase timings describe this execution, not its outcome
+        data = json.dumps(
+            {k: v for k, v in result.items() if k not in ("script", "phases")}
+        )
+
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        # Write atomically so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under 90% of max_bytes."""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, entry in entries:
+            if self._size <= target:
+                break
+            entry.unlink(missing_ok=True)
+            self._size -= size
+
+    def wrap(self, run: Callable[..., ExecResult]) -> Callable[..., ExecResult]:
+        """Wrap a script runner so cached results skip the sandbox."""
+
+        def cached_run(script: str, timeout: float | None = None) -> ExecResult:
+            result = self.get(script, timeout)
+            if result is None:
+                result = run(script, *_timeout_args(timeout))
+                self.put(script, result, timeout)
+            return result
+
+        return cached_run
+
+    def wrap_batch(
+        self, run_batch: Callable[..., list[ExecResult]]
+    ) -> Callable[..., list[ExecResult]]:
+        """Wrap a batch runner so only uncached scripts reach the sandbox."""
+
+        def cached_run_batch(
+            scripts: list[str], timeout: float | None = None
+        ) -> list[ExecResult]:
+            results: list[ExecResult | None] = [self.get(s, timeout) for s in scripts]
+            missing = [idx for idx, r in enumerate(results) if r is None]
+            if missing:
+                fresh = run_batch(
+                    [scripts[idx] for idx in missing], *_timeout_args(timeout)
+                )
+                for idx, result in zip(missing, fresh):
+                    self.put(scripts[idx], result, timeout)
+                    results[idx] = result
+            return [r for r in results if r is not None]
+
+        return cached_run_batch
+
+    def wrap_async(
+        self, run: Callable[..., Awaitable[ExecResult]]
+    ) -> Callable[..., Awaitable[ExecResult]]:
+        """Wrap an async script runner so cached results skip the sandbox."""
+
+        async def cached_run(script: str, timeout: float | None = None) -> ExecResult:
+            result = self.get(script, timeout)
+            if result is None:
+                result = await run(script, *_timeout_args(timeout))
+                self.put(script, result, timeout)
+            return result
+
+        return cached_run
+
+    def wrap_batch_async(
+        self, run_batch: Callable[..., Awaitable[list[ExecResult]]]
+    ) -> Callable[..., Awaitable[list[ExecResult]]]:
+        """Wrap an async batch runner so only uncached scripts reach the sandbox."""
+
+        async def cached_run_batch(
+            scripts: list[str], timeout: float | None = None
+        ) -> list[ExecResult]:
+            results: list[ExecResult | None] = [self.get(s, timeout) for s in scripts]
+            missing = [idx for idx, r in enumerate(results) if r is None]
+            if missing:
+                fresh = await run_batch(
+                    [scripts[idx] for idx in missing], *_timeout_args(timeout)
+                )
+                for idx, result in zip(missing, fresh):
+                    self.put(scripts[idx], result, timeout)
+                    results[idx] = result
+            return [r for r in results if r is not None]
+
+        return cached_run_batch
+
+
+def _timeout_args(timeout: float | None) -> tuple[Any, ...]:
+    """Pass a timeout on to a runner only when one was given."""
+    return () if timeout is None else (timeout,)
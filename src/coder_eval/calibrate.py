@@ -0,0 +1,158 @@
+import json
+import os
+import tempfile
+import typer
+from pathlib import Path
+from typing import Callable
+from coder_eval.docker_utils import DEFAULT_PRELOAD, DELIVERY_MODES, MAX_CONTAINER_USES
+from coder_eval.engine import Runner, evaluate_samples
+from coder_eval.evaluate import open_sandbox, read_tasks, sandbox_profile
+from coder_eval.evaluators.common import is_passed
+from coder_eval.sandbox import SANDBOX_BACKENDS
+from coder_eval.types import Sample, Task
+from coder_eval.utils import get_benchmark_or_exit
+
+CALIBRATION_REPEATS = 3
+
+app = typer.Typer(help="Measure reference solution runtimes for adaptive timeouts.")
+
+
+def measure_reference_runtimes(
+    tasks: list[Task],
+    build_script: Callable[[Task, str], str],
+    run: Runner,
+    workers: int = 1,
+    repeats: int = CALIBRATION_REPEATS,
+) -> dict[str, float | None]:
+    """Run each task's reference solution and return its slowest runtime.
+
+    Tasks whose reference solution fails any run get None, since their
+    runtime says nothing about how long a passing completion takes.
+    """
+    pairs = (
+        (
+            task,
+            Sample(
+                task_id=task["id"],
+                model_name="reference",
+                completions=[task["reference_solution"]] * repeats,
+            ),
+        )
+        for task in tasks
+        if task.get("reference_solution")
+    )
+    runtimes: dict[str, float | None] = {}
+    for result in evaluate_samples(pairs, build_script, run, workers=workers):
+        runs = result.get("results", [])
+        runtimes[result["task_id"]] = (
+            max(er.get("exec_time", 0.0) for er in runs)
+            if runs and all(is_passed(er) for er in runs)
+            else None
+        )
+    return runtimes
+
+
+def write_tasks(path: Path, tasks: list[Task]) -> None:
+    """Replace tasks.jsonl atomically, so an interrupted write loses nothing."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for task in tasks:
+            f.write(json.dumps(task) + "\n")
+    os.replace(tmp_path, path)
+
+
+@app.callback(invoke_without_command=True)
+def calibrate(
+    path: str = typer.Option(..., help="Path to benchmark directory."),
+    sandbox: str = typer.Option(
+        "docker", help=f"Sandbox backend: {' | '.join(SANDBOX_BACKENDS)}."
+    ),
+    workers: int = typer.Option(
+        1, min=1, help="Number of reference runs to execute in parallel."
+    ),
+    namespaces: bool = typer.Option(
+        False,
+        help="Run process sandbox scripts in new user and network namespaces.",
+    ),
+    warm_pool: bool = typer.Option(
+        False, help="Reuse long-lived sandbox containers instead of one per script."
+    ),
+    max_container_uses: int = typer.Option(
+        MAX_CONTAINER_USES,
+        min=1,
+        help="Executions before a warm container is recycled.",
+    ),
+    fork_server: bool = typer.Option(
+        False,
+        help="Fork each script from a warm container's preloaded Python server.",
+    ),
+    preload: str = typer.Option(
+        ",".join(DEFAULT_PRELOAD),
+        help="Comma-separated modules the fork server imports up front.",
+    ),
+    delivery: str = typer.Option(
+        "mount",
+        help=f"How Docker scripts reach the container: {' | '.join(DELIVERY_MODES)}.",
+    ),
+    stub_latency: float = typer.Option(
+        0.0, min=0.0, help="Mean simulated seconds per script in the stub sandbox."
+    ),
+    stub_failure_rate: float = typer.Option(
+        0.0,
+        min=0.0,
+        max=1.0,
+        help="Fraction of scripts that fail in the stub sandbox.",
+    ),
+    repeats: int = typer.Option(
+        CALIBRATION_REPEATS,
+        min=1,
+        help="Runs per reference solution; the slowest one is recorded.",
+    ),
+):
+    """Record each task's reference solution runtime in tasks.jsonl."""
+    tasks_path: Path = Path(path) / "tasks.jsonl"
+    tasks: list[Task] = list(read_tasks(tasks_path).values())
+    benchmark_id: str = tasks[0]["benchmark"]
+    build_script = get_benchmark_or_exit(benchmark_id)["build_script"]
+    typer.echo(f"Calibrating {len(tasks)} tasks from {tasks_path}")
+
+    # Measure in the sandbox evaluate will use, since startup costs differ
+    with open_sandbox(
+        sandbox,
+        workers=workers,
+        warm_pool=warm_pool,
+        max_container_uses=max_container_uses,
+        namespaces=namespaces,
+        fork_server=fork_server,
+        preload=preload,
+        delivery=delivery,
+        stub_latency=stub_latency,
+        stub_failure_rate=stub_failure_rate,
+    ) as backend:
+        runtimes = measure_reference_runtimes(
+            tasks, build_script, backend.run_async, workers=workers, repeats=repeats
+        )
+        profile = sandbox_profile(backend, sandbox, warm_pool, fork_server)
+
+    for task in tasks:
+        runtime = runtimes.get(task["id"])
+        if runtime is not None:
+            task["reference_runtime"] = runtime
+            task["reference_sandbox"] = profile
+            continue
+        # Without a trustworthy runtime, evaluate uses the default timeout
+        task.pop("reference_runtime", None)
+        task.pop("reference_sandbox", None)
+        if task["id"] in runtimes:
+            typer.echo(f"⚠️ Reference solution of '{task['id']}' failed, not calibrated")
+    write_tasks(tasks_path, tasks)
+
+    calibrated = [
+        task["reference_runtime"] for task in tasks if "reference_runtime" in task
+    ]
+    typer.echo(f"Calibrated {len(calibrated)}/{len(tasks)} tasks")
+    if calibrated:
+        typer.echo(
+            f"   • Reference runtime: max {max(calibrated):.3f}s, "
+            f"mean {sum(calibrated) / len(calibrated):.3f}s"
+        )
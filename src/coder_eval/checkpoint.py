@@ -0,0 +1,97 @@
+import json
+import threading
+from pathlib import Path
+from typing import Iterator
+from coder_eval.types import ExecResult, SampleResult
+
+CHECKPOINT_FILENAME = "checkpoint.jsonl"
+
+
+class CheckpointLog:
+    """Append-only log of finished executions used to resume a run.
+
+    Each line records one (model, task_id, completion index) and its ExecResult,
+    flushed as soon as the execution finishes so an interrupted run loses
+    only the work that was in flight. Scripts are left out since they can be
+    rebuilt from the task and completion.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> "CheckpointLog":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self, model_name: str, task_id: str, completion_idx: int, result: ExecResult
+    ) -> None:
+        line = json.dumps(
+            {
+                "model_name": model_name,
+                "task_id": task_id,
+                "completion_idx": completion_idx,
+                "result": {k: v for k, v in result.items() if k != "script"},
+            }
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def read_checkpoint(
+    path: Path,
+    skip: set[tuple[str, str]] | None = None,
+    default_model: str = "",
+) -> dict[tuple[str, str, int], ExecResult]:
+    """Read finished executions from a checkpoint log, if it exists.
+
+    Entries for (model, task) pairs in ``skip`` are left out. Logs written
+    before checkpoints recorded the model are attributed to ``default_model``.
+    """
+    skip = skip or set()
+    done: dict[tuple[str, str, int], ExecResult] = {}
+    if not path.exists():
+        return done
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut off by the interruption
+                continue
+            model = entry.get("model_name", default_model)
+            if (model, entry["task_id"]) in skip:
+                continue
+            done[(model, entry["task_id"], entry["completion_idx"])] = entry["result"]
+    return done
+
+
+def iter_results_log(path: Path) -> Iterator[SampleResult]:
+    """Yield complete results from results.jsonl and drop a partial last line.
+
+    A run killed mid-write can leave a truncated line at the end of the file,
+    which is cut off so that new results can be appended after it.
+    """
+    if not path.exists():
+        return
+    valid_bytes: int = 0
+    with path.open("rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                result: SampleResult = json.loads(line)
+            except ValueError:
+                break
+            valid_bytes += len(line)
+            yield result
+    with path.open("r+b") as f:
+        f.truncate(valid_bytes)
@@ -1,10 +1,14 @@
 import typer
-from coder_eval import prepare, evaluate
+from coder_eval import bench, calibrate, dataset_cache, prepare, evaluate, merge
 
 app = typer.Typer(help="Evaluating LLMs on coding benchmarks.")
 
 app.add_typer(prepare.app, name="prepare")
+app.add_typer(calibrate.app, name="calibrate")
 app.add_typer(evaluate.app, name="evaluate")
+app.add_typer(merge.app, name="merge")
+app.add_typer(bench.app, name="bench")
+app.add_typer(dataset_cache.app, name="dataset-cache")
 
 
 def version_callback(value: bool):
@@ -0,0 +1,195 @@
+import json
+import os
+import re
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Any, cast
+import typer
+from coder_eval.types import DatasetSource, Task
+
+DEFAULT_DATASET_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "coder-eval"
+    / "datasets"
+)
+# Schema metadata key holding the DatasetSource a file was built from
+SOURCE_METADATA_KEY = b"coder_eval.source"
+TASK_COLUMNS: list[str] = [
+    "id",
+    "benchmark",
+    "prompt",
+    "entry_point",
+    "reference_solution",
+    "tests",
+    "test_setup",
+]
+
+app = typer.Typer(help="Export and import the local dataset cache.")
+
+
+def _schema() -> Any:
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            (name, pa.list_(pa.string()) if name == "tests" else pa.string())
+            for name in TASK_COLUMNS
+        ]
+    )
+
+
+def _read_source(path: Path) -> DatasetSource | None:
+    """Read the source recorded in a cache file, or None if it isn't one."""
+    import pyarrow as pa
+
+    try:
+        with pa.memory_map(str(path)) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if SOURCE_METADATA_KEY not in metadata:
+        return None
+    dataset_source: DatasetSource = json.loads(metadata[SOURCE_METADATA_KEY])
+    return dataset_source
+
+
+class DatasetCache:
+    """Normalized benchmark tasks stored locally per pinned dataset revision.
+
+    Each (dataset, config, revision) is one Arrow IPC file of Task columns,
+    read through a memory map, so a cached ``prepare`` needs neither the
+    network nor Hugging Face ``datasets``. pyarrow is imported only when a
+    file is actually read or written.
+    """
+
+    def __init__(self, root: Path = DEFAULT_DATASET_CACHE_DIR) -> None:
+        self.root = root
+
+    def path(self, source: DatasetSource) -> Path:
+        key = f"{source['path']}--{source['name'] or 'default'}--{source['revision']}"
+        return self.root / (re.sub(r"[^\w\-\.]", "_", key) + ".arrow")
+
+    def get(self, source: DatasetSource) -> list[Task] | None:
+        """Return the cached tasks for a source, or None if not cached."""
+        import pyarrow as pa
+
+        path = self.path(source)
+        if not path.exists():
+            return None
+        with pa.memory_map(str(path)) as f:
+            table = pa.ipc.open_file(f).read_all()
+            rows = table.to_pylist()
+
+        # Columns a benchmark doesn't use are stored as nulls
+        return [
+            cast(Task, {k: v for k, v in row.items() if v is not None}) for row in rows
+        ]
+
+    def put(self, source: DatasetSource, tasks: list[Task]) -> Path:
+        """Store tasks for a source, replacing any existing entry atomically."""
+        import pyarrow as pa
+
+        schema = _schema().with_metadata(
+            {SOURCE_METADATA_KEY: json.dumps(source, sort_keys=True)}
+        )
+        table = pa.Table.from_pylist(
+            [{name: task.get(name) for name in TASK_COLUMNS} for task in tasks],
+            schema=schema,
+        )
+
+        path = self.path(source)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            with pa.ipc.new_file(f, schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return path
+
+    def entries(self) -> list[tuple[Path, DatasetSource]]:
+        """Every valid cache file together with its source."""
+        if not self.root.is_dir():
+            return []
+        found = []
+        for path in sorted(self.root.glob("*.arrow")):
+            source = _read_source(path)
+            if source is not None:
+                found.append((path, source))
+        return found
+
+    def export(self, archive: Path) -> int:
+        """Write every cached dataset into a tar archive."""
+        entries = self.entries()
+        with tarfile.open(archive, "w") as tar:
+            for path, _ in entries:
+                tar.add(path, arcname=path.name)
+        return len(entries)
+
+    def import_archive(self, archive: Path) -> list[DatasetSource]:
+        """Add the datasets in a tar archive made by ``export`` to the cache."""
+        imported: list[DatasetSource] = []
+        self.root.mkdir(parents=True, exist_ok=True)
+        with tarfile.open(archive, "r") as tar:
+            for member in tar:
+                # Only take plain .arrow files, flattened into the cache root
+                if not member.isfile() or not member.name.endswith(".arrow"):
+                    continue
+                extracted = tar.extractfile(member)
+                if extracted is None:
+                    continue
+                fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(extracted.read())
+                source = _read_source(Path(tmp_path))
+                if source is None:
+                    os.remove(tmp_path)
+                    continue
+                os.replace(tmp_path, self.path(source))
+                imported.append(source)
+        return imported
+
+
+def _describe(source: DatasetSource) -> str:
+    config = f" ({source['name']})" if source["name"] else ""
+    return f"{source['path']}{config} @ {source['revision']}"
+
+
+@app.command("list")
+def list_cache(
+    cache_dir: str = typer.Option(
+        str(DEFAULT_DATASET_CACHE_DIR), help="Path to dataset cache directory."
+    ),
+):
+    """List cached datasets."""
+    entries = DatasetCache(Path(cache_dir)).entries()
+    if not entries:
+        typer.echo(f"No cached datasets in {cache_dir}")
+    for path, source in entries:
+        typer.echo(f"{_describe(source)}  {path.stat().st_size / 1024:.0f} KB")
+
+
+@app.command("export")
+def export_cache(
+    archive: str = typer.Option(..., help="Path of the tar archive to write."),
+    cache_dir: str = typer.Option(
+        str(DEFAULT_DATASET_CACHE_DIR), help="Path to dataset cache directory."
+    ),
+):
+    """Export cached datasets for seeding another machine's cache."""
+    count = DatasetCache(Path(cache_dir)).export(Path(archive))
+    typer.echo(f"Exported {count} datasets to {archive}")
+
+
+@app.command("import")
+def import_cache(
+    archive: str = typer.Option(..., help="Path of an archive made by export."),
+    cache_dir: str = typer.Option(
+        str(DEFAULT_DATASET_CACHE_DIR), help="Path to dataset cache directory."
+    ),
+):
+    """Import datasets exported from another machine's cache."""
+    if not Path(archive).is_file():
+        raise typer.BadParameter(f"Archive not found: {archive}")
+    for source in DatasetCache(Path(cache_dir)).import_archive(Path(archive)):
+        typer.echo(f"Imported {_describe(source)}")
@@ -1,4 +1,3 @@
-from coder_eval.datasets import humaneval
-from coder_eval.datasets import mbpp
-
+# Hugging Face datasets is imported inside fetch_tasks, so these modules
+# are cheap to import for their dataset sources
 __all__ = ["humaneval", "mbpp"]
@@ -1,10 +1,15 @@
-from datasets import load_dataset
-from coder_eval.types import Task
+from coder_eval.types import DatasetSource, Task
+
+SOURCE = DatasetSource(path="openai/openai_humaneval", name=None, revision="7dce605")
 
 
 def fetch_tasks() -> list[Task]:
     """Fetch and normalize tasks from Hugging Face."""
-    dataset = load_dataset("openai/openai_humaneval", split="test", revision="7dce605")
+    from datasets import load_dataset
+
+    dataset = load_dataset(
+        SOURCE["path"], SOURCE["name"], split="test", revision=SOURCE["revision"]
+    )
     tasks: list[Task] = []
     for row in dataset:
         tasks.append(
@@ -1,14 +1,16 @@
-from datasets import load_dataset
-from coder_eval.types import Task
+from coder_eval.types import DatasetSource, Task
+
+SOURCE = DatasetSource(
+    path="google-research-datasets/mbpp", name="sanitized", revision="4bb6404"
+)
 
 
 def fetch_tasks() -> list[Task]:
     """Fetch and normalize tasks from Hugging Face."""
+    from datasets import load_dataset
+
     dataset = load_dataset(
-        "google-research-datasets/mbpp",
-        "sanitized",
-        split="test",
-        revision="4bb6404",
+        SOURCE["path"], SOURCE["name"], split="test", revision=SOURCE["revision"]
     )
 
     tasks: list[Task] = []
@@ -0,0 +1,29 @@
+import ast
+import hashlib
+
+
+def normalize(script: str) -> str:
+    """Return a key shared by scripts that differ only in formatting or comments.
+
+    Scripts are compared by their AST dump, which ignores whitespace,
+    comments and line numbers but keeps every literal (docstrings included).
+    Scripts that don't parse, or nest too deeply to walk, fall back to their
+    exact text.
+    """
+    try:
+        canonical = ast.dump(ast.parse(script))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        canonical = script
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def group_duplicates(scripts: dict[int, str]) -> dict[int, list[int]]:
+    """Group script indices by normalized form.
+
+    Returns a mapping from the first index of each group to all of its
+    indices, in input order.
+    """
+    groups: dict[str, list[int]] = {}
+    for idx, script in scripts.items():
+        groups.setdefault(normalize(script), []).append(idx)
+    return {members[0]: members for members in groups.values()}
@@ -0,0 +1,111 @@
+"""Run a batch of scripts inside one sandbox container.
+
+Usage: python runner.py <timeout> <num_scripts|->
+           [<output_limit> <hard_output_limit>]
+
+Each ``scripts/<i>.py`` runs in its own child process and working directory
+with a per-child timeout. Each output stream keeps at most ``output_limit``
+bytes (head and tail), and a child is killed once it writes more than
+``hard_output_limit`` bytes. A JSON list with one result per script is
+printed to stdout. When ``num_scripts`` is ``-`` the scripts are read from
+stdin as a JSON list instead, and the working directory is emptied first
+so a reused container doesn't see the previous batch.
+
+``Capture``, ``read_output`` and ``clear_dir`` come from
+``output_capture.py``, whose source the host prepends to this one.
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+
+
+def run_one(index, timeout, output_limit, hard_output_limit):
+    run_dir = os.path.join("runs", str(index))
+    os.makedirs(run_dir)
+    shutil.copy(
+        os.path.join("scripts", "{}.py".format(index)), os.path.join(run_dir, "main.py")
+    )
+
+    start_time = time.monotonic()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=run_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=True,
+    )
+    out = Capture(output_limit)
+    err = Capture(output_limit)
+    deadline = start_time + timeout
+    outcome = read_output(
+        [proc.stdout.fileno(), proc.stderr.fileno()],
+        {proc.stdout.fileno(): out, proc.stderr.fileno(): err},
+        deadline,
+        hard_output_limit,
+    )
+    if outcome == "done":
+        try:
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            outcome = "timeout"
+    if outcome != "done":
+        # Kill the whole process group so stray children don't outlive the script
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+    proc.stdout.close()
+    proc.stderr.close()
+
+    if outcome == "timeout":
+        return {
+            "stdout": "",
+            "stderr": "TimeoutExpired",
+            "returncode": -1,
+            "exec_time": float(timeout),
+            "error": "timeout",
+        }
+
+    result = {
+        "stdout": out.text(),
+        "stderr": err.text(),
+        "returncode": proc.returncode if outcome == "done" else -1,
+        "exec_time": time.monotonic() - start_time,
+    }
+    if outcome == "output_limit":
+        result["error"] = "output_limit"
+    if outcome == "output_limit" or out.truncated or err.truncated:
+        result["truncated"] = True
+    return result
+
+
+def read_scripts():
+    """Write the scripts sent on stdin into ``scripts/`` and return their count."""
+    scripts = json.load(sys.stdin)
+    clear_dir(".")
+    os.makedirs("scripts")
+    for index, script in enumerate(scripts):
+        with open(os.path.join("scripts", "{}.py".format(index)), "w") as f:
+            f.write(script)
+    return len(scripts)
+
+
+def main():
+    timeout = float(sys.argv[1])
+    num_scripts = read_scripts() if sys.argv[2] == "-" else int(sys.argv[2])
+    output_limit = int(sys.argv[3]) if len(sys.argv) > 3 else 64 * 1024
+    hard_output_limit = int(sys.argv[4]) if len(sys.argv) > 4 else 16 * 1024 * 1024
+    results = [
+        run_one(i, timeout, output_limit, hard_output_limit) for i in range(num_scripts)
+    ]
+    sys.stdout.write(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Fork server that runs scripts inside a warm sandbox container.
+
+Usage: python -c <source> <module,module,...>
+
+The listed modules are imported once up front. The server then reads one
+JSON request per line on stdin ({"script": ..., "timeout": ...}, plus
+optional "output_limit" and "hard_output_limit" byte caps, and "clear" to
+empty the run directory first), forks a child per request that runs the
+script as a fresh ``__main__`` module with its own process group and
+captured output, and writes one JSON result per line to stdout.
+
+``Capture``, ``read_output`` and ``clear_dir`` come from
+``output_capture.py``, whose source the host prepends to this one.
+"""
+
+import importlib
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+import types
+
+RUN_DIR = "/workspace"
+OUTPUT_LIMIT = 64 * 1024
+HARD_OUTPUT_LIMIT = 16 * 1024 * 1024
+
+
+def run_child(script, out_fd, err_fd, protocol_fd):
+    """Run a script in the forked child and exit with its return code."""
+    os.setsid()
+    os.close(protocol_fd)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    os.chdir(RUN_DIR)
+
+    main = types.ModuleType("__main__")
+    main.__file__ = os.path.join(RUN_DIR, "main.py")
+    sys.modules["__main__"] = main
+    sys.argv = ["main.py"]
+
+    code = 0
+    try:
+        exec(compile(script, "main.py", "exec"), main.__dict__)
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        # Drop this frame so the traceback matches running ``python main.py``
+        etype, value, tb = sys.exc_info()
+        traceback.print_exception(etype, value, tb.tb_next)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+    os._exit(code & 0xFF)
+
+
+def wait_until(pid, deadline):
+    """Wait for the child to exit, returning its status or None on timeout."""
+    while True:
+        done_pid, status = os.waitpid(pid, os.WNOHANG)
+        if done_pid:
+            return status
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.002)
+
+
+def handle(request, protocol_fd):
+    script = request["script"]
+    timeout = float(request["timeout"])
+    output_limit = int(request.get("output_limit", OUTPUT_LIMIT))
+    hard_output_limit = int(request.get("hard_output_limit", HARD_OUTPUT_LIMIT))
+    if request.get("clear"):
+        clear_dir(RUN_DIR)
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    start_time = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        run_child(script, out_w, err_w, protocol_fd)
+    os.close(out_w)
+    os.close(err_w)
+
+    deadline = start_time + timeout
+    out = Capture(output_limit)
+    err = Capture(output_limit)
+    outcome = read_output(
+        [out_r, err_r], {out_r: out, err_r: err}, deadline, hard_output_limit
+    )
+    status = wait_until(pid, deadline) if outcome == "done" else None
+    if outcome == "done" and status is None:
+        outcome = "timeout"
+    # Kill the script on timeout, and anything it left running in its group
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    if status is None:
+        os.waitpid(pid, 0)
+    os.close(out_r)
+    os.close(err_r)
+
+    if outcome == "output_limit":
+        return {
+            "stdout": out.text(),
+            "stderr": err.text(),
+            "returncode": -1,
+            "exec_time": time.monotonic() - start_time,
+            "error": "output_limit",
+            "truncated": True,
+        }
+
+    if outcome == "timeout":
+        return {
+            "stdout": "",
+            "stderr": "TimeoutExpired",
+            "returncode": -1,
+            "exec_time": timeout,
+            "error": "timeout",
+        }
+
+    if os.WIFSIGNALED(status):
+        returncode = -os.WTERMSIG(status)
+    else:
+        returncode = os.WEXITSTATUS(status)
+
+    result = {
+        "stdout": out.text(),
+        "stderr": err.text(),
+        "returncode": returncode,
+        "exec_time": time.monotonic() - start_time,
+    }
+    if out.truncated or err.truncated:
+        result["truncated"] = True
+    return result
+
+
+def main():
+    for name in filter(None, sys.argv[1].split(",") if len(sys.argv) > 1 else []):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    # Keep the protocol stream private so nothing else can write to it
+    protocol = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+
+    protocol.write(json.dumps({"ready": True}) + "\n")
+    protocol.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        result = handle(json.loads(line), protocol.fileno())
+        protocol.write(json.dumps(result) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Output capture shared by the batch runner and the fork server.
+
+Both run as a single ``python -c`` source inside the sandbox, so this file
+can't be imported there. Its source is prepended to theirs on the host
+instead (see ``docker_utils.sandbox_script_source``).
+"""
+
+import os
+import select
+import shutil
+import time
+
+
+class Capture:
+    """Keeps the head and tail of a stream once it grows past ``limit``."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.total = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+
+    def write(self, data):
+        self.total += len(data)
+        head_room = self.limit // 2 - len(self.head)
+        if head_room > 0:
+            self.head += data[:head_room]
+            data = data[head_room:]
+        if data:
+            self.tail += data
+            excess = len(self.tail) - (self.limit - self.limit // 2)
+            if excess > 0:
+                del self.tail[:excess]
+
+    @property
+    def truncated(self):
+        return self.total > self.limit
+
+    def text(self):
+        data = bytes(self.head)
+        if self.truncated:
+            dropped = self.total - len(self.head) - len(self.tail)
+            data += "\n... [{} bytes truncated] ...\n".format(dropped).encode()
+        data += bytes(self.tail)
+        return data.decode("utf-8", errors="replace")
+
+
+def read_output(fds, captures, deadline, hard_output_limit):
+    """Read pipes until they close, returning "done", "timeout" or "output_limit"."""
+    open_fds = list(fds)
+    while open_fds:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return "timeout"
+        ready, _, _ = select.select(open_fds, [], [], remaining)
+        for fd in ready:
+            data = os.read(fd, 65536)
+            if not data:
+                open_fds.remove(fd)
+                continue
+            captures[fd].write(data)
+            if sum(c.total for c in captures.values()) > hard_output_limit:
+                return "output_limit"
+    return "done"
+
+
+def clear_dir(path):
+    """Empty a directory a previous script may have left files in."""
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path, ignore_errors=True)
+        else:
+            os.remove(entry.path)
@@ -0,0 +1,57 @@
+"""Run a task's tests one at a time after a completion has been defined.
+
+This file's source is appended to per-test scripts, followed by a call to
+``_coder_eval_run_tests``. Each test runs in the script's own globals, so
+it sees everything the completion defined. Failing tests print their
+traceback to stderr as an uncaught exception would. With ``fail_fast`` the
+remaining tests are skipped after the first failure.
+
+The outcome of each test, with its duration, is written as one JSON line
+prefixed with ``marker`` to ``out_fd``, a copy of stdout taken before the
+completion ran, so a completion that replaces or closes ``sys.stdout``
+can't lose it. The host strips that line from stdout.
+"""
+
+
+def _coder_eval_run_tests(tests, fail_fast, marker, out_fd):
+    import json
+    import linecache
+    import os
+    import sys
+    import time
+    import traceback
+
+    namespace = globals()
+    outcomes = []
+    for index, test in enumerate(tests):
+        filename = "<test {}>".format(index)
+        # Let tracebacks show the failing line of the test
+        linecache.cache[filename] = (len(test), None, test.splitlines(True), filename)
+        start = time.perf_counter()
+        try:
+            exec(compile(test, filename, "exec"), namespace)
+        except BaseException as e:
+            outcomes.append(
+                {
+                    "passed": False,
+                    "time": time.perf_counter() - start,
+                    "error": traceback.format_exception_only(type(e), e)[-1].strip(),
+                }
+            )
+            # Drop this frame so the traceback starts at the test
+            tb = sys.exc_info()[2]
+            traceback.print_exception(type(e), e, tb.tb_next if tb else None)
+            if fail_fast:
+                break
+        else:
+            outcomes.append({"passed": True, "time": time.perf_counter() - start})
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    report = json.dumps({"total": len(tests), "tests": outcomes})
+    os.write(out_fd, "\n{}{}\n".format(marker, report).encode("utf-8"))
+    passed = len(outcomes) == len(tests) and all(o["passed"] for o in outcomes)
+    raise SystemExit(0 if passed else 1)
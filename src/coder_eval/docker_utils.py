@@ -1,13 +1,75 @@
+import asyncio
 import tempfile
 import subprocess
+import json
 import os
+import queue
 import shutil
-import time
+import threading
+import uuid
+from functools import cache
 from pathlib import Path
+from typing import Any
+from coder_eval.async_exec import (
+    HARD_OUTPUT_LIMIT_BYTES,
+    OUTPUT_LIMIT_BYTES,
+    execute,
+)
+from coder_eval.profiling import PhaseTimer
 from coder_eval.types import ExecResult
 
 DOCKER_IMAGE = "coder-eval-python"
 DOCKERFILE_PATH = Path(__file__).parent / "docker" / "Dockerfile"
+# The scripts under docker/ run inside the sandbox, so they must stay
+# compatible with the image's Python and use only the standard library
+BATCH_RUNNER_PATH = Path(__file__).parent / "docker" / "batch_runner.py"
+FORK_SERVER_PATH = Path(__file__).parent / "docker" / "fork_server.py"
+OUTPUT_CAPTURE_PATH = Path(__file__).parent / "docker" / "output_capture.py"
+
+EXEC_TIMEOUT = 10
+MAX_CONTAINER_USES = 50
+# Extra time allowed for a batch container beyond its per-script timeouts
+BATCH_OVERHEAD = 30
+CONTAINER_START_TIMEOUT = 60
+SLOT_POLL_INTERVAL = 0.005
+# Extra time the host waits for a fork server reply beyond the script timeout
+FORK_SERVER_SLACK = 5
+# Largest fork server reply line, which carries a script's full output
+FORK_SERVER_LINE_LIMIT = 64 * 1024 * 1024
+# Modules the fork server imports once, covering common MBPP test imports
+DEFAULT_PRELOAD: list[str] = [
+    "collections",
+    "functools",
+    "heapq",
+    "itertools",
+    "math",
+    "re",
+    "sys",
+]
+
+# How scripts reach the container: written to a bind-mounted host directory,
+# or streamed over stdin into a container with a private scratch tmpfs
+DELIVERY_MODES: list[str] = ["mount", "stdin"]
+SCRATCH_TMPFS = "/workspace:rw,size=64m"
+# Clears the scratch space left by the previous script in a warm container
+CLEAR_SCRATCH = "find /workspace -mindepth 1 -delete"
+
+# Restrictions shared by one-shot and pooled sandbox containers
+SANDBOX_FLAGS: list[str] = [
+    "--network",
+    "none",
+    "--memory",
+    "256m",
+    "--cpus",
+    "0.5",
+    "--security-opt",
+    "no-new-privileges",
+    "--cap-drop",
+    "ALL",
+    "--pids-limit",
+    "64",
+    "--read-only",
+]
 
 
 def ensure_docker_image() -> None:
@@ -43,76 +105,684 @@ def ensure_docker_image() -> None:
         print(f"✅ Successfully built '{DOCKER_IMAGE}'")
 
 
-def run_script(script: str) -> ExecResult:
+def get_image_digest() -> str:
+    """Return the content digest of the local sandbox image."""
+    proc = subprocess.run(
+        ["docker", "image", "inspect", "--format", "{{.Id}}", DOCKER_IMAGE],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return proc.stdout.strip()
+
+
+@cache
+def sandbox_script_source(path: Path) -> str:
+    """Source of the batch runner or fork server, with the helpers they share."""
+    return OUTPUT_CAPTURE_PATH.read_text() + "\n\n" + path.read_text()
+
+
+def sandbox_fingerprint(runner: str = "python", delivery: str = "mount") -> str:
+    """Describe the image and limits that determine an execution's outcome."""
+    fingerprint = {
+        "image": get_image_digest(),
+        "flags": SANDBOX_FLAGS,
+        "timeout": EXEC_TIMEOUT,
+        "output_limit": OUTPUT_LIMIT_BYTES,
+        "runner": runner,
+    }
+    # Scripts read from stdin report "<stdin>" in tracebacks instead of main.py
+    if delivery != "mount":
+        fingerprint["delivery"] = delivery
+    return json.dumps(fingerprint, sort_keys=True)
+
+
+def _workspace_flags(workspace: str | None) -> list[str]:
+    """Mount a host workspace, or give the container a scratch tmpfs instead."""
+    if workspace is None:
+        return ["--tmpfs", SCRATCH_TMPFS, "-w", "/workspace"]
+    return ["-v", f"{workspace}:/workspace", "-w", "/workspace"]
+
+
+def _container_name() -> str:
+    return f"coder_eval_{uuid.uuid4().hex}"
+
+
+async def _kill_container(name: str) -> None:
+    await execute(["docker", "kill", name], "", timeout=CONTAINER_START_TIMEOUT)
+
+
+async def _execute_container(
+    name: str, cmd: list[str], script: str, timeout: float, **kwargs: Any
+) -> ExecResult:
+    """Run a ``docker run --name <name>`` command and its container.
+
+    Killing the docker client on a timeout, the output limit or cancellation
+    leaves the container running, where a runaway script would keep using
+    CPU and filling its log. So the container is killed by name as well.
+    """
+    try:
+        result = await execute(cmd, script, timeout=timeout, **kwargs)
+    except asyncio.CancelledError:
+        await asyncio.shield(_kill_container(name))
+        raise
+    if "error" in result:
+        await _kill_container(name)
+    return result
+
+
+def run_script(
+    script: str, timeout: float = EXEC_TIMEOUT, delivery: str = "mount"
+) -> ExecResult:
     """Run arbitrary Python code safely inside a Docker container."""
-    temp_dir = tempfile.mkdtemp(prefix="coder_eval_")
-    script_path = os.path.join(temp_dir, "main.py")
+    return asyncio.run(run_script_async(script, timeout, delivery))
+
 
-    # Write the script to a temporary file
-    with open(script_path, "w") as f:
-        f.write(script)
+async def run_script_async(
+    script: str, timeout: float = EXEC_TIMEOUT, delivery: str = "mount"
+) -> ExecResult:
+    """Run arbitrary Python code inside a Docker container without blocking.
+
+    With ``delivery="stdin"`` the script is piped into ``python -`` and
+    the host writes no files at all.
+    """
+    timer = PhaseTimer()
+    name = _container_name()
+    if delivery == "stdin":
+        cmd = [
+            "docker",
+            "run",
+            "--rm",
+            "--name",
+            name,
+            "-i",
+            *SANDBOX_FLAGS,
+            *_workspace_flags(None),
+            DOCKER_IMAGE,
+            "python",
+            "-",
+        ]
+        with timer.phase("run"):
+            result = await _execute_container(
+                name, cmd, script, timeout, stdin=script.encode("utf-8")
+            )
+        return timer.attach(result)
+
+    with timer.phase("prepare"):
+        temp_dir = tempfile.mkdtemp(prefix="coder_eval_")
+        script_path = os.path.join(temp_dir, "main.py")
+
+        # Write the script to a temporary file
+        with open(script_path, "w") as f:
+            f.write(script)
 
     cmd = [
         "docker",
         "run",
         "--rm",
-        "--network",
-        "none",
-        "--memory",
-        "256m",
-        "--cpus",
-        "0.5",
-        "--security-opt",
-        "no-new-privileges",
-        "--cap-drop",
-        "ALL",
-        "--pids-limit",
-        "64",
-        "--read-only",
-        "-v",
-        f"{temp_dir}:/workspace",
-        "-w",
-        "/workspace",
+        "--name",
+        name,
+        *SANDBOX_FLAGS,
+        *_workspace_flags(temp_dir),
         DOCKER_IMAGE,
         "python",
         "main.py",
     ]
 
-    start_time = time.time()
-
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        elapsed = time.time() - start_time
+        with timer.phase("run"):
+            result = await _execute_container(name, cmd, script, timeout)
+    finally:
+        with timer.phase("teardown"):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return timer.attach(result)
 
-        result: ExecResult = ExecResult(
-            script=script,
-            stdout=proc.stdout.strip(),
-            stderr=proc.stderr.strip(),
-            returncode=proc.returncode,
-            exec_time=elapsed,
-        )
 
-    except subprocess.TimeoutExpired:
-        result = ExecResult(
-            script=script,
-            stdout="",
-            stderr="TimeoutExpired",
-            returncode=-1,
-            exec_time=10.0,
-            error="timeout",
-        )
+def _write_batch(workspace: str, scripts: list[str]) -> None:
+    """Write a batch of scripts and the batch runner into a workspace."""
+    scripts_dir = os.path.join(workspace, "scripts")
+    os.makedirs(scripts_dir)
+    for idx, script in enumerate(scripts):
+        with open(os.path.join(scripts_dir, f"{idx}.py"), "w") as f:
+            f.write(script)
+    with open(os.path.join(workspace, "runner.py"), "w") as f:
+        f.write(sandbox_script_source(BATCH_RUNNER_PATH))
+
+
+def _batch_args(scripts: list[str], timeout: float, delivery: str) -> list[str]:
+    # Over stdin the runner takes its source as an argument and the scripts
+    # as a JSON list, so nothing is written on the host
+    runner = (
+        ["python", "-c", sandbox_script_source(BATCH_RUNNER_PATH)]
+        if delivery == "stdin"
+        else ["python", "runner.py"]
+    )
+    return [
+        *runner,
+        str(timeout),
+        "-" if delivery == "stdin" else str(len(scripts)),
+        str(OUTPUT_LIMIT_BYTES),
+        str(HARD_OUTPUT_LIMIT_BYTES),
+    ]
+
+
+async def _execute_batch(
+    cmd: list[str],
+    scripts: list[str],
+    timeout: float,
+    delivery: str,
+    container: str | None = None,
+) -> tuple[list[ExecResult], bool]:
+    """Run a batch runner command and split its output into ExecResults.
+
+    The flag is False when the runner itself failed rather than a script.
+    ``container`` names the one-shot container ``cmd`` starts, so that it
+    can be killed along with the command.
+    """
+    # The runner caps each script's output, and truncating its JSON would
+    # lose every result, so the runner's own output is not capped
+    options: dict[str, Any] = dict(
+        stdin=json.dumps(scripts).encode("utf-8") if delivery == "stdin" else None,
+        output_limit=None,
+        hard_output_limit=None,
+    )
+    outer_timeout = timeout * len(scripts) + BATCH_OVERHEAD
+    outer: ExecResult = (
+        await _execute_container(container, cmd, "", outer_timeout, **options)
+        if container is not None
+        else await execute(cmd, "", timeout=outer_timeout, **options)
+    )
 
-    except Exception as e:
-        result = ExecResult(
+    if "error" not in outer and outer["returncode"] == 0:
+        try:
+            runs: list[ExecResult] = json.loads(outer["stdout"])
+        except ValueError:
+            outer = ExecResult(
+                stderr=f"Invalid batch runner output: {outer['stdout'][:200]}",
+                error="exception",
+            )
+        else:
+            results: list[ExecResult] = []
+            for script, run in zip(scripts, runs):
+                run["script"] = script
+                run["stdout"] = run["stdout"].strip()
+                run["stderr"] = run["stderr"].strip()
+                results.append(run)
+            return results, True
+
+    # The container itself failed, so every script in the batch failed with it
+    failed: list[ExecResult] = [
+        ExecResult(
             script=script,
             stdout="",
-            stderr=str(e),
+            stderr=outer.get("stderr", ""),
             returncode=-1,
             exec_time=0.0,
-            error="exception",
+            error=outer.get("error", "exception"),
         )
+        for script in scripts
+    ]
+    return failed, False
+
 
+def run_batch(
+    scripts: list[str], timeout: float = EXEC_TIMEOUT, delivery: str = "mount"
+) -> list[ExecResult]:
+    """Run several scripts in one Docker container, each in its own process."""
+    return asyncio.run(run_batch_async(scripts, timeout, delivery))
+
+
+async def run_batch_async(
+    scripts: list[str], timeout: float = EXEC_TIMEOUT, delivery: str = "mount"
+) -> list[ExecResult]:
+    """Run several scripts in one Docker container without blocking."""
+    if not scripts:
+        return []
+
+    timer = PhaseTimer()
+    name = _container_name()
+    if delivery == "stdin":
+        cmd = [
+            "docker",
+            "run",
+            "--rm",
+            "--name",
+            name,
+            "-i",
+            *SANDBOX_FLAGS,
+            *_workspace_flags(None),
+            DOCKER_IMAGE,
+            *_batch_args(scripts, timeout, delivery),
+        ]
+        with timer.phase("run"):
+            results = (
+                await _execute_batch(cmd, scripts, timeout, delivery, container=name)
+            )[0]
+        return timer.attach_all(results)
+
+    with timer.phase("prepare"):
+        temp_dir = tempfile.mkdtemp(prefix="coder_eval_")
+        _write_batch(temp_dir, scripts)
+
+    cmd = [
+        "docker",
+        "run",
+        "--rm",
+        "--name",
+        name,
+        *SANDBOX_FLAGS,
+        *_workspace_flags(temp_dir),
+        DOCKER_IMAGE,
+        *_batch_args(scripts, timeout, delivery),
+    ]
+
+    try:
+        with timer.phase("run"):
+            results = (
+                await _execute_batch(cmd, scripts, timeout, delivery, container=name)
+            )[0]
     finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        with timer.phase("teardown"):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    return timer.attach_all(results)
 
-    return result
+
+def _failed(script: str, message: str) -> ExecResult:
+    return ExecResult(
+        script=script,
+        stdout="",
+        stderr=message,
+        returncode=-1,
+        exec_time=0.0,
+        error="exception",
+    )
+
+
+class _Container:
+    """A long-lived sandbox container with its own workspace.
+
+    The workspace is a mounted host directory, or None when scripts arrive
+    over stdin and the container keeps its scratch space on a tmpfs.
+    """
+
+    def __init__(self, container_id: str, workspace: str | None) -> None:
+        self.container_id = container_id
+        self.workspace = workspace
+        self.uses = 0
+        self.server: asyncio.subprocess.Process | None = None
+        self.server_loop: asyncio.AbstractEventLoop | None = None
+
+    async def start_server(self, preload: list[str]) -> None:
+        """Start the fork server and wait until it has imported ``preload``."""
+        self.server = await asyncio.create_subprocess_exec(
+            "docker",
+            "exec",
+            "-i",
+            self.container_id,
+            "python",
+            "-c",
+            sandbox_script_source(FORK_SERVER_PATH),
+            ",".join(preload),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=FORK_SERVER_LINE_LIMIT,
+        )
+        self.server_loop = asyncio.get_running_loop()
+        assert self.server.stdout is not None
+        ready = await asyncio.wait_for(
+            self.server.stdout.readline(), CONTAINER_START_TIMEOUT
+        )
+        if not ready:
+            raise RuntimeError("Fork server exited during startup")
+
+    async def run_on_server(
+        self, script: str, timeout: float, clear: bool = False
+    ) -> tuple[ExecResult, bool]:
+        """Send a script to the fork server.
+
+        The flag is False when the server itself failed, in which case the
+        container should be discarded. Timed-out scripts are killed by the
+        server, so they leave the container healthy. With ``clear`` the
+        server empties its run directory before forking the script.
+        """
+        assert self.server is not None
+        assert self.server.stdin is not None and self.server.stdout is not None
+        request = (
+            json.dumps(
+                {
+                    "script": script,
+                    "timeout": timeout,
+                    "output_limit": OUTPUT_LIMIT_BYTES,
+                    "hard_output_limit": HARD_OUTPUT_LIMIT_BYTES,
+                    **({"clear": True} if clear else {}),
+                }
+            )
+            + "\n"
+        )
+        try:
+            self.server.stdin.write(request.encode("utf-8"))
+            await self.server.stdin.drain()
+            line = await asyncio.wait_for(
+                self.server.stdout.readline(), timeout + FORK_SERVER_SLACK
+            )
+            if not line:
+                raise RuntimeError("Fork server exited")
+            result: ExecResult = json.loads(line)
+        except asyncio.TimeoutError:
+            timed_out = ExecResult(
+                script=script,
+                stdout="",
+                stderr="TimeoutExpired",
+                returncode=-1,
+                exec_time=float(timeout),
+                error="timeout",
+            )
+            return timed_out, False
+        except Exception as e:
+            return _failed(script, str(e)), False
+
+        result["script"] = script
+        result["stdout"] = result["stdout"].strip()
+        result["stderr"] = result["stderr"].strip()
+        return result, True
+
+    def stop_server(self) -> None:
+        if self.server is not None and self.server.returncode is None:
+            try:
+                self.server.kill()
+            except ProcessLookupError:
+                pass
+
+    @classmethod
+    async def start(cls, delivery: str = "mount") -> "_Container":
+        workspace = (
+            None if delivery == "stdin" else tempfile.mkdtemp(prefix="coder_eval_pool_")
+        )
+        started = await execute(
+            [
+                "docker",
+                "run",
+                "-d",
+                "--rm",
+                "--init",
+                *SANDBOX_FLAGS,
+                *_workspace_flags(workspace),
+                DOCKER_IMAGE,
+                "sleep",
+                "infinity",
+            ],
+            "",
+            timeout=CONTAINER_START_TIMEOUT,
+        )
+        if "error" in started or started["returncode"] != 0:
+            if workspace is not None:
+                shutil.rmtree(workspace, ignore_errors=True)
+            raise RuntimeError(
+                f"Failed to start sandbox container: {started['stderr']}"
+            )
+        return cls(started["stdout"], workspace)
+
+    def reset_workspace(self) -> None:
+        """Remove files left behind in the workspace by the previous script."""
+        if self.workspace is None:
+            return
+        for entry in os.scandir(self.workspace):
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+
+    async def remove_async(self) -> None:
+        self.stop_server()
+        if self.server is not None and self.server_loop is asyncio.get_running_loop():
+            await self.server.wait()
+        await execute(
+            ["docker", "rm", "-f", self.container_id],
+            "",
+            timeout=CONTAINER_START_TIMEOUT,
+        )
+        if self.workspace is not None:
+            shutil.rmtree(self.workspace, ignore_errors=True)
+
+    def remove(self) -> None:
+        self.stop_server()
+        subprocess.run(
+            ["docker", "rm", "-f", self.container_id],
+            capture_output=True,
+            text=True,
+        )
+        if self.workspace is not None:
+            shutil.rmtree(self.workspace, ignore_errors=True)
+
+
+class ContainerPool:
+    """A pool of warm sandbox containers that scripts are dispatched into.
+
+    Containers are started lazily, up to ``size`` at a time, with the same
+    restrictions as ``run_script``. A container is replaced after a crash or
+    timeout (a timed-out script may still be running inside it) and after
+    ``max_uses`` executions, so state leaking between scripts stays bounded.
+
+    With ``fork_server``, each container runs a long-lived server that has
+    already imported ``preload`` and forks a fresh child per script, so
+    scripts skip interpreter startup and common imports. The server kills
+    timed-out scripts itself, so timeouts don't cost a container.
+
+    Free slots live in a thread-safe queue that async callers poll, so the
+    pool is not tied to a single event loop and the sync wrappers work too.
+    A fork server belongs to the event loop that started it, so a container
+    used from another loop is replaced.
+
+    With ``delivery="stdin"`` containers get a scratch tmpfs instead of a
+    mounted host directory, scripts are piped into ``python -`` (or sent to
+    the fork server) and the scratch space is cleared inside the container.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_uses: int = MAX_CONTAINER_USES,
+        fork_server: bool = False,
+        preload: list[str] | None = None,
+        delivery: str = "mount",
+    ) -> None:
+        self.max_uses = max_uses
+        self.fork_server = fork_server
+        self.delivery = delivery
+        self.preload = DEFAULT_PRELOAD if preload is None else preload
+        self._slots: queue.Queue[_Container | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._containers: set[_Container] = set()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def __enter__(self) -> "ContainerPool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    async def _acquire(self, timer: PhaseTimer) -> _Container:
+        while True:
+            try:
+                container = self._slots.get_nowait()
+                break
+            except queue.Empty:
+                await asyncio.sleep(SLOT_POLL_INTERVAL)
+
+        if container is not None:
+            if (
+                not self.fork_server
+                or container.server_loop is asyncio.get_running_loop()
+            ):
+                return container
+            await self._discard(container)
+
+        with timer.phase("start"):
+            try:
+                container = await _Container.start(self.delivery)
+            except BaseException:
+                self._slots.put(None)
+                raise
+            with self._lock:
+                self._containers.add(container)
+            if self.fork_server:
+                try:
+                    await container.start_server(self.preload)
+                except BaseException:
+                    await self._discard(container)
+                    self._slots.put(None)
+                    raise
+        return container
+
+    async def _discard(self, container: _Container) -> None:
+        with self._lock:
+            self._containers.discard(container)
+        await container.remove_async()
+
+    async def _release(self, container: _Container, healthy: bool) -> None:
+        if healthy and container.uses < self.max_uses:
+            self._slots.put(container)
+            return
+        try:
+            await self._discard(container)
+        finally:
+            self._slots.put(None)
+
+    def run(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        """Run a script inside a warm container from the pool."""
+        return asyncio.run(self.run_async(script, timeout))
+
+    async def run_async(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        """Run a script inside a warm container without blocking."""
+        timer = PhaseTimer()
+        try:
+            container = await self._acquire(timer)
+        except Exception as e:
+            return _failed(script, str(e))
+
+        healthy = False
+        try:
+            stdin = self.delivery == "stdin"
+            if not stdin:
+                with timer.phase("prepare"):
+                    container.reset_workspace()
+                    if not self.fork_server:
+                        path = os.path.join(container.workspace or "", "main.py")
+                        with open(path, "w") as f:
+                            f.write(script)
+
+            with timer.phase("run"):
+                if self.fork_server:
+                    result, healthy = await container.run_on_server(
+                        script, timeout, clear=stdin
+                    )
+                else:
+                    cmd = (
+                        [
+                            "docker",
+                            "exec",
+                            "-i",
+                            container.container_id,
+                            "sh",
+                            "-c",
+                            f"{CLEAR_SCRATCH} && exec python -",
+                        ]
+                        if stdin
+                        else [
+                            "docker",
+                            "exec",
+                            container.container_id,
+                            "python",
+                            "main.py",
+                        ]
+                    )
+                    result = await execute(
+                        cmd,
+                        script,
+                        timeout=timeout,
+                        stdin=script.encode("utf-8") if stdin else None,
+                    )
+                    # 125-127 are docker errors and negative codes mean the exec
+                    # died, so the container can no longer be trusted
+                    healthy = "error" not in result and 0 <= result["returncode"] < 125
+            container.uses += 1
+        finally:
+            with timer.phase("teardown"):
+                await self._release(container, healthy)
+
+        return timer.attach(result)
+
+    def run_batch(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        """Run several scripts in one warm container, each in its own process."""
+        return asyncio.run(self.run_batch_async(scripts, timeout))
+
+    async def run_batch_async(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        """Run several scripts in one warm container without blocking."""
+        if not scripts:
+            return []
+
+        timer = PhaseTimer()
+        try:
+            container = await self._acquire(timer)
+        except Exception as e:
+            return [_failed(script, str(e)) for script in scripts]
+
+        healthy = False
+        stdin = self.delivery == "stdin"
+        try:
+            if self.fork_server:
+                # The server already runs each script in its own child
+                results = []
+                for script in scripts:
+                    if not stdin:
+                        with timer.phase("prepare"):
+                            container.reset_workspace()
+                    with timer.phase("run"):
+                        result, healthy = await container.run_on_server(
+                            script, timeout, clear=stdin
+                        )
+                    results.append(result)
+                    if not healthy:
+                        break
+                results += [
+                    _failed(script, "Fork server failed")
+                    for script in scripts[len(results) :]
+                ]
+            else:
+                if not stdin:
+                    with timer.phase("prepare"):
+                        container.reset_workspace()
+                        _write_batch(container.workspace or "", scripts)
+                with timer.phase("run"):
+                    results, healthy = await _execute_batch(
+                        [
+                            "docker",
+                            "exec",
+                            *(["-i"] if stdin else []),
+                            container.container_id,
+                            *_batch_args(scripts, timeout, self.delivery),
+                        ],
+                        scripts,
+                        timeout,
+                        self.delivery,
+                    )
+            container.uses += 1
+        finally:
+            with timer.phase("teardown"):
+                await self._release(container, healthy)
+
+        return timer.attach_all(results)
+
+    def close(self) -> None:
+        """Remove every container started by the pool."""
+        with self._lock:
+            containers = list(self._containers)
+            self._containers.clear()
+        for container in containers:
+            container.remove()
@@ -0,0 +1,354 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from coder_eval.dedup import group_duplicates
+from coder_eval.docker_utils import run_script_async
+from coder_eval.evaluators.common import is_passed, summarize
+from coder_eval.shard import in_shard
+from coder_eval.types import Task, Sample, SampleResult, ExecResult
+
+# Tasks submitted ahead of the oldest unfinished one, per worker
+WINDOW_PER_WORKER = 4
+
+Runner = Callable[[str], ExecResult] | Callable[[str], Awaitable[ExecResult]]
+BatchRunner = (
+    Callable[[list[str]], list[ExecResult]]
+    | Callable[[list[str]], Awaitable[list[ExecResult]]]
+)
+
+
+class _LongestFirst:
+    """Admits at most ``limit`` jobs at once, the costliest waiting job first.
+
+    Slots are handed out on the next loop iteration rather than on request,
+    so jobs submitted together compete on cost instead of arrival. Equal
+    costs keep their submission order.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._free = limit
+        self._waiting: list[tuple[float, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._wake_scheduled = False
+
+    def _wake(self) -> None:
+        self._wake_scheduled = False
+        while self._free and self._waiting:
+            _, _, waiter = heapq.heappop(self._waiting)
+            if not waiter.done():
+                self._free -= 1
+                waiter.set_result(None)
+
+    def _release(self) -> None:
+        self._free += 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, cost: float) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiting, (-cost, next(self._order), waiter))
+        if not self._wake_scheduled:
+            self._wake_scheduled = True
+            loop.call_soon(self._wake)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Pass on a slot granted just as the job was cancelled
+            if not waiter.cancelled():
+                self._release()
+            raise
+        try:
+            yield
+        finally:
+            self._release()
+
+
+async def evaluate_samples_async(
+    pairs: Iterable[tuple[Task, Sample]],
+    build_script: Callable[[Task, str], str],
+    run: Runner = run_script_async,
+    workers: int = 1,
+    run_batch: BatchRunner | None = None,
+    done: dict[tuple[str, str, int], ExecResult] | None = None,
+    on_exec: Callable[[str, str, int, ExecResult], None] | None = None,
+    early_stop: bool = False,
+    dedup: bool = False,
+    shard: tuple[int, int] | None = None,
+    task_timeout: Callable[[Task], float | None] | None = None,
+    read_result: Callable[[Task, ExecResult], ExecResult] | None = None,
+    prescreen: Callable[[Task, str, str], ExecResult | None] | None = None,
+    job_cost: Callable[[Task], float] | None = None,
+) -> AsyncGenerator[SampleResult, None]:
+    """Run every (task, completion) pair with at most ``workers`` in flight.
+
+    Each completion is scheduled as its own job, so a task with many
+    completions is spread over all workers. When ``run_batch`` is given, all
+    completions of a task are sent to the sandbox as one job instead. Async
+    runners are awaited directly; sync runners are moved to a thread pool.
+
+    Executions already in ``done`` (keyed by model name, task ID and
+    completion index) are reused without running, and ``on_exec`` is called
+    with the same key and the result as each new execution finishes.
+
+    With ``early_stop``, once any completion of a task passes, its
+    completions that have not started yet are reported as skipped. Batches
+    always run whole, so early stopping only applies to per-completion jobs.
+
+    With ``dedup``, completions of a task whose scripts are identical up to
+    formatting and comments run once; the other copies get the same result
+    with ``duplicate_of`` set to the completion index that actually ran.
+
+    With ``shard`` as (i, N), only the completions that ``in_shard`` assigns
+    to shard i are run. Each SampleResult then also records the indices of
+    its ``results`` in ``completion_indices`` and the task's total number of
+    completions in ``num_completions``, so shards can be merged afterwards.
+
+    ``task_timeout`` gives each task's per-script timeout, which is passed to
+    the runners after the script(s); None leaves the sandbox's default.
+    ``read_result`` post-processes each fresh ExecResult of a task on the
+    host, for example to pull a test report out of its stdout.
+
+    ``prescreen`` is called with the task, completion and script before a
+    completion is scheduled; if it returns a result, that is used instead
+    and the completion never reaches the sandbox.
+
+    ``job_cost`` estimates how long one completion of a task runs. Waiting
+    jobs then start longest-expected-first (a batch counts as its number of
+    scripts), so slow tasks don't end up alone at the tail of the run.
+    Without it, jobs start in submission order.
+
+    Pairs are consumed lazily and only a bounded window of tasks is in flight
+    at once. One SampleResult per pair is yielded in input order as soon as
+    it and every pair before it have finished.
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _LongestFirst(workers)
+    threads = ThreadPoolExecutor(max_workers=workers)
+    window: int = workers * WINDOW_PER_WORKER
+    pending: deque[asyncio.Task[SampleResult]] = deque()
+    done = done or {}
+
+    async def call(fn: Callable[..., Any], *args: Any) -> Any:
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args)
+        return await loop.run_in_executor(threads, fn, *args)
+
+    async def execute(
+        model: str,
+        task: Task,
+        idx: int,
+        script: str,
+        timeout: tuple[float, ...],
+        stop: asyncio.Event | None,
+    ) -> ExecResult | None:
+        async with limiter.slot(job_cost(task) if job_cost else 0.0):
+            if stop is not None and stop.is_set():
+                return None
+            result: ExecResult = await call(run, script, *timeout)
+        if read_result is not None:
+            result = read_result(task, result)
+        if on_exec is not None:
+            on_exec(model, task["id"], idx, result)
+        if stop is not None and is_passed(result):
+            stop.set()
+        return result
+
+    async def execute_batch(
+        model: str,
+        task: Task,
+        indices: list[int],
+        scripts: list[str],
+        timeout: tuple[float, ...],
+    ) -> list[ExecResult]:
+        assert run_batch is not None
+        cost: float = job_cost(task) * len(scripts) if job_cost else 0.0
+        async with limiter.slot(cost):
+            results: list[ExecResult] = await call(run_batch, scripts, *timeout)
+        if read_result is not None:
+            results = [read_result(task, result) for result in results]
+        if on_exec is not None:
+            for idx, result in zip(indices, results):
+                on_exec(model, task["id"], idx, result)
+        return results
+
+    async def evaluate_pair(task: Task, sample: Sample) -> SampleResult:
+        model: str = sample["model_name"]
+        completions: list[str] = sample["completions"]
+        selected: list[int] = [
+            idx
+            for idx in range(len(completions))
+            if shard is None or in_shard(model, task["id"], idx, shard)
+        ]
+        scripts: dict[int, str] = {
+            idx: build_script(task, completions[idx]) for idx in selected
+        }
+        results: dict[int, ExecResult | None] = {idx: None for idx in selected}
+        limit: float | None = task_timeout(task) if task_timeout else None
+        timeout: tuple[float, ...] = () if limit is None else (limit,)
+        todo: list[int] = []
+        for idx in selected:
+            if (model, task["id"], idx) in done:
+                results[idx] = {
+                    **done[(model, task["id"], idx)],
+                    "script": scripts[idx],
+                }
+                continue
+            screened: ExecResult | None = (
+                prescreen(task, completions[idx], scripts[idx]) if prescreen else None
+            )
+            if screened is None:
+                todo.append(idx)
+                continue
+            results[idx] = screened
+            if on_exec is not None:
+                on_exec(model, task["id"], idx, screened)
+
+        groups: dict[int, list[int]] = (
+            group_duplicates({idx: scripts[idx] for idx in todo})
+            if dedup
+            else {idx: [idx] for idx in todo}
+        )
+        unique: list[int] = list(groups)
+
+        if run_batch is not None:
+            if unique:
+                batch_results = await execute_batch(
+                    model,
+                    task,
+                    unique,
+                    [scripts[idx] for idx in unique],
+                    timeout,
+                )
+                for idx, result in zip(unique, batch_results):
+                    results[idx] = result
+        else:
+            stop: asyncio.Event | None = None
+            if early_stop:
+                stop = asyncio.Event()
+                if any(r is not None and is_passed(r) for r in results.values()):
+                    stop.set()
+            ran = await asyncio.gather(
+                *(
+                    execute(model, task, idx, scripts[idx], timeout, stop)
+                    for idx in unique
+                )
+            )
+            for idx, maybe_result in zip(unique, ran):
+                results[idx] = maybe_result
+
+        # Fan each unique result back out to its duplicates
+        for rep, members in groups.items():
+            rep_result = results[rep]
+            if rep_result is None:
+                continue
+            for idx in members[1:]:
+                copy: ExecResult = {
+                    **rep_result,
+                    "script": scripts[idx],
+                    "duplicate_of": rep,
+                }
+                results[idx] = copy
+                if on_exec is not None:
+                    on_exec(model, task["id"], idx, copy)
+
+        executed: list[ExecResult] = [r for r in results.values() if r is not None]
+        skipped: list[int] = [idx for idx, r in results.items() if r is None]
+        summary: SampleResult = summarize(
+            task, sample, executed, skipped if early_stop else None
+        )
+        if shard is not None:
+            summary["completion_indices"] = [
+                idx for idx, r in results.items() if r is not None
+            ]
+            summary["num_completions"] = len(completions)
+        return summary
+
+    try:
+        for task, sample in pairs:
+            pending.append(asyncio.ensure_future(evaluate_pair(task, sample)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # Cancel in-flight work (killing its processes) on Ctrl-C or early exit
+        for future in pending:
+            future.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        threads.shutdown(wait=False, cancel_futures=True)
+
+
+def evaluate_samples(
+    pairs: Iterable[tuple[Task, Sample]],
+    build_script: Callable[[Task, str], str],
+    run: Runner = run_script_async,
+    workers: int = 1,
+    run_batch: BatchRunner | None = None,
+    done: dict[tuple[str, str, int], ExecResult] | None = None,
+    on_exec: Callable[[str, str, int, ExecResult], None] | None = None,
+    early_stop: bool = False,
+    dedup: bool = False,
+    shard: tuple[int, int] | None = None,
+    task_timeout: Callable[[Task], float | None] | None = None,
+    read_result: Callable[[Task, ExecResult], ExecResult] | None = None,
+    prescreen: Callable[[Task, str, str], ExecResult | None] | None = None,
+    job_cost: Callable[[Task], float] | None = None,
+) -> Iterator[SampleResult]:
+    """Synchronous wrapper around ``evaluate_samples_async``.
+
+    The engine runs on a private event loop that is driven while waiting for
+    the next result, so consumers should keep per-result work short.
+    """
+    loop = asyncio.new_event_loop()
+    results = evaluate_samples_async(
+        pairs,
+        build_script,
+        run,
+        workers=workers,
+        run_batch=run_batch,
+        done=done,
+        on_exec=on_exec,
+        early_stop=early_stop,
+        dedup=dedup,
+        shard=shard,
+        task_timeout=task_timeout,
+        read_result=read_result,
+        prescreen=prescreen,
+        job_cost=job_cost,
+    )
+    step: asyncio.Future[SampleResult] | None = None
+    try:
+        while True:
+            step = asyncio.ensure_future(results.__anext__(), loop=loop)
+            try:
+                yield loop.run_until_complete(step)
+            except StopAsyncIteration:
+                break
+    finally:
+        # A Ctrl-C inside run_until_complete leaves the generator mid-step,
+        # so cancel it and every job it started, and let their cancellation
+        # (which kills the sandboxes) finish before the loop goes away
+        if step is not None and not step.done():
+            step.cancel()
+        unfinished = asyncio.all_tasks(loop)
+        if unfinished:
+            for task in unfinished:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*unfinished, return_exceptions=True))
+        loop.run_until_complete(results.aclose())
+        loop.close()
@@ -1,22 +1,63 @@
+import cProfile
+import functools
+import itertools
 import json
 import re
 import typer
+from contextlib import ExitStack
 from pathlib import Path
 from datetime import datetime
-from coder_eval.docker_utils import ensure_docker_image
+from typing import Awaitable, Callable, Iterable, Iterator, TextIO
+from coder_eval.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ExecCache
+from coder_eval.checkpoint import (
+    CHECKPOINT_FILENAME,
+    CheckpointLog,
+    iter_results_log,
+    read_checkpoint,
+)
+from coder_eval.docker_utils import (
+    DEFAULT_PRELOAD,
+    DELIVERY_MODES,
+    MAX_CONTAINER_USES,
+)
+from coder_eval.engine import evaluate_samples
+from coder_eval.evaluators.common import PRESCREEN_ERRORS
+from coder_eval.parquet_output import (
+    OUTPUT_FORMATS,
+    PARQUET_FILENAME,
+    ParquetResultsWriter,
+)
+from coder_eval.profiling import PhaseProfile, print_profile
+from coder_eval.sandbox import SANDBOX_BACKENDS, Sandbox, create_sandbox
+from coder_eval.schedule import expected_cost, read_exec_times
+from coder_eval.shard import format_shard, parse_shard
+from coder_eval.timeouts import (
+    TIMEOUT_CEILING,
+    TIMEOUT_FLOOR,
+    TIMEOUT_MULTIPLIER,
+    derive_timeout,
+    timing_profile,
+)
 from coder_eval.utils import get_benchmark_or_exit
-from coder_eval.types import Task, BenchmarkConfig, Sample, SampleResult
+from coder_eval.types import Task, BenchmarkConfig, Sample, SampleResult, ExecResult
 
 app = typer.Typer(help="Evaluate generated model outputs against benchmarks.")
 
 
 def create_results_dir(
-    path: Path, output_dir: Path | None, benchmark: str, model: str
+    path: Path,
+    output_dir: Path | None,
+    benchmark: str,
+    model: str,
+    shard: tuple[int, int] | None = None,
 ) -> Path:
     """Create a results directory for the evaluation."""
     results_root: Path = output_dir or (path / "results")
     timestamp: str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename: str = re.sub(r"[^\w\-\.]", "_", f"{timestamp}_{benchmark}_{model}")
+    name: str = f"{timestamp}_{benchmark}_{model}"
+    if shard is not None:
+        name += f"_shard{shard[0]}of{shard[1]}"
+    filename: str = re.sub(r"[^\w\-\.]", "_", name)
     outdir: Path = results_root / filename
     outdir.mkdir(parents=True, exist_ok=True)
     return outdir
@@ -38,29 +79,218 @@ def read_tasks(path: Path) -> dict[str, Task]:
     return tasks_data
 
 
-def read_samples(path: Path) -> list[Sample]:
-    """Read samples.jsonl from path."""
+def iter_samples(path: Path) -> Iterator[Sample]:
+    """Lazily read samples.jsonl from path, one sample at a time."""
     try:
-        with path.open("r", encoding="utf-8") as f:
-            samples_data: list[Sample] = [
-                json.loads(line) for line in f if line.strip()
-            ]
+        f = path.open("r", encoding="utf-8")
     except FileNotFoundError as exc:
         raise typer.BadParameter(f"Samples file not found: {path}") from exc
-    if not samples_data:
+    found: bool = False
+    with f:
+        for line in f:
+            if line.strip():
+                found = True
+                yield json.loads(line)
+    if not found:
         raise typer.BadParameter("No samples found in samples.jsonl")
-    return samples_data
+
+
+def read_samples(path: Path) -> list[Sample]:
+    """Read samples.jsonl from path."""
+    return list(iter_samples(path))
+
+
+def iter_pairs(
+    samples: Iterable[Sample], tasks_data: dict[str, Task]
+) -> Iterator[tuple[Task, Sample]]:
+    """Match samples to tasks, skipping unknown tasks and repeated (model, task)."""
+    processed: set[tuple[str, str]] = set()
+    for sample_idx, sample in enumerate(samples):
+        key = (sample["model_name"], sample["task_id"])
+        if key in processed:
+            typer.echo(
+                f"⚠️ Task ID '{sample['task_id']}' appears again for model "
+                f"'{sample['model_name']}' in sample {sample_idx}, skipping"
+            )
+            continue
+        processed.add(key)
+        if sample["task_id"] not in tasks_data:
+            typer.echo(
+                f"⚠️ Task ID '{sample['task_id']}' not found for sample {sample_idx}, skipping"
+            )
+            continue
+        yield tasks_data[sample["task_id"]], sample
+
+
+class RunStats:
+    """Running aggregates over SampleResults as they are produced."""
+
+    def __init__(self) -> None:
+        self.evaluated_tasks: int = 0
+        self.passed_tasks: int = 0
+        self.num_execs: int = 0
+        self.total_exec_time: float = 0.0
+        self.max_exec_time: float = 0.0
+        self.num_results: int = 0
+        self.num_duplicates: int = 0
+        # Individual tests, for benchmarks that report them (partial credit)
+        self.tests_passed: int = 0
+        self.tests_total: int = 0
+        self.num_prescreened: int = 0
+        # Per-task counts kept for pass@k, two ints per task
+        self.num_samples: list[int] = []
+        self.num_correct: list[int] = []
+
+    def add(self, result: SampleResult) -> None:
+        self.evaluated_tasks += 1
+        if result.get("passed_any", False):
+            self.passed_tasks += 1
+        num_passed = result.get("num_passed", 0)
+        self.num_samples.append(num_passed + result.get("num_failed", 0))
+        self.num_correct.append(num_passed)
+        for er in result.get("results", []):
+            self.num_results += 1
+            if "num_tests" in er:
+                # Tests skipped after a failure count as failed
+                self.tests_total += er["num_tests"]
+                self.tests_passed += sum(1 for t in er["tests"] if t.get("passed"))
+            if "duplicate_of" in er:
+                # Copied from another completion, so it never ran
+                self.num_duplicates += 1
+                continue
+            if er.get("error") in PRESCREEN_ERRORS:
+                # Rejected on the host, so it never ran either
+                self.num_prescreened += 1
+                continue
+            exec_time = er.get("exec_time")
+            if exec_time is not None:
+                self.num_execs += 1
+                self.total_exec_time += exec_time
+                self.max_exec_time = max(self.max_exec_time, exec_time)
+
+
+def check_sandbox_options(sandbox: str, delivery: str) -> None:
+    """Reject sandbox backends and delivery modes that don't exist."""
+    if sandbox not in SANDBOX_BACKENDS:
+        raise typer.BadParameter(
+            f"Sandbox '{sandbox}' not supported, use one of: {', '.join(SANDBOX_BACKENDS)}"
+        )
+    if delivery not in DELIVERY_MODES:
+        raise typer.BadParameter(
+            f"Delivery '{delivery}' not supported, use one of: {', '.join(DELIVERY_MODES)}"
+        )
+
+
+def open_sandbox(
+    sandbox: str,
+    workers: int,
+    warm_pool: bool,
+    max_container_uses: int,
+    namespaces: bool,
+    fork_server: bool,
+    preload: str,
+    delivery: str,
+    stub_latency: float,
+    stub_failure_rate: float,
+) -> Sandbox:
+    """Create the sandbox described by the sandbox CLI options.
+
+    ``evaluate`` and ``calibrate`` share these options and build their
+    sandbox here, so a calibration measures the setup a run with the same
+    options executes in.
+    """
+    check_sandbox_options(sandbox, delivery)
+    return create_sandbox(
+        sandbox,
+        workers=workers,
+        warm_pool=warm_pool,
+        max_uses=max_container_uses,
+        namespaces=namespaces,
+        fork_server=fork_server,
+        preload=[m.strip() for m in preload.split(",") if m.strip()],
+        delivery=delivery,
+        stub_latency=stub_latency,
+        stub_failure_rate=stub_failure_rate,
+    )
+
+
+def sandbox_profile(
+    backend: Sandbox, sandbox: str, warm_pool: bool, fork_server: bool
+) -> str:
+    """The timing profile of a sandbox created by ``open_sandbox``."""
+    return timing_profile(
+        backend.fingerprint(),
+        warm=sandbox == "docker" and (warm_pool or fork_server),
+    )
+
+
+def adaptive_timeouts(
+    tasks: dict[str, Task],
+    profile: str,
+    multiplier: float,
+    floor: float,
+    ceiling: float,
+) -> Callable[[Task], float | None] | None:
+    """Per-task timeouts from runtimes calibrated in this run's sandbox.
+
+    Runtimes measured in another sandbox setup, or by a calibration that
+    didn't record one, are ignored with a warning: a fork server runtime
+    would time out nearly every one-shot container, for example.
+    """
+    calibrated = [task for task in tasks.values() if "reference_runtime" in task]
+    matching = sum(1 for task in calibrated if task.get("reference_sandbox") == profile)
+    if len(calibrated) > matching:
+        typer.echo(
+            f"⚠️ {len(calibrated) - matching} tasks were calibrated in a different "
+            "sandbox setup and keep the default timeout; rerun `coder-eval "
+            "calibrate` with this run's sandbox options"
+        )
+    if not matching:
+        return None
+    typer.echo(f"Adaptive timeouts for {matching}/{len(tasks)} calibrated tasks")
+    return functools.partial(
+        derive_timeout,
+        multiplier=multiplier,
+        floor=floor,
+        ceiling=ceiling,
+        sandbox=profile,
+    )
+
+
+def parse_ks(value: str | None) -> list[int]:
+    """Parse a comma-separated list of k values such as '1,10,100'."""
+    if not value:
+        return []
+    try:
+        ks = sorted({int(k) for k in value.split(",") if k.strip()})
+    except ValueError as exc:
+        raise typer.BadParameter(f"Invalid k values: {value}") from exc
+    if any(k < 1 for k in ks):
+        raise typer.BadParameter("k values must be positive")
+    return ks
+
+
+def print_task_result(result: SampleResult) -> None:
+    """Print a one-line status for an evaluated task."""
+    task_id = result.get("task_id", "unknown")
+    passed_any = result.get("passed_any", False)
+    num_passed = result.get("num_passed", 0)
+    num_failed = result.get("num_failed", 0)
+
+    status_icon = "✅" if passed_any else "❌"
+    print(f"{status_icon} {task_id:<15} | pass={num_passed:<2} fail={num_failed:<2}")
 
 
 def print_results(
-    results: list[SampleResult],
+    stats: RunStats,
     benchmark_name: str,
     model_name: str,
     total_tasks: int,
+    pass_at: dict[int, float | None] | None = None,
 ) -> None:
     """Print benchmark evaluation summary to console."""
-    evaluated_tasks = len(results)
-    total_passed = sum(1 for r in results if r.get("passed_any", False))
+    evaluated_tasks = stats.evaluated_tasks
+    total_passed = stats.passed_tasks
     evaluated_failed = evaluated_tasks - total_passed
     unevaluated_tasks = total_tasks - evaluated_tasks
 
@@ -84,46 +314,310 @@ def print_results(
         f"   • Overall: {total_passed}/{total_tasks} ({total_passed / total_tasks:.1%})"
     )
 
-    print("────────────────────────────────────────────")
+    for k, score in (pass_at or {}).items():
+        if score is None:
+            print(f"   • pass@{k}: n/a (no task has {k} samples)")
+        else:
+            print(f"   • pass@{k}: {score:.1%}")
 
-    for r in results:
-        task_id = r.get("task_id", "unknown")
-        passed_any = r.get("passed_any", False)
-        num_passed = r.get("num_passed", 0)
-        num_failed = r.get("num_failed", 0)
+    if stats.tests_total:
+        print(
+            f"   • Tests passed: {stats.tests_passed}/{stats.tests_total} "
+            f"({stats.tests_passed / stats.tests_total:.1%})"
+        )
 
-        status_icon = "✅" if passed_any else "❌"
+    if stats.num_duplicates:
         print(
-            f"{status_icon} {task_id:<15} | pass={num_passed:<2} fail={num_failed:<2}"
+            f"   • Deduplicated: {stats.num_duplicates}/{stats.num_results} completions "
+            f"({stats.num_duplicates / stats.num_results:.1%}) reused another's result"
         )
 
-    all_exec_times = [
-        er.get("exec_time", 0.0)
-        for r in results
-        for er in r.get("results", [])
-        if er.get("exec_time") is not None
-    ]
+    if stats.num_prescreened:
+        print(
+            f"   • Pre-screened: {stats.num_prescreened}/{stats.num_results} completions "
+            f"({stats.num_prescreened / stats.num_results:.1%}) failed without running"
+        )
 
-    if all_exec_times:
-        avg_time = sum(all_exec_times) / len(all_exec_times)
-        max_time = max(all_exec_times)
-        print("\n⏱️  Avg exec time: {:.2f}s (max {:.2f}s)".format(avg_time, max_time))
+    if stats.num_execs:
+        avg_time = stats.total_exec_time / stats.num_execs
+        print(
+            "\n⏱️  Avg exec time: {:.2f}s (max {:.2f}s)".format(
+                avg_time, stats.max_exec_time
+            )
+        )
 
     print("────────────────────────────────────────────")
 
 
+def summarize_run(
+    stats: RunStats,
+    benchmark_name: str,
+    model_name: str,
+    total_tasks: int,
+    pass_at: dict[int, float | None],
+) -> dict:
+    """Aggregate scores of one model's run as written to summary.json."""
+    return {
+        "benchmark": benchmark_name,
+        "model_name": model_name,
+        "total_tasks": total_tasks,
+        "evaluated_tasks": stats.evaluated_tasks,
+        "passed_any": stats.passed_tasks,
+        "pass_at_k": {str(k): score for k, score in pass_at.items()},
+        "avg_exec_time": (
+            stats.total_exec_time / stats.num_execs if stats.num_execs else None
+        ),
+        "max_exec_time": stats.max_exec_time,
+        "dedup_ratio": (
+            stats.num_duplicates / stats.num_results if stats.num_results else 0.0
+        ),
+        "prescreened": stats.num_prescreened,
+        "test_pass_rate": (
+            stats.tests_passed / stats.tests_total if stats.tests_total else None
+        ),
+    }
+
+
+def write_summary(path: Path, summary: dict) -> None:
+    """Write an evaluation summary to a JSON file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+
+def model_dir_name(model_name: str) -> str:
+    """A filesystem-safe directory name for a model's results."""
+    return re.sub(r"[^\w\-\.]", "_", model_name)
+
+
+def split_results_by_model(results_path: Path, models_dir: Path) -> None:
+    """Copy each model's lines of results.jsonl into its own results file."""
+    files: dict[str, TextIO] = {}
+    try:
+        with results_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                model_name = json.loads(line)["model_name"]
+                if model_name not in files:
+                    model_path = models_dir / model_dir_name(model_name)
+                    model_path.mkdir(parents=True, exist_ok=True)
+                    files[model_name] = (model_path / "results.jsonl").open(
+                        "w", encoding="utf-8"
+                    )
+                files[model_name].write(line)
+    finally:
+        for model_file in files.values():
+            model_file.close()
+
+
+def print_comparison(
+    benchmark_name: str, summaries: dict[str, dict], ks: list[int]
+) -> None:
+    """Print one line per model so several models can be compared at a glance."""
+    print(f"Models compared on {benchmark_name}")
+    header = f"   {'model':<30}{'passed':>10}" + "".join(
+        f"{f'pass@{k}':>10}" for k in ks
+    )
+    print(header)
+    for model_name, summary in summaries.items():
+        evaluated = summary["evaluated_tasks"]
+        passed = f"{summary['passed_any'] / evaluated:.1%}" if evaluated else "n/a"
+        cells = "".join(
+            f"{score:>10.1%}" if score is not None else f"{'n/a':>10}"
+            for score in (summary["pass_at_k"][str(k)] for k in ks)
+        )
+        print(f"   {model_name:<30}{passed:>10}{cells}")
+
+
+def report_results(
+    results_dir: Path,
+    stats: dict[str, RunStats],
+    benchmark_name: str,
+    total_tasks: int,
+    ks: list[int],
+    first_model: str,
+    shard: tuple[int, int] | None = None,
+) -> None:
+    """Print each model's scores and write summary.json next to results.jsonl."""
+    # numpy is only needed here, so keep it out of CLI startup
+    from coder_eval.metrics import mean_pass_at_k
+
+    stats.setdefault(first_model, RunStats())
+    summaries: dict[str, dict] = {}
+    for name, model_stats in stats.items():
+        pass_at: dict[int, float | None] = mean_pass_at_k(
+            model_stats.num_samples, model_stats.num_correct, ks
+        )
+        print_results(
+            model_stats,
+            benchmark_name,
+            name,
+            total_tasks=total_tasks,
+            pass_at=pass_at,
+        )
+        summaries[name] = summarize_run(
+            model_stats, benchmark_name, name, total_tasks, pass_at
+        )
+
+    if len(summaries) == 1:
+        summary: dict = summaries[first_model]
+    else:
+        # Give every model the same files a single-model run would have
+        print_comparison(benchmark_name, summaries, ks)
+        models_dir: Path = results_dir / "models"
+        split_results_by_model(results_dir / "results.jsonl", models_dir)
+        for name, model_summary in summaries.items():
+            write_summary(
+                models_dir / model_dir_name(name) / "summary.json", model_summary
+            )
+        summary = {
+            "benchmark": benchmark_name,
+            "total_tasks": total_tasks,
+            "models": summaries,
+        }
+    if shard is not None:
+        # Scores of one shard only cover its slice; merge recomputes them
+        summary["shard"] = format_shard(shard)
+    write_summary(results_dir / "summary.json", summary)
+
+
 @app.callback(invoke_without_command=True)
 def evaluate(
     path: str = typer.Option(..., help="Path to benchmark directory."),
     samples: str = typer.Option(..., help="Path to JSONL file with model samples."),
     output_dir: str = typer.Option(None, help="Path to results directory."),
+    workers: int = typer.Option(
+        1, min=1, help="Number of completions to execute in parallel."
+    ),
+    sandbox: str = typer.Option(
+        "docker", help=f"Sandbox backend: {' | '.join(SANDBOX_BACKENDS)}."
+    ),
+    namespaces: bool = typer.Option(
+        False,
+        help="Run process sandbox scripts in new user and network namespaces.",
+    ),
+    warm_pool: bool = typer.Option(
+        False, help="Reuse long-lived sandbox containers instead of one per script."
+    ),
+    max_container_uses: int = typer.Option(
+        MAX_CONTAINER_USES,
+        min=1,
+        help="Executions before a warm container is recycled.",
+    ),
+    fork_server: bool = typer.Option(
+        False,
+        help="Fork each script from a warm container's preloaded Python server.",
+    ),
+    preload: str = typer.Option(
+        ",".join(DEFAULT_PRELOAD),
+        help="Comma-separated modules the fork server imports up front.",
+    ),
+    delivery: str = typer.Option(
+        "mount",
+        help=f"How Docker scripts reach the container: {' | '.join(DELIVERY_MODES)}.",
+    ),
+    stub_latency: float = typer.Option(
+        0.0, min=0.0, help="Mean simulated seconds per script in the stub sandbox."
+    ),
+    stub_failure_rate: float = typer.Option(
+        0.0,
+        min=0.0,
+        max=1.0,
+        help="Fraction of scripts that fail in the stub sandbox.",
+    ),
+    batch: bool = typer.Option(
+        False, help="Run all completions of a task in a single sandbox."
+    ),
+    cache: bool = typer.Option(
+        True, help="Reuse results of previously executed identical scripts."
+    ),
+    cache_dir: str = typer.Option(
+        str(DEFAULT_CACHE_DIR), help="Path to execution cache directory."
+    ),
+    cache_max_mb: int = typer.Option(
+        DEFAULT_MAX_BYTES // (1024 * 1024),
+        min=1,
+        help="Size in MB above which least recently used cache entries are evicted.",
+    ),
+    resume: str = typer.Option(
+        None, help="Results directory of an interrupted run to continue."
+    ),
+    early_stop: bool = typer.Option(
+        False, help="Stop running a task's completions once one passes."
+    ),
+    k: str = typer.Option(
+        None, help="Comma-separated k values to report pass@k for, e.g. 1,10,100."
+    ),
+    dedup: bool = typer.Option(
+        True,
+        help="Run completions that are identical up to formatting and comments once.",
+    ),
+    profile: bool = typer.Option(
+        False, help="Print per-phase execution time percentiles after the run."
+    ),
+    cprofile: str = typer.Option(
+        None, help="Path to write a cProfile dump of the host-side evaluation loop."
+    ),
+    output_format: str = typer.Option(
+        "jsonl",
+        help=f"Results format: {' | '.join(OUTPUT_FORMATS)}. "
+        "Parquet is written alongside results.jsonl, one row per execution.",
+    ),
+    shard: str = typer.Option(
+        None,
+        help="Evaluate only slice i of N, e.g. 2/4. "
+        "Combine the slices with `coder-eval merge`.",
+    ),
+    prescreen: bool = typer.Option(
+        True,
+        help="Fail empty, unparseable and entry-point-less completions "
+        "without running them.",
+    ),
+    adaptive_timeout: bool = typer.Option(
+        True,
+        help="Time out calibrated tasks relative to their reference runtime "
+        "(see `coder-eval calibrate`).",
+    ),
+    timeout_multiplier: float = typer.Option(
+        TIMEOUT_MULTIPLIER,
+        min=1.0,
+        help="Adaptive timeout as a multiple of the reference runtime.",
+    ),
+    timeout_floor: float = typer.Option(
+        TIMEOUT_FLOOR, min=0.0, help="Shortest adaptive timeout in seconds."
+    ),
+    timeout_ceiling: float = typer.Option(
+        TIMEOUT_CEILING, min=0.0, help="Longest adaptive timeout in seconds."
+    ),
+    longest_first: bool = typer.Option(
+        True,
+        help="Start the completions expected to run longest first, "
+        "so slow tasks don't finish last.",
+    ),
+    history: list[str] = typer.Option(
+        None,
+        help="Results directory of a previous run whose execution times "
+        "estimate each task's runtime. Repeat for several runs.",
+    ),
 ):
     """Evaluate generated samples."""
+    ks: list[int] = parse_ks(k)
+    if ks and early_stop:
+        raise typer.BadParameter(
+            "--k can't be combined with --early-stop: skipped completions "
+            "would leave the samples a task passed on, inflating pass@k"
+        )
+    try:
+        shard_spec: tuple[int, int] | None = parse_shard(shard)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    if output_format not in OUTPUT_FORMATS:
+        raise typer.BadParameter(
+            f"Output format '{output_format}' not supported, use one of: "
+            f"{', '.join(OUTPUT_FORMATS)}"
+        )
+    check_sandbox_options(sandbox, delivery)
     typer.echo(f"Evaluating {samples} on benchmark at {path}")
 
-    # Ensure Docker image is built
-    ensure_docker_image()
-
     # Read tasks.jsonl from path
     tasks_path: Path = Path(path) / "tasks.jsonl"
     tasks_data: dict[str, Task] = read_tasks(tasks_path)
@@ -132,51 +626,182 @@ def evaluate(
         raise typer.Exit(1)
     typer.echo(f"Read {len(tasks_data)} tasks from {tasks_path}")
 
+    # Set once the sandbox is up, since calibrations only hold for their sandbox
+    task_timeout: Callable[[Task], float | None] | None = None
+    run_profile: str | None = None
+
+    # Order jobs by past runtimes, else calibration, else number of tests
+    job_cost: Callable[[Task], float] | None = None
+    if longest_first:
+        history_paths: list[Path] = [Path(d) / "results.jsonl" for d in history or []]
+        for history_path in history_paths:
+            if not history_path.is_file():
+                raise typer.BadParameter(f"Results not found: {history_path}")
+        exec_times: dict[str, float] = read_exec_times(history_paths)
+        if history_paths:
+            typer.echo(
+                f"Read execution times of {len(exec_times)} tasks "
+                f"from {len(history_paths)} previous runs"
+            )
+
+        def cost_of(task: Task) -> float:
+            limit = task_timeout(task) if task_timeout else None
+            return expected_cost(task, exec_times, limit, sandbox=run_profile)
+
+        job_cost = cost_of
+
     # Get benchmark config
     benchmark_id: str = next(iter(tasks_data.values()))["benchmark"]
     benchmark_config: BenchmarkConfig = get_benchmark_or_exit(benchmark_id)
     benchmark_name: str = benchmark_config["name"]
 
-    # Read samples.jsonl
+    # Stream samples.jsonl, peeking at the first sample for the model name
     samples_path: Path = Path(samples)
-    samples_data: list[Sample] = read_samples(samples_path)
-    if not samples_data:
-        typer.echo(f"❌ No samples found in {samples_path}")
-        raise typer.Exit(1)
-    model_name: str = samples_data[0]["model_name"]
-    typer.echo(f"Read {len(samples_data)} samples from {samples_path}")
-
-    # Call evaluator from registry
-    results: list[SampleResult] = []
-    processed_task_ids: set[str] = set()
-    for sample_idx, sample in enumerate(samples_data):
-        if sample["task_id"] in processed_task_ids:
-            typer.echo(
-                f"⚠️ Task ID '{sample['task_id']}' appears again in sample {sample_idx}, skipping"
+    samples_iter: Iterator[Sample] = iter_samples(samples_path)
+    first_sample: Sample = next(samples_iter)
+    model_name: str = first_sample["model_name"]
+    typer.echo(f"Streaming samples from {samples_path}")
+    pairs: Iterator[tuple[Task, Sample]] = iter_pairs(
+        itertools.chain([first_sample], samples_iter), tasks_data
+    )
+
+    if resume:
+        results_dir: Path = Path(resume)
+        if not results_dir.is_dir():
+            raise typer.BadParameter(f"Results directory not found: {results_dir}")
+    else:
+        results_dir = create_results_dir(
+            Path(path),
+            (Path(output_dir) if output_dir else None),
+            benchmark_name,
+            model_name,
+            shard=shard_spec,
+        )
+    results_path: Path = results_dir / "results.jsonl"
+    checkpoint_path: Path = results_dir / CHECKPOINT_FILENAME
+
+    # Skip work an interrupted run already finished
+    stats: dict[str, RunStats] = {}
+    done: dict[tuple[str, str, int], ExecResult] = {}
+    if resume:
+        finished: set[tuple[str, str]] = set()
+        for result in iter_results_log(results_path):
+            finished.add((result["model_name"], result["task_id"]))
+            stats.setdefault(result["model_name"], RunStats()).add(result)
+        done = read_checkpoint(checkpoint_path, skip=finished, default_model=model_name)
+        typer.echo(
+            f"Resuming {results_dir}: {len(finished)} tasks and "
+            f"{len(done)} more executions already finished"
+        )
+        pairs = (
+            pair
+            for pair in pairs
+            if (pair[1]["model_name"], pair[0]["id"]) not in finished
+        )
+
+    # Execute all completions across the worker pool, writing each result
+    # as soon as it is ready
+    exec_cache: ExecCache | None = None
+    phase_profile = PhaseProfile()
+    profiler: cProfile.Profile | None = cProfile.Profile() if cprofile else None
+    with ExitStack() as stack:
+        backend = stack.enter_context(
+            open_sandbox(
+                sandbox,
+                workers=workers,
+                warm_pool=warm_pool,
+                max_container_uses=max_container_uses,
+                namespaces=namespaces,
+                fork_server=fork_server,
+                preload=preload,
+                delivery=delivery,
+                stub_latency=stub_latency,
+                stub_failure_rate=stub_failure_rate,
             )
-            continue
-        processed_task_ids.add(sample["task_id"])
-        if sample["task_id"] not in tasks_data:
-            typer.echo(
-                f"⚠️ Task ID '{sample['task_id']}' not found for sample {sample_idx}, skipping"
+        )
+        run: Callable[[str], Awaitable[ExecResult]] = backend.run_async
+        if (adaptive_timeout or longest_first) and any(
+            "reference_runtime" in task for task in tasks_data.values()
+        ):
+            run_profile = sandbox_profile(backend, sandbox, warm_pool, fork_server)
+        if adaptive_timeout and run_profile is not None:
+            task_timeout = adaptive_timeouts(
+                tasks_data,
+                run_profile,
+                multiplier=timeout_multiplier,
+                floor=timeout_floor,
+                ceiling=timeout_ceiling,
             )
-            continue
-        result: SampleResult = benchmark_config["evaluate"](
-            tasks_data[sample["task_id"]], sample
+        run_many: Callable[[list[str]], Awaitable[list[ExecResult]]] = (
+            backend.run_batch_async
         )
-        results.append(result)
+        if cache:
+            exec_cache = ExecCache(
+                backend.fingerprint(), Path(cache_dir), cache_max_mb * 1024 * 1024
+            )
+            run = exec_cache.wrap_async(run)
+            run_many = exec_cache.wrap_batch_async(run_many)
+
+        checkpoint = stack.enter_context(CheckpointLog(checkpoint_path))
+        f = stack.enter_context(results_path.open("a", encoding="utf-8"))
+        parquet: ParquetResultsWriter | None = None
+        if output_format == "parquet":
+            # Parquet files can't be appended to, so rewrite finished tasks too
+            parquet = stack.enter_context(
+                ParquetResultsWriter(results_dir / PARQUET_FILENAME)
+            )
+            if resume:
+                for result in iter_results_log(results_path):
+                    parquet.add(result)
+        if profiler is not None:
+            profiler.enable()
+            stack.callback(profiler.disable)
+        for result in evaluate_samples(
+            pairs,
+            benchmark_config["build_script"],
+            run,
+            workers=workers,
+            run_batch=run_many if batch else None,
+            done=done,
+            on_exec=checkpoint.record,
+            early_stop=early_stop,
+            dedup=dedup,
+            shard=shard_spec,
+            task_timeout=task_timeout,
+            read_result=benchmark_config.get("read_result"),
+            prescreen=benchmark_config.get("prescreen") if prescreen else None,
+            job_cost=job_cost,
+        ):
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            stats.setdefault(result["model_name"], RunStats()).add(result)
+            if parquet is not None:
+                parquet.add(result)
+            if profile:
+                phase_profile.add(tasks_data[result["task_id"]]["benchmark"], result)
+            print_task_result(result)
 
-    # Print results to console
-    print_results(results, benchmark_name, model_name, total_tasks=len(tasks_data))
+    # Every result is in results.jsonl now, so the checkpoint is no longer needed
+    checkpoint_path.unlink()
 
-    # Write results to JSONL file
-    results_dir: Path = create_results_dir(
-        Path(path),
-        (Path(output_dir) if output_dir else None),
+    if exec_cache is not None:
+        typer.echo(
+            f"Execution cache: {exec_cache.hits} hits, {exec_cache.misses} misses"
+        )
+
+    report_results(
+        results_dir,
+        stats,
         benchmark_name,
-        model_name,
+        len(tasks_data),
+        ks,
+        first_model=model_name,
+        shard=shard_spec,
     )
-    with (results_dir / "results.jsonl").open("w", encoding="utf-8") as f:
-        for result in results:
-            f.write(json.dumps(result) + "\n")
-    typer.echo(f"Wrote {len(results)} results to {results_dir / 'results.jsonl'}")
+    if profile:
+        print_profile(phase_profile)
+    if profiler is not None:
+        profiler.dump_stats(cprofile)
+        typer.echo(f"Wrote cProfile stats to {cprofile}")
+    num_evaluated = sum(model_stats.evaluated_tasks for model_stats in stats.values())
+    typer.echo(f"Wrote {num_evaluated} results to {results_path}")
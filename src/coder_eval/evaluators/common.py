@@ -0,0 +1,98 @@
+import ast
+import traceback
+from coder_eval.types import Task, Sample, SampleResult, ExecResult
+
+# Errors of completions rejected by ``prescreen`` without running them
+PRESCREEN_ERRORS: list[str] = ["empty", "syntax", "missing_entry_point"]
+
+
+def is_passed(exec_result: ExecResult) -> bool:
+    """Return whether an execution counts as passing."""
+    return exec_result.get("returncode", 1) == 0
+
+
+def _defines(tree: ast.AST, name: str) -> bool:
+    """Whether a module could define ``name``, erring on the side of yes."""
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if node.name == name:
+                return True
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            if node.id == name:
+                return True
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bound = alias.asname or alias.name.split(".")[0]
+                if alias.name == "*" or bound == name:
+                    return True
+        elif isinstance(node, ast.Global) and name in node.names:
+            return True
+    return False
+
+
+def prescreen(task: Task, completion: str, script: str) -> ExecResult | None:
+    """Fail a completion on the host if it can't possibly pass.
+
+    Empty completions, scripts that don't parse and scripts that never
+    define the task's entry point get a failing ExecResult without being
+    run. Prompts that start the entry point themselves, as HumanEval's do,
+    always pass the last check, so it only rejects completions for tasks
+    whose prompt just describes the function. Anything else returns None
+    and goes to the sandbox. The host's Python is never older than the
+    sandbox image's, so valid code is never rejected as a syntax error.
+    """
+
+    def rejected(error: str, message: str) -> ExecResult:
+        return ExecResult(
+            script=script,
+            stdout="",
+            stderr=message,
+            returncode=1,
+            exec_time=0.0,
+            error=error,
+        )
+
+    if not completion.strip():
+        return rejected("empty", "Empty completion")
+    try:
+        tree = ast.parse(script, filename="main.py")
+    except (SyntaxError, ValueError) as e:
+        return rejected("syntax", "".join(traceback.format_exception_only(e)).strip())
+    except (RecursionError, MemoryError):
+        # Too deeply nested to check here, so let the sandbox decide
+        return None
+    entry_point = task.get("entry_point")
+    if entry_point and not _defines(tree, entry_point):
+        return rejected(
+            "missing_entry_point",
+            f"NameError: name '{entry_point}' is not defined",
+        )
+    return None
+
+
+def summarize(
+    task: Task,
+    sample: Sample,
+    results: list[ExecResult],
+    skipped: list[int] | None = None,
+) -> SampleResult:
+    """Build a summarized result from per-completion execution results.
+
+    ``skipped`` lists the indices of completions that were never executed
+    because an earlier one already passed.
+    """
+    num_passed: int = sum(1 for r in results if is_passed(r))
+    num_failed: int = len(results) - num_passed
+
+    summary: SampleResult = SampleResult(
+        task_id=task["id"],
+        model_name=sample["model_name"],
+        passed_any=num_passed > 0,
+        num_passed=num_passed,
+        num_failed=num_failed,
+        results=results,
+    )
+    if skipped is not None:
+        summary["skipped"] = skipped
+
+    return summary
@@ -1,40 +1,101 @@
+import hashlib
+import json
+from functools import cache
+from pathlib import Path
 from coder_eval.types import Task, Sample, SampleResult, ExecResult
 from coder_eval.docker_utils import run_script
+from coder_eval.evaluators import common
+from coder_eval.evaluators.common import summarize
+
+TEST_RUNNER_PATH = Path(__file__).parent.parent / "docker" / "test_runner.py"
+# Prefix of the stdout line carrying the test report, followed by a nonce
+TEST_REPORT_PREFIX = "__coder_eval_tests__"
+
+
+@cache
+def _test_runner_source() -> str:
+    return TEST_RUNNER_PATH.read_text()
+
+
+def test_report_marker(task: Task) -> str:
+    """The stdout prefix of a task's test report.
+
+    It is derived from the task alone, so every completion of a task gets the
+    same script around it and caching and deduplication keep working, while a
+    completion can't print a matching line by accident.
+    """
+    key = json.dumps([task["id"], task.get("test_setup", ""), task["tests"]])
+    nonce = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return f"{TEST_REPORT_PREFIX}{nonce}:"
+
+
+def build_script(task: Task, completion: str, fail_fast: bool = True) -> str:
+    """Build a runnable MBPP script for a single completion.
+
+    The completion runs as top-level code, after which each test runs
+    separately, stopping at the first failure unless ``fail_fast`` is off.
+    """
+    full_script_parts: list[str] = [
+        # Keep stdout for the test report before the completion can touch it
+        "import os as _coder_eval_os\n_coder_eval_out = _coder_eval_os.dup(1)",
+        task["test_setup"],
+        completion.strip(),
+        _test_runner_source().strip(),
+        f"_coder_eval_run_tests({task['tests']!r}, {fail_fast!r}, "
+        f"{test_report_marker(task)!r}, _coder_eval_out)",
+    ]
+    return "\n\n".join([part for part in full_script_parts if part])
+
+
+def read_test_report(task: Task, result: ExecResult) -> ExecResult:
+    """Move the test report out of a result's stdout into ``tests``.
+
+    A script that exited cleanly without a report never ran its tests, for
+    example because the completion called ``sys.exit(0)``, so it fails.
+    Without a report, all of the task's tests count as not passed, so
+    crashes and timeouts still count towards the test total.
+    """
+    marker = test_report_marker(task)
+    stdout = result.get("stdout", "")
+    before, found, report = stdout.rpartition(marker)
+    if found:
+        line, _, after = report.partition("\n")
+        try:
+            parsed = json.loads(line)
+        except ValueError:
+            found = ""
+        else:
+            result["stdout"] = (before + after).strip()
+            result["tests"] = parsed["tests"]
+            result["num_tests"] = parsed["total"]
+    if not found:
+        result["tests"] = []
+        result["num_tests"] = len(task["tests"])
+    if not found and result.get("returncode") == 0:
+        result["returncode"] = 1
+        result["stderr"] = (
+            result.get("stderr", "") + "\nTests did not run to completion"
+        ).strip()
+    return result
+
+
+def prescreen(task: Task, completion: str, script: str) -> ExecResult | None:
+    """Pre-screen a completion, counting a rejected one's tests as not passed."""
+    result = common.prescreen(task, completion, script)
+    if result is not None:
+        result["tests"] = []
+        result["num_tests"] = len(task["tests"])
+    return result
 
 
 def evaluate(task: Task, sample: Sample) -> SampleResult:
     """Evaluate a MBPP task with completions and summarize results."""
-    num_passed: int = 0
-    num_failed: int = 0
     results: list[ExecResult] = []
 
     for completion in sample["completions"]:
-        # Build runnable script
-        full_script_parts: list[str] = [
-            task["test_setup"],
-            completion.strip(),
-            "\n".join(task["tests"]),
-        ]
-        full_script: str = "\n\n".join([part for part in full_script_parts if part])
-
-        exec_result: ExecResult = run_script(full_script)
-        passed: bool = exec_result.get("returncode", 1) == 0
-
+        exec_result: ExecResult = read_test_report(
+            task, run_script(build_script(task, completion))
+        )
         results.append(exec_result)
 
-        if passed:
-            num_passed += 1
-        else:
-            num_failed += 1
-
-    # Build summarized result
-    summary: SampleResult = SampleResult(
-        task_id=task["id"],
-        model_name=sample["model_name"],
-        passed_any=num_passed > 0,
-        num_passed=num_passed,
-        num_failed=num_failed,
-        results=results,
-    )
-
-    return summary
+    return summarize(task, sample, results)
@@ -0,0 +1,121 @@
+import json
+import typer
+from pathlib import Path
+from coder_eval.checkpoint import CHECKPOINT_FILENAME
+from coder_eval.evaluate import RunStats, parse_ks, report_results
+from coder_eval.shard import format_shard, merge_sample_results, parse_shard
+from coder_eval.types import SampleResult
+
+app = typer.Typer(help="Combine the results of sharded evaluation runs.")
+
+
+def read_shard(results_dir: Path) -> tuple[dict, list[SampleResult]]:
+    """Read the summary and results of a finished shard run."""
+    summary_path: Path = results_dir / "summary.json"
+    if not summary_path.is_file() or (results_dir / CHECKPOINT_FILENAME).exists():
+        raise typer.BadParameter(
+            f"{results_dir} is not a finished run, resume it before merging"
+        )
+    with summary_path.open("r", encoding="utf-8") as f:
+        summary: dict = json.load(f)
+    if "shard" not in summary:
+        raise typer.BadParameter(f"{results_dir} was not run with --shard")
+    with (results_dir / "results.jsonl").open("r", encoding="utf-8") as f:
+        results: list[SampleResult] = [json.loads(line) for line in f if line.strip()]
+    return summary, results
+
+
+def check_shards(summaries: list[dict], dirs: list[Path]) -> None:
+    """Require exactly one run per shard, all of the same benchmark."""
+    shards = [parse_shard(summary["shard"]) for summary in summaries]
+    count: int = shards[0][1] if shards[0] else 0
+    seen: dict[int, Path] = {}
+    for shard, summary, results_dir in zip(shards, summaries, dirs):
+        assert shard is not None
+        if shard[1] != count:
+            raise typer.BadParameter(
+                f"{results_dir} is shard {format_shard(shard)}, expected one of {count}"
+            )
+        if summary["benchmark"] != summaries[0]["benchmark"]:
+            raise typer.BadParameter(
+                f"{results_dir} is a {summary['benchmark']} run, "
+                f"expected {summaries[0]['benchmark']}"
+            )
+        if shard[0] in seen:
+            raise typer.BadParameter(
+                f"Shard {format_shard(shard)} given twice: "
+                f"{seen[shard[0]]} and {results_dir}"
+            )
+        seen[shard[0]] = results_dir
+    missing = [f"{i}/{count}" for i in range(1, count + 1) if i not in seen]
+    if missing:
+        raise typer.BadParameter(f"Missing shards: {', '.join(missing)}")
+
+
+@app.callback(invoke_without_command=True)
+def merge(
+    shard_dir: list[str] = typer.Option(
+        ..., help="Results directory of one shard. Repeat for every shard."
+    ),
+    output_dir: str = typer.Option(..., help="Path to merged results directory."),
+    k: str = typer.Option(
+        None, help="Comma-separated k values to report pass@k for, e.g. 1,10,100."
+    ),
+):
+    """Merge shard results into one results.jsonl and summary."""
+    ks: list[int] = parse_ks(k)
+    dirs: list[Path] = [Path(d) for d in shard_dir]
+    shards = [read_shard(results_dir) for results_dir in dirs]
+    check_shards([summary for summary, _ in shards], dirs)
+    benchmark_name: str = shards[0][0]["benchmark"]
+    total_tasks: int = shards[0][0]["total_tasks"]
+
+    # Every shard reports every (model, task), with its slice of completions
+    parts: dict[tuple[str, str], list[SampleResult]] = {}
+    for _, results in shards:
+        for result in results:
+            parts.setdefault((result["model_name"], result["task_id"]), []).append(
+                result
+            )
+    problems: list[str] = []
+    merged: list[SampleResult] = []
+    for (model_name, task_id), task_parts in parts.items():
+        if len(task_parts) != len(shards):
+            problems.append(
+                f"Task '{task_id}' for model '{model_name}' is in "
+                f"{len(task_parts)} of {len(shards)} shards"
+            )
+            continue
+        try:
+            merged.append(merge_sample_results(task_parts))
+        except ValueError as exc:
+            problems.append(str(exc))
+    if ks and any("skipped" in result for result in merged):
+        raise typer.BadParameter(
+            "--k can't be used on shards run with --early-stop: skipped "
+            "completions would inflate pass@k"
+        )
+    if problems:
+        for problem in problems:
+            typer.echo(f"❌ {problem}")
+        raise typer.Exit(1)
+
+    results_dir: Path = Path(output_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    results_path: Path = results_dir / "results.jsonl"
+    stats: dict[str, RunStats] = {}
+    with results_path.open("w", encoding="utf-8") as f:
+        for result in merged:
+            f.write(json.dumps(result) + "\n")
+            stats.setdefault(result["model_name"], RunStats()).add(result)
+
+    report_results(
+        results_dir,
+        stats,
+        benchmark_name,
+        total_tasks,
+        ks,
+        first_model=merged[0]["model_name"] if merged else "",
+    )
+    typer.echo(f"Merged {len(shards)} shards into {len(merged)} results")
+    typer.echo(f"Wrote {results_path}")
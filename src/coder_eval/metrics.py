@@ -0,0 +1,44 @@
+import numpy as np
+import numpy.typing as npt
+
+
+def pass_at_k(
+    num_samples: npt.ArrayLike, num_correct: npt.ArrayLike, k: int
+) -> npt.NDArray[np.float64]:
+    """Compute the unbiased pass@k estimator for every task at once.
+
+    pass@k = 1 - C(n - c, k) / C(n, k), evaluated in log space from a single
+    table of log-factorials so that all tasks are handled by one array
+    expression. Tasks with fewer than ``k`` samples get NaN.
+    """
+    n = np.asarray(num_samples, dtype=np.int64)
+    c = np.asarray(num_correct, dtype=np.int64)
+    if n.size == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    log_fact = np.concatenate(
+        ([0.0], np.cumsum(np.log(np.arange(1, int(n.max()) + 1, dtype=np.float64))))
+    )
+    n_fail = n - c
+
+    # log(C(n - c, k) / C(n, k)) = log((n-c)! (n-k)! / ((n-c-k)! n!))
+    log_ratio = (
+        log_fact[n_fail]
+        + log_fact[np.maximum(n - k, 0)]
+        - log_fact[np.maximum(n_fail - k, 0)]
+        - log_fact[n]
+    )
+    estimate = np.where(n_fail < k, 1.0, -np.expm1(log_ratio))
+    return np.where(n < k, np.nan, estimate)
+
+
+def mean_pass_at_k(
+    num_samples: npt.ArrayLike, num_correct: npt.ArrayLike, ks: list[int]
+) -> dict[int, float | None]:
+    """Average pass@k over the tasks with at least k samples."""
+    scores: dict[int, float | None] = {}
+    for k in ks:
+        estimates = pass_at_k(num_samples, num_correct, k)
+        valid = estimates[~np.isnan(estimates)]
+        scores[k] = float(valid.mean()) if valid.size else None
+    return scores
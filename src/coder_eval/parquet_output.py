@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from coder_eval.evaluators.common import is_passed
+from coder_eval.types import SampleResult
+
+OUTPUT_FORMATS: list[str] = ["jsonl", "parquet"]
+PARQUET_FILENAME = "results.parquet"
+# Characters of stdout/stderr kept per execution; results.jsonl has the rest
+OUTPUT_PREVIEW_CHARS = 1024
+# Executions buffered before they are written out as one row group
+ROW_GROUP_SIZE = 10_000
+
+
+def _schema() -> Any:
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("model_name", pa.string()),
+            ("task_id", pa.string()),
+            ("completion_idx", pa.int32()),
+            ("passed", pa.bool_()),
+            ("returncode", pa.int32()),
+            ("exec_time", pa.float64()),
+            ("error", pa.string()),
+            ("duplicate_of", pa.int32()),
+            ("tests_passed", pa.int32()),
+            ("num_tests", pa.int32()),
+            ("stdout", pa.string()),
+            ("stderr", pa.string()),
+        ]
+    )
+
+
+def flatten_result(result: SampleResult) -> Iterator[dict[str, Any]]:
+    """Yield one flat row per execution in a SampleResult, without scripts."""
+    results = result.get("results", [])
+    skipped = set(result.get("skipped", []))
+    # Sharded runs record their indices; otherwise skipped completions have
+    # no ExecResult, so recover each one's index around them
+    indices: Iterable[int] = result.get("completion_indices") or (
+        i for i in range(len(results) + len(skipped)) if i not in skipped
+    )
+    for idx, er in zip(indices, results):
+        yield {
+            "model_name": result.get("model_name"),
+            "task_id": result.get("task_id"),
+            "completion_idx": idx,
+            "passed": is_passed(er),
+            "returncode": er.get("returncode"),
+            "exec_time": er.get("exec_time"),
+            "error": er.get("error"),
+            "duplicate_of": er.get("duplicate_of"),
+            "tests_passed": (
+                sum(1 for t in er["tests"] if t.get("passed"))
+                if "tests" in er
+                else None
+            ),
+            "num_tests": er.get("num_tests"),
+            "stdout": er.get("stdout", "")[:OUTPUT_PREVIEW_CHARS],
+            "stderr": er.get("stderr", "")[:OUTPUT_PREVIEW_CHARS],
+        }
+
+
+class ParquetResultsWriter:
+    """Stream SampleResults into a Parquet file with one row per execution.
+
+    Rows are buffered and written in row groups of ``row_group_size``, so
+    memory stays bounded however long the run is. pyarrow is only imported
+    when a writer is created.
+    """
+
+    def __init__(self, path: Path, row_group_size: int = ROW_GROUP_SIZE) -> None:
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.row_group_size = row_group_size
+        self._schema = _schema()
+        self._rows: list[dict[str, Any]] = []
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def __enter__(self) -> "ParquetResultsWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add(self, result: SampleResult) -> None:
+        self._rows.extend(flatten_result(result))
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        import pyarrow as pa
+
+        if self._rows:
+            table = pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table)
+            self._rows = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
@@ -2,6 +2,7 @@ from typing import Final
 import typer
 import json
 from pathlib import Path
+from coder_eval.dataset_cache import DEFAULT_DATASET_CACHE_DIR, DatasetCache
 from coder_eval.types import Task, BenchmarkConfig
 from coder_eval.utils import get_benchmark_or_exit
 
@@ -49,13 +50,30 @@ print("Generated samples.jsonl")
 def prepare(
     benchmark: str = typer.Option(..., help="Name of benchmark."),
     path: str = typer.Option(..., help="Path to store benchmark data."),
+    cache: bool = typer.Option(
+        True, help="Reuse locally cached datasets instead of downloading."
+    ),
+    cache_dir: str = typer.Option(
+        str(DEFAULT_DATASET_CACHE_DIR), help="Path to dataset cache directory."
+    ),
 ):
     """Download or initialize a benchmark dataset."""
     config: BenchmarkConfig = get_benchmark_or_exit(benchmark)
     benchmark_name: str = config["name"]
     typer.echo(f"Preparing {benchmark_name} at {path}")
 
-    tasks: list[Task] = config["fetch"]()
+    # Datasets are pinned to a revision, so a cached copy never goes stale
+    source = config.get("source")
+    tasks: list[Task] | None = None
+    if cache and source is not None:
+        dataset_cache = DatasetCache(Path(cache_dir))
+        tasks = dataset_cache.get(source)
+        if tasks is not None:
+            typer.echo(f"Loaded {benchmark_name} from {dataset_cache.path(source)}")
+    if tasks is None:
+        tasks = config["fetch"]()
+        if cache and source is not None:
+            dataset_cache.put(source, tasks)
     typer.echo(f"Prepared {len(tasks)} tasks from {benchmark_name}")
 
     # Write tasks.jsonl to path
@@ -0,0 +1,134 @@
+import asyncio
+import functools
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+from coder_eval.async_exec import OUTPUT_LIMIT_BYTES, execute
+from coder_eval.docker_utils import EXEC_TIMEOUT
+from coder_eval.profiling import PhaseTimer
+from coder_eval.types import ExecResult
+
+# Address space is virtual memory, so it needs more headroom than the
+# resident memory limit used for containers
+MEMORY_LIMIT_BYTES = 1024 * 1024 * 1024
+FILE_SIZE_LIMIT_BYTES = 16 * 1024 * 1024
+# RLIMIT_NPROC counts every process of the user, not only the script's
+NPROC_LIMIT = 64
+
+UNSHARE_CMD: list[str] = ["unshare", "--user", "--map-root-user", "--net", "--"]
+
+
+def _limit_resources(cpu_seconds: int) -> None:
+    """Apply resource limits in the child before it executes the script."""
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT_BYTES, MEMORY_LIMIT_BYTES))
+    resource.setrlimit(
+        resource.RLIMIT_FSIZE, (FILE_SIZE_LIMIT_BYTES, FILE_SIZE_LIMIT_BYTES)
+    )
+    resource.setrlimit(resource.RLIMIT_NPROC, (NPROC_LIMIT, NPROC_LIMIT))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+class ProcessSandbox:
+    """Run scripts as local subprocesses, without Docker.
+
+    Each script runs with the host interpreter in a private temporary
+    directory, a minimal environment, its own process group and rlimits on
+    CPU time, address space, process count and file size. With
+    ``namespaces`` the script additionally runs in new user and network
+    namespaces (via ``unshare``), which cuts it off from the network.
+
+    This is much cheaper than a container but far weaker isolation, so it is
+    meant for CI and trusted workloads.
+    """
+
+    def __init__(self, namespaces: bool = False, python: str = sys.executable):
+        self.namespaces = namespaces
+        self.python = python
+
+    def __enter__(self) -> "ProcessSandbox":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def fingerprint(self) -> str:
+        """Describe the interpreter and limits that determine an outcome."""
+        return json.dumps(
+            {
+                "sandbox": "process",
+                "python": f"{self.python} {platform.python_version()}",
+                "memory": MEMORY_LIMIT_BYTES,
+                "fsize": FILE_SIZE_LIMIT_BYTES,
+                "nproc": NPROC_LIMIT,
+                "namespaces": self.namespaces,
+                "timeout": EXEC_TIMEOUT,
+                "output_limit": OUTPUT_LIMIT_BYTES,
+            },
+            sort_keys=True,
+        )
+
+    def run(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        """Run a script in a resource-limited local subprocess."""
+        return asyncio.run(self.run_async(script, timeout))
+
+    async def run_async(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        """Run a script in a resource-limited local subprocess without blocking."""
+        timer = PhaseTimer()
+        with timer.phase("prepare"):
+            temp_dir = tempfile.mkdtemp(prefix="coder_eval_")
+            with open(os.path.join(temp_dir, "main.py"), "w") as f:
+                f.write(script)
+
+        cmd = [self.python, "main.py"]
+        if self.namespaces:
+            cmd = [*UNSHARE_CMD, *cmd]
+        env = {
+            "PATH": os.environ.get("PATH", "/usr/bin:/bin"),
+            "HOME": temp_dir,
+            "TMPDIR": temp_dir,
+            "PYTHONDONTWRITEBYTECODE": "1",
+            "PYTHONUNBUFFERED": "1",
+        }
+
+        try:
+            with timer.phase("run"):
+                result = await execute(
+                    cmd,
+                    script,
+                    timeout=timeout,
+                    kill_group=True,
+                    cwd=temp_dir,
+                    env=env,
+                    preexec_fn=functools.partial(
+                        _limit_resources, math.ceil(timeout) + 1
+                    ),
+                )
+        finally:
+            with timer.phase("teardown"):
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        return timer.attach(result)
+
+    def run_batch(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        """Run several scripts one after another."""
+        return asyncio.run(self.run_batch_async(scripts, timeout))
+
+    async def run_batch_async(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        """Run several scripts one after another without blocking.
+
+        There is no container startup to amortize, so this is only here to
+        satisfy the sandbox interface.
+        """
+        return [await self.run_async(script, timeout) for script in scripts]
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,91 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from coder_eval.types import ExecResult, SampleResult
+
+# Phases of an execution, in the order they happen. One-shot Docker runs
+# create and start their container inside "run", since `docker run` does both.
+PHASES: list[str] = ["prepare", "start", "run", "teardown"]
+PERCENTILES: list[int] = [50, 90, 99]
+
+
+class PhaseTimer:
+    """Accumulates monotonic wall-clock time spent in each execution phase."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.monotonic() - start
+
+    def attach(self, result: ExecResult) -> ExecResult:
+        """Record the phases timed so far on a result."""
+        result["phases"] = dict(self.phases)
+        return result
+
+    def attach_all(self, results: list[ExecResult]) -> list[ExecResult]:
+        """Split the phases of a batch evenly across the results it produced."""
+        for result in results:
+            result["phases"] = {
+                name: elapsed / len(results) for name, elapsed in self.phases.items()
+            }
+        return results
+
+
+class PhaseProfile:
+    """Per-benchmark samples of each phase's duration across a run."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, benchmark: str, result: SampleResult) -> None:
+        phases = self.samples.setdefault(benchmark, {})
+        for er in result.get("results", []):
+            # Duplicates and cache hits never ran, so they have nothing to time
+            if "duplicate_of" in er or "phases" not in er:
+                continue
+            for name, elapsed in er["phases"].items():
+                phases.setdefault(name, []).append(elapsed)
+            phases.setdefault("total", []).append(sum(er["phases"].values()))
+
+    def percentiles(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Percentiles and max of each phase in seconds, per benchmark."""
+        import numpy as np
+
+        report: dict[str, dict[str, dict[str, float]]] = {}
+        for benchmark, phases in self.samples.items():
+            order = [p for p in [*PHASES, "total"] if p in phases]
+            report[benchmark] = {}
+            for name in order:
+                values = np.asarray(phases[name])
+                row = {
+                    f"p{p}": float(v)
+                    for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))
+                }
+                row["max"] = float(values.max())
+                row["count"] = len(values)
+                report[benchmark][name] = row
+        return report
+
+
+def print_profile(profile: PhaseProfile) -> None:
+    """Print per-phase latency percentiles in milliseconds."""
+    report = profile.percentiles()
+    if not report:
+        print("No executions were timed.")
+        return
+    header = "".join(f"{f'p{p}':>10}" for p in PERCENTILES) + f"{'max':>10}"
+    for benchmark, phases in report.items():
+        print(f"Phase timings for {benchmark} (ms)")
+        print(f"   {'phase':<10}{'count':>8}{header}")
+        for name, row in phases.items():
+            cells = "".join(
+                f"{row[key] * 1000:>10.1f}"
+                for key in [*(f"p{p}" for p in PERCENTILES), "max"]
+            )
+            print(f"   {name:<10}{int(row['count']):>8}{cells}")
@@ -1,17 +1,63 @@
-from coder_eval.types import BenchmarkConfig
+import importlib
+from importlib.metadata import entry_points
+from typing import Any, Callable
 from coder_eval.datasets import humaneval, mbpp
-from coder_eval.evaluators import humaneval_eval, mbpp_eval
+from coder_eval.types import BenchmarkConfig
+
+# Entry point group other packages can register a BenchmarkConfig under
+ENTRY_POINT_GROUP = "coder_eval.benchmarks"
+
+
+class LazyCallable:
+    """A ``module:attribute`` reference that is only imported when called.
+
+    Dataset fetchers pull in Hugging Face ``datasets`` (and with it pandas and
+    pyarrow), so they are resolved on first use rather than at CLI startup.
+    """
+
+    def __init__(self, ref: str) -> None:
+        self.ref = ref
+        self._target: Callable[..., Any] | None = None
+
+    def __repr__(self) -> str:
+        return f"LazyCallable({self.ref!r})"
+
+    def resolve(self) -> Callable[..., Any]:
+        if self._target is None:
+            module_name, _, attr = self.ref.partition(":")
+            self._target = getattr(importlib.import_module(module_name), attr)
+        return self._target
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
 
 
 BENCHMARK_CONFIG: dict[str, BenchmarkConfig] = {
     "humaneval": BenchmarkConfig(
         name="HumanEval",
-        fetch=humaneval.fetch_tasks,
-        evaluate=humaneval_eval.evaluate,
+        fetch=LazyCallable("coder_eval.datasets.humaneval:fetch_tasks"),
+        evaluate=LazyCallable("coder_eval.evaluators.humaneval_eval:evaluate"),
+        build_script=LazyCallable("coder_eval.evaluators.humaneval_eval:build_script"),
+        prescreen=LazyCallable("coder_eval.evaluators.common:prescreen"),
+        source=humaneval.SOURCE,
     ),
     "mbpp": BenchmarkConfig(
         name="MBPP",
-        fetch=mbpp.fetch_tasks,
-        evaluate=mbpp_eval.evaluate,
+        fetch=LazyCallable("coder_eval.datasets.mbpp:fetch_tasks"),
+        evaluate=LazyCallable("coder_eval.evaluators.mbpp_eval:evaluate"),
+        build_script=LazyCallable("coder_eval.evaluators.mbpp_eval:build_script"),
+        read_result=LazyCallable("coder_eval.evaluators.mbpp_eval:read_test_report"),
+        prescreen=LazyCallable("coder_eval.evaluators.mbpp_eval:prescreen"),
+        source=mbpp.SOURCE,
     ),
 }
+
+
+def load_benchmark(name: str) -> BenchmarkConfig | None:
+    """Look up a built-in benchmark, then one registered as an entry point."""
+    if name in BENCHMARK_CONFIG:
+        return BENCHMARK_CONFIG[name]
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP, name=name):
+        config: BenchmarkConfig = entry_point.load()
+        return config
+    return None
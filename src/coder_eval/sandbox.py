@@ -0,0 +1,158 @@
+from typing import Protocol
+from coder_eval.docker_utils import (
+    DELIVERY_MODES,
+    EXEC_TIMEOUT,
+    MAX_CONTAINER_USES,
+    ContainerPool,
+    ensure_docker_image,
+    run_batch,
+    run_batch_async,
+    run_script,
+    run_script_async,
+    sandbox_fingerprint,
+)
+from coder_eval.process_sandbox import ProcessSandbox
+from coder_eval.stub_sandbox import StubSandbox
+from coder_eval.types import ExecResult
+
+SANDBOX_BACKENDS: list[str] = ["docker", "process", "stub"]
+
+
+class Sandbox(Protocol):
+    """Interface shared by the backends that execute scripts.
+
+    The async methods are the execution core; the sync ones wrap them for
+    callers outside an event loop. ``timeout`` applies to each script.
+    """
+
+    def run(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult: ...
+
+    async def run_async(
+        self, script: str, timeout: float = EXEC_TIMEOUT
+    ) -> ExecResult: ...
+
+    def run_batch(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]: ...
+
+    async def run_batch_async(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]: ...
+
+    def fingerprint(self) -> str: ...
+
+    def close(self) -> None: ...
+
+    def __enter__(self) -> "Sandbox": ...
+
+    def __exit__(self, *exc_info: object) -> None: ...
+
+
+class DockerSandbox:
+    """Run scripts in Docker containers, one per script or from a warm pool.
+
+    ``fork_server`` implies a warm pool whose containers fork each script
+    from a server that has already imported ``preload``. ``delivery`` is
+    one of ``DELIVERY_MODES``: scripts are written to a mounted directory,
+    or streamed over stdin so the host touches no files.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        warm_pool: bool = False,
+        max_uses: int = MAX_CONTAINER_USES,
+        fork_server: bool = False,
+        preload: list[str] | None = None,
+        delivery: str = "mount",
+    ) -> None:
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(
+                f"Unknown delivery '{delivery}', "
+                f"expected one of: {', '.join(DELIVERY_MODES)}"
+            )
+        ensure_docker_image()
+        self._fork_server = fork_server
+        self._delivery = delivery
+        self._pool: ContainerPool | None = (
+            ContainerPool(
+                size=workers,
+                max_uses=max_uses,
+                fork_server=fork_server,
+                preload=preload,
+                delivery=delivery,
+            )
+            if warm_pool or fork_server
+            else None
+        )
+
+    def __enter__(self) -> "DockerSandbox":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def fingerprint(self) -> str:
+        return sandbox_fingerprint(
+            runner="fork-server" if self._fork_server else "python",
+            delivery=self._delivery,
+        )
+
+    def run(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        if self._pool is not None:
+            return self._pool.run(script, timeout)
+        return run_script(script, timeout, self._delivery)
+
+    async def run_async(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        if self._pool is not None:
+            return await self._pool.run_async(script, timeout)
+        return await run_script_async(script, timeout, self._delivery)
+
+    def run_batch(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        if self._pool is not None:
+            return self._pool.run_batch(scripts, timeout)
+        return run_batch(scripts, timeout, self._delivery)
+
+    async def run_batch_async(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        if self._pool is not None:
+            return await self._pool.run_batch_async(scripts, timeout)
+        return await run_batch_async(scripts, timeout, self._delivery)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+
+
+def create_sandbox(
+    name: str,
+    workers: int = 1,
+    warm_pool: bool = False,
+    max_uses: int = MAX_CONTAINER_USES,
+    namespaces: bool = False,
+    fork_server: bool = False,
+    preload: list[str] | None = None,
+    delivery: str = "mount",
+    stub_latency: float = 0.0,
+    stub_failure_rate: float = 0.0,
+) -> Sandbox:
+    """Create the sandbox backend with the given name."""
+    if name == "docker":
+        return DockerSandbox(
+            workers=workers,
+            warm_pool=warm_pool,
+            max_uses=max_uses,
+            fork_server=fork_server,
+            preload=preload,
+            delivery=delivery,
+        )
+    if name == "process":
+        return ProcessSandbox(namespaces=namespaces)
+    if name == "stub":
+        return StubSandbox(latency=stub_latency, failure_rate=stub_failure_rate)
+    raise ValueError(
+        f"Unknown sandbox '{name}', expected one of: {', '.join(SANDBOX_BACKENDS)}"
+    )
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from typing import Iterable
+from coder_eval.evaluators.common import PRESCREEN_ERRORS
+from coder_eval.types import SampleResult, Task
+
+# Assumed seconds per test for tasks with no history and no calibration
+SECONDS_PER_TEST = 0.05
+
+
+def read_exec_times(results_paths: Iterable[Path]) -> dict[str, float]:
+    """Mean execution time per task over previous runs' results.jsonl files.
+
+    Duplicates and pre-screened completions never ran, so they are left out,
+    as are lines a killed run left unfinished.
+    """
+    totals: dict[str, tuple[float, int]] = {}
+    for path in results_paths:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result: SampleResult = json.loads(line)
+                except ValueError:
+                    continue
+                for er in result.get("results", []):
+                    if "duplicate_of" in er or er.get("error") in PRESCREEN_ERRORS:
+                        continue
+                    exec_time = er.get("exec_time")
+                    if exec_time is None:
+                        continue
+                    total, count = totals.get(result["task_id"], (0.0, 0))
+                    totals[result["task_id"]] = (total + exec_time, count + 1)
+    return {task_id: total / count for task_id, (total, count) in totals.items()}
+
+
+def expected_cost(
+    task: Task,
+    history: dict[str, float],
+    timeout: float | None = None,
+    sandbox: str | None = None,
+) -> float:
+    """Expected seconds one completion of a task takes in the sandbox.
+
+    Uses the task's mean time in previous runs, else its calibrated
+    reference runtime, else a guess from its number of tests. No script
+    runs longer than its timeout, so the estimate is capped by it. With
+    ``sandbox``, a runtime calibrated under another timing profile is
+    ignored, as in ``derive_timeout``.
+    """
+    if task["id"] in history:
+        cost = history[task["id"]]
+    elif "reference_runtime" in task and (
+        sandbox is None or task.get("reference_sandbox") == sandbox
+    ):
+        cost = task["reference_runtime"]
+    else:
+        cost = len(task.get("tests", [])) * SECONDS_PER_TEST
+    return cost if timeout is None else min(cost, timeout)
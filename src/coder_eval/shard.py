@@ -0,0 +1,81 @@
+import hashlib
+import json
+from coder_eval.evaluators.common import is_passed
+from coder_eval.types import ExecResult, SampleResult
+
+
+def parse_shard(value: str | None) -> tuple[int, int] | None:
+    """Parse a shard spec such as '2/4' into (index, count), 1-based."""
+    if not value:
+        return None
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError as exc:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 1/4") from exc
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', i must be between 1 and N")
+    return index, count
+
+
+def format_shard(shard: tuple[int, int]) -> str:
+    return f"{shard[0]}/{shard[1]}"
+
+
+def in_shard(model_name: str, task_id: str, idx: int, shard: tuple[int, int]) -> bool:
+    """Whether a completion belongs to a shard.
+
+    Completions are assigned by a stable hash of (model, task, completion
+    index), so every node computes the same partition without coordination
+    and the slices stay balanced whatever the order of the samples file.
+    """
+    key = json.dumps([model_name, task_id, idx]).encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard[1] == shard[0] - 1
+
+
+def merge_sample_results(parts: list[SampleResult]) -> SampleResult:
+    """Combine the shard results of one (model, task) into a single result.
+
+    Raises ValueError if a completion was run by more than one shard or by
+    none of them.
+    """
+    first = parts[0]
+    num_completions: int = first.get("num_completions", 0)
+    by_idx: dict[int, ExecResult] = {}
+    skipped: set[int] = set()
+
+    def claim(idx: int) -> None:
+        if idx in by_idx or idx in skipped:
+            raise ValueError(
+                f"Completion {idx} of task '{first['task_id']}' for model "
+                f"'{first['model_name']}' appears in more than one shard"
+            )
+
+    for part in parts:
+        for idx, er in zip(part.get("completion_indices", []), part.get("results", [])):
+            claim(idx)
+            by_idx[idx] = er
+        for idx in part.get("skipped", []):
+            claim(idx)
+            skipped.add(idx)
+
+    missing = sorted(set(range(num_completions)) - set(by_idx) - skipped)
+    if missing:
+        raise ValueError(
+            f"Completions {missing} of task '{first['task_id']}' for model "
+            f"'{first['model_name']}' are in no shard"
+        )
+
+    results = [by_idx[idx] for idx in sorted(by_idx)]
+    num_passed = sum(1 for r in results if is_passed(r))
+    merged = SampleResult(
+        task_id=first["task_id"],
+        model_name=first["model_name"],
+        passed_any=num_passed > 0,
+        num_passed=num_passed,
+        num_failed=len(results) - num_passed,
+        results=results,
+    )
+    if any("skipped" in part for part in parts):
+        merged["skipped"] = sorted(skipped)
+    return merged
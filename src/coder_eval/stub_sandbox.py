@@ -0,0 +1,117 @@
+import ast
+import asyncio
+import hashlib
+import json
+import time
+from coder_eval.docker_utils import EXEC_TIMEOUT
+from coder_eval.profiling import PhaseTimer
+from coder_eval.types import ExecResult
+
+# The call MBPP scripts end with, see ``mbpp_eval.build_script``
+RUNNER_CALL = "_coder_eval_run_tests("
+
+
+class StubSandbox:
+    """Pretend to run scripts, for measuring the evaluation pipeline itself.
+
+    Nothing is executed. Each script takes a simulated time spread evenly
+    between 0 and twice ``latency`` seconds, and fails with probability
+    ``failure_rate``. Both are derived from a hash of the script, so a
+    given script always gets the same outcome. Scripts whose simulated time
+    exceeds their timeout are reported as timed out once it has elapsed.
+    Scripts that end with the MBPP test runner print its report, in which
+    every test passes, or the first one fails.
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+
+    def __enter__(self) -> "StubSandbox":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def fingerprint(self) -> str:
+        return json.dumps(
+            {
+                "sandbox": "stub",
+                "latency": self.latency,
+                "failure_rate": self.failure_rate,
+            },
+            sort_keys=True,
+        )
+
+    def _outcome(self, script: str) -> tuple[float, bool]:
+        """The simulated duration of a script and whether it passes."""
+        digest = hashlib.blake2b(script.encode("utf-8"), digest_size=8).digest()
+        delay = self.latency * 2 * int.from_bytes(digest[:4], "big") / 0xFFFFFFFF
+        passed = int.from_bytes(digest[4:], "big") / 0xFFFFFFFF >= self.failure_rate
+        return delay, passed
+
+    def _report(self, script: str, delay: float, passed: bool) -> str:
+        """The test report an MBPP script would print, if it is one."""
+        _, found, call = script.rpartition("\n" + RUNNER_CALL)
+        if not found:
+            return ""
+        try:
+            node = ast.parse(RUNNER_CALL + call.strip(), mode="eval").body
+        except SyntaxError:
+            return ""
+        if not isinstance(node, ast.Call) or len(node.args) < 3:
+            return ""
+        tests, marker = ast.literal_eval(node.args[0]), ast.literal_eval(node.args[2])
+        outcomes: list[dict[str, object]]
+        if passed:
+            outcomes = [{"passed": True, "time": delay / len(tests)} for _ in tests]
+        else:
+            outcomes = [{"passed": False, "time": delay, "error": "AssertionError"}]
+        return f"\n{marker}{json.dumps({'total': len(tests), 'tests': outcomes})}\n"
+
+    def _result(
+        self, script: str, delay: float, passed: bool, timeout: float
+    ) -> ExecResult:
+        if delay > timeout:
+            return ExecResult(
+                script=script,
+                stdout="",
+                stderr="TimeoutExpired",
+                returncode=-1,
+                exec_time=float(timeout),
+                error="timeout",
+            )
+        return ExecResult(
+            script=script,
+            stdout=self._report(script, delay, passed),
+            stderr="" if passed else "AssertionError",
+            returncode=0 if passed else 1,
+            exec_time=delay,
+        )
+
+    def run(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        timer = PhaseTimer()
+        delay, passed = self._outcome(script)
+        with timer.phase("run"):
+            time.sleep(min(delay, timeout))
+        return timer.attach(self._result(script, delay, passed, timeout))
+
+    async def run_async(self, script: str, timeout: float = EXEC_TIMEOUT) -> ExecResult:
+        timer = PhaseTimer()
+        delay, passed = self._outcome(script)
+        with timer.phase("run"):
+            await asyncio.sleep(min(delay, timeout))
+        return timer.attach(self._result(script, delay, passed, timeout))
+
+    def run_batch(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        return [self.run(script, timeout) for script in scripts]
+
+    async def run_batch_async(
+        self, scripts: list[str], timeout: float = EXEC_TIMEOUT
+    ) -> list[ExecResult]:
+        return [await self.run_async(script, timeout) for script in scripts]
+
+    def close(self) -> None:
+        pass
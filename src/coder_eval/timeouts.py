@@ -0,0 +1,40 @@
+import hashlib
+import json
+from coder_eval.docker_utils import EXEC_TIMEOUT
+from coder_eval.types import Task
+
+# A calibrated task's timeout is this multiple of its reference runtime,
+# clamped between the floor and the ceiling
+TIMEOUT_MULTIPLIER = 5.0
+TIMEOUT_FLOOR = 0.5
+TIMEOUT_CEILING = float(EXEC_TIMEOUT)
+
+
+def timing_profile(fingerprint: str, warm: bool) -> str:
+    """Identify the sandbox setup a reference runtime was measured in.
+
+    The fingerprint covers the image, limits and runner, and ``warm`` whether
+    containers are reused, which decides how much startup a runtime includes.
+    """
+    key = json.dumps({"fingerprint": fingerprint, "warm": warm}, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def derive_timeout(
+    task: Task,
+    multiplier: float = TIMEOUT_MULTIPLIER,
+    floor: float = TIMEOUT_FLOOR,
+    ceiling: float = TIMEOUT_CEILING,
+    sandbox: str | None = None,
+) -> float | None:
+    """A task's timeout from its calibrated reference runtime, if it has one.
+
+    With ``sandbox``, a runtime measured under a different timing profile
+    doesn't count, since it says little about how long scripts take here.
+    """
+    runtime = task.get("reference_runtime")
+    if runtime is None:
+        return None
+    if sandbox is not None and task.get("reference_sandbox") != sandbox:
+        return None
+    return min(max(runtime * multiplier, floor), ceiling)
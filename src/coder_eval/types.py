@@ -9,6 +9,8 @@ class Task(TypedDict, total=False):
     reference_solution: str
     tests: list[str]
     test_setup: str
+    reference_runtime: float
+    reference_sandbox: str
 
 
 class Sample(TypedDict):
@@ -17,6 +19,12 @@ class Sample(TypedDict):
     completions: list[str]
 
 
+class TestOutcome(TypedDict, total=False):
+    passed: bool
+    time: float
+    error: str
+
+
 class ExecResult(TypedDict, total=False):
     script: str
     stdout: str
@@ -24,6 +32,11 @@ class ExecResult(TypedDict, total=False):
     returncode: int
     exec_time: float
     error: str
+    duplicate_of: int
+    phases: dict[str, float]
+    truncated: bool
+    tests: list[TestOutcome]
+    num_tests: int
 
 
 class SampleResult(TypedDict, total=False):
@@ -33,9 +46,25 @@ class SampleResult(TypedDict, total=False):
     num_passed: int
     num_failed: int
     results: list[ExecResult]
+    skipped: list[int]
+    completion_indices: list[int]
+    num_completions: int
+
 
+class DatasetSource(TypedDict):
+    path: str
+    name: str | None
+    revision: str
 
-class BenchmarkConfig(TypedDict):
+
+class _BenchmarkConfigBase(TypedDict):
     name: str
     fetch: Callable[[], list[Task]]
     evaluate: Callable[[Task, Sample], SampleResult]
+    build_script: Callable[[Task, str], str]
+
+
+class BenchmarkConfig(_BenchmarkConfigBase, total=False):
+    source: DatasetSource
+    read_result: Callable[[Task, ExecResult], ExecResult]
+    prescreen: Callable[[Task, str, str], ExecResult | None]
@@ -1,10 +1,12 @@
 import typer
-from coder_eval.registry import BENCHMARK_CONFIG
+from coder_eval.registry import load_benchmark
+from coder_eval.types import BenchmarkConfig
 
 
-def get_benchmark_or_exit(benchmark: str):
-    if benchmark not in BENCHMARK_CONFIG:
+def get_benchmark_or_exit(benchmark: str) -> BenchmarkConfig:
+    config = load_benchmark(benchmark)
+    if config is None:
         typer.echo(f"Benchmark '{benchmark}' not supported.")
         raise typer.Exit()
 
-    return BENCHMARK_CONFIG[benchmark]
+    return config
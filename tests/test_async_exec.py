@@ -0,0 +1,101 @@
+import asyncio
+import sys
+import time
+from coder_eval.async_exec import execute
+
+
+def test_execute_captures_output() -> None:
+    """It should return stdout, stderr and the return code of the command."""
+    result = asyncio.run(
+        execute(
+            [sys.executable, "-c", "import sys; print('out'); sys.exit('err')"],
+            "script",
+            timeout=10,
+        )
+    )
+
+    assert result["script"] == "script"
+    assert result["stdout"] == "out"
+    assert result["stderr"] == "err"
+    assert result["returncode"] == 1
+
+
+def test_execute_passes_stdin() -> None:
+    """It should feed stdin to the process."""
+    result = asyncio.run(
+        execute(
+            [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"],
+            "",
+            timeout=10,
+            stdin=b"hello",
+        )
+    )
+
+    assert result["stdout"] == "HELLO"
+
+
+def test_execute_kills_on_timeout() -> None:
+    """It should kill the process group once the timeout expires."""
+    start = time.monotonic()
+    result = asyncio.run(
+        execute(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            "",
+            timeout=0.5,
+            kill_group=True,
+        )
+    )
+
+    assert result.get("error") == "timeout"
+    assert result["returncode"] == -1
+    assert time.monotonic() - start < 5
+
+
+def test_execute_reports_spawn_failure() -> None:
+    """It should turn a missing executable into an exception result."""
+    result = asyncio.run(execute(["/nonexistent/binary"], "", timeout=1))
+
+    assert result.get("error") == "exception"
+
+
+def test_execute_keeps_head_and_tail_of_long_output() -> None:
+    """It should cap each stream, keeping its start and end."""
+    result = asyncio.run(
+        execute(
+            [
+                sys.executable,
+                "-c",
+                "print('start' + 'x' * 100000 + 'end')",
+            ],
+            "",
+            timeout=10,
+            output_limit=1000,
+        )
+    )
+
+    assert result["returncode"] == 0
+    assert result["truncated"] is True
+    assert result["stdout"].startswith("startxxx")
+    assert result["stdout"].endswith("xxxend")
+    assert "bytes truncated" in result["stdout"]
+    assert len(result["stdout"]) < 1100
+
+
+def test_execute_kills_on_hard_output_limit() -> None:
+    """It should kill a process as soon as it prints past the hard limit."""
+    start = time.monotonic()
+    result = asyncio.run(
+        execute(
+            [sys.executable, "-c", "while True: print('x' * 1000)"],
+            "",
+            timeout=30,
+            kill_group=True,
+            output_limit=1000,
+            hard_output_limit=1_000_000,
+        )
+    )
+
+    assert result.get("error") == "output_limit"
+    assert result["returncode"] == -1
+    assert result["truncated"] is True
+    assert time.monotonic() - start < 5
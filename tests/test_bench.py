@@ -0,0 +1,45 @@
+import json
+from pathlib import Path
+from typer.testing import CliRunner
+from coder_eval.bench import app, write_synthetic_benchmark
+from coder_eval.stub_sandbox import StubSandbox
+
+
+def test_write_synthetic_benchmark_splits_completions(tmp_path: Path) -> None:
+    """It should spread the requested completions over tasks, last one partial."""
+    bench_path, samples_path = write_synthetic_benchmark(tmp_path, 25, 10)
+
+    tasks = (bench_path / "tasks.jsonl").read_text().splitlines()
+    samples = [json.loads(line) for line in samples_path.read_text().splitlines()]
+    assert len(tasks) == 3
+    assert [len(s["completions"]) for s in samples] == [10, 10, 5]
+    completions = [c for s in samples for c in s["completions"]]
+    assert len(set(completions)) == 25
+
+
+def test_stub_sandbox_is_deterministic() -> None:
+    """It should give a script the same outcome every time."""
+    sandbox = StubSandbox(latency=0.001, failure_rate=0.5)
+    scripts = [f"print({i})" for i in range(200)]
+
+    first = [sandbox.run(s)["returncode"] for s in scripts]
+    second = [sandbox.run(s)["returncode"] for s in scripts]
+
+    assert first == second
+    assert 0.3 < first.count(1) / len(first) < 0.7
+
+
+def test_bench_reports_throughput(tmp_path: Path) -> None:
+    """It should evaluate every synthetic completion and write a report."""
+    report = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        app,
+        ["--completions", "200", "--workers", "8", "--report", str(report)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "completions/sec" in result.output
+    stats = json.loads(report.read_text())
+    assert stats["completions"] == 200
+    assert stats["completions_per_sec"] > 0
+    assert stats["peak_rss_bytes"] > 0
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+from coder_eval.cache import ExecCache
+from coder_eval.types import ExecResult
+
+
+def make_result(returncode: int = 0, error: str | None = None) -> ExecResult:
+    result: ExecResult = {
+        "stdout": "ok",
+        "stderr": "",
+        "returncode": returncode,
+        "exec_time": 0.5,
+    }
+    if error:
+        result["error"] = error
+    return result
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    """It should return a stored result with the script re-attached."""
+    cache = ExecCache("ns", root=tmp_path)
+    cache.put("print(1)", {**make_result(), "script": "print(1)"})
+
+    result = cache.get("print(1)")
+
+    assert result is not None
+    assert result["script"] == "print(1)"
+    assert result["returncode"] == 0
+    assert cache.hits == 1
+
+
+def test_cache_key_includes_namespace(tmp_path: Path) -> None:
+    """It should not share entries between different sandbox configurations."""
+    ExecCache("image-a", root=tmp_path).put("print(1)", make_result())
+
+    assert ExecCache("image-b", root=tmp_path).get("print(1)") is None
+    assert ExecCache("image-a", root=tmp_path).get("print(1)") is not None
+
+
+def test_cache_key_includes_timeout(tmp_path: Path) -> None:
+    """It should not reuse a result produced under a different timeout."""
+    cache = ExecCache("ns", root=tmp_path)
+    cache.put("print(1)", make_result(), timeout=0.5)
+
+    assert cache.get("print(1)") is None
+    assert cache.get("print(1)", timeout=2.0) is None
+    assert cache.get("print(1)", timeout=0.5) is not None
+
+
+def test_cache_skips_sandbox_exceptions_and_timeouts(tmp_path: Path) -> None:
+    """It should not store results that depend on the host, not the script."""
+    cache = ExecCache("ns", root=tmp_path)
+    cache.put("print(1)", make_result(-1, error="exception"))
+    cache.put("while True: pass", make_result(-1, error="timeout"))
+    cache.put("print('big' * 100)", make_result(-1, error="output_limit"))
+
+    assert cache.get("print(1)") is None
+    assert cache.get("while True: pass") is None
+    assert cache.get("print('big' * 100)") is not None
+
+
+def test_cache_size_counts_overwritten_entries_once(tmp_path: Path) -> None:
+    """It should not grow its size estimate when an entry is rewritten."""
+    cache = ExecCache("ns", root=tmp_path)
+    for _ in range(3):
+        cache.put("print(1)", make_result())
+
+    entry = next(tmp_path.glob("*/*.json"))
+    assert cache._size == entry.stat().st_size
+
+
+def test_cache_wrap_runs_only_misses(tmp_path: Path) -> None:
+    """It should only call the wrapped runner for scripts not in the cache."""
+    cache = ExecCache("ns", root=tmp_path)
+    calls: list[str] = []
+
+    def run(script: str) -> ExecResult:
+        calls.append(script)
+        return make_result()
+
+    def run_batch(scripts: list[str]) -> list[ExecResult]:
+        calls.extend(scripts)
+        return [make_result() for _ in scripts]
+
+    cached_run = cache.wrap(run)
+    cached_run("a")
+    cached_run("a")
+    results = cache.wrap_batch(run_batch)(["a", "b", "c"])
+
+    assert calls == ["a", "b", "c"]
+    assert len(results) == 3
+    assert results[0]["script"] == "a"
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """It should evict the oldest entries once max_bytes is exceeded."""
+    cache = ExecCache("ns", root=tmp_path, max_bytes=250)
+    cache.put("old", make_result())
+    old_path = next(tmp_path.glob("*/*.json"))
+    os.utime(old_path, (0, 0))
+
+    for idx in range(3):
+        cache.put(f"new_{idx}", make_result())
+
+    assert cache.get("old") is None
+    assert cache.get("new_2") is not None
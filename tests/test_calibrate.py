@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+from typer.testing import CliRunner
+from coder_eval.bench import write_synthetic_benchmark
+from coder_eval.calibrate import app
+from coder_eval.process_sandbox import ProcessSandbox
+from coder_eval.stub_sandbox import StubSandbox
+from coder_eval.timeouts import derive_timeout, timing_profile
+
+
+def test_derive_timeout_clamps_multiple_of_runtime() -> None:
+    """It should scale the reference runtime within the floor and ceiling."""
+    assert derive_timeout({"id": "t"}) is None
+    assert derive_timeout({"id": "t", "reference_runtime": 0.01}) == 0.5
+    assert derive_timeout({"id": "t", "reference_runtime": 0.4}) == 2.0
+    assert derive_timeout({"id": "t", "reference_runtime": 30.0}) == 10.0
+    assert (
+        derive_timeout(
+            {"id": "t", "reference_runtime": 0.4}, multiplier=2, floor=0, ceiling=1
+        )
+        == 0.8
+    )
+
+
+def test_calibrate_records_reference_runtimes(tmp_path: Path) -> None:
+    """It should store passing reference runtimes and skip failing ones."""
+    bench_path, _ = write_synthetic_benchmark(tmp_path, 3, 1)
+    tasks_path = bench_path / "tasks.jsonl"
+    tasks = [json.loads(line) for line in tasks_path.read_text().splitlines()]
+    tasks[1]["reference_solution"] = "    return a - b\n"
+    tasks[2]["reference_runtime"] = 123.0
+    tasks[2]["reference_solution"] = "    raise ValueError\n"
+    tasks_path.write_text("".join(json.dumps(task) + "\n" for task in tasks))
+
+    result = CliRunner().invoke(
+        app,
+        ["--path", str(bench_path), "--sandbox", "process", "--repeats", "2"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Calibrated 1/3 tasks" in result.output
+    assert "'bench_1' failed" in result.output
+    calibrated = [json.loads(line) for line in tasks_path.read_text().splitlines()]
+    assert 0 < calibrated[0]["reference_runtime"] < 10
+    assert calibrated[0]["reference_sandbox"] == timing_profile(
+        ProcessSandbox().fingerprint(), warm=False
+    )
+    assert "reference_runtime" not in calibrated[1]
+    assert "reference_runtime" not in calibrated[2]
+    assert "reference_sandbox" not in calibrated[2]
+    assert [t["id"] for t in calibrated] == [t["id"] for t in tasks]
+
+
+def test_calibrate_uses_every_sandbox_option(tmp_path: Path) -> None:
+    """It should record the profile of the sandbox evaluate builds from them."""
+    bench_path, _ = write_synthetic_benchmark(tmp_path, 1, 1)
+    tasks_path = bench_path / "tasks.jsonl"
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "--path",
+            str(bench_path),
+            "--sandbox",
+            "stub",
+            "--stub-latency",
+            "0.01",
+            "--repeats",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    [task] = [json.loads(line) for line in tasks_path.read_text().splitlines()]
+    assert task["reference_sandbox"] == timing_profile(
+        StubSandbox(latency=0.01).fingerprint(), warm=False
+    )
+
+
+def test_evaluate_uses_adaptive_timeouts(tmp_path: Path) -> None:
+    """It should cut off slow completions of calibrated tasks early."""
+    from coder_eval.evaluate import app as evaluate_app
+
+    bench_path, samples_path = write_synthetic_benchmark(tmp_path, 20, 20)
+    tasks_path = bench_path / "tasks.jsonl"
+    task = json.loads(tasks_path.read_text())
+    profile = timing_profile(StubSandbox(latency=0.5).fingerprint(), warm=False)
+
+    def calibrate(sandbox: str) -> None:
+        calibrated = {**task, "reference_runtime": 0.01, "reference_sandbox": sandbox}
+        tasks_path.write_text(json.dumps(calibrated) + "\n")
+
+    def run(name: str, *extra: str) -> tuple[list[dict], str]:
+        out = tmp_path / "out" / name
+        result = CliRunner().invoke(
+            evaluate_app,
+            [
+                "--path",
+                str(bench_path),
+                "--samples",
+                str(samples_path),
+                "--output-dir",
+                str(out),
+                "--sandbox",
+                "stub",
+                "--stub-latency",
+                "0.5",
+                "--workers",
+                "20",
+                "--no-cache",
+                *extra,
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        results_path = next(out.iterdir()) / "results.jsonl"
+        return json.loads(results_path.read_text())["results"], result.output
+
+    calibrate(profile)
+    adaptive, _ = run("adaptive")
+    assert any(er.get("error") == "timeout" for er in adaptive)
+    assert all(er["exec_time"] <= 0.5 for er in adaptive)
+    assert not any(er.get("error") for er in run("fixed", "--no-adaptive-timeout")[0])
+
+    # A runtime measured in another sandbox setup must not cut this one short
+    calibrate(timing_profile(StubSandbox().fingerprint(), warm=True))
+    elsewhere, output = run("elsewhere")
+    assert not any(er.get("error") for er in elsewhere)
+    assert "calibrated in a different sandbox setup" in output
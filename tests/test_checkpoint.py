@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+from coder_eval.checkpoint import CheckpointLog, iter_results_log, read_checkpoint
+
+
+def test_checkpoint_round_trip(tmp_path: Path) -> None:
+    """It should read back recorded executions keyed by model, task and index."""
+    path = tmp_path / "checkpoint.jsonl"
+    with CheckpointLog(path) as log:
+        log.record("m1", "task_1", 0, {"script": "print(1)", "returncode": 0})
+        log.record("m2", "task_1", 0, {"script": "print(1)", "returncode": 1})
+        log.record("m1", "task_2", 1, {"script": "print(2)", "returncode": 1})
+
+    done = read_checkpoint(path, skip={("m1", "task_2")})
+
+    assert done == {
+        ("m1", "task_1", 0): {"returncode": 0},
+        ("m2", "task_1", 0): {"returncode": 1},
+    }
+
+
+def test_read_checkpoint_attributes_old_entries_to_default_model(
+    tmp_path: Path,
+) -> None:
+    """It should key entries written without a model under default_model."""
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        json.dumps({"task_id": "t", "completion_idx": 0, "result": {}}) + "\n"
+    )
+
+    assert read_checkpoint(path, default_model="m") == {("m", "t", 0): {}}
+
+
+def test_read_checkpoint_ignores_partial_line(tmp_path: Path) -> None:
+    """It should skip a line cut off by an interruption."""
+    path = tmp_path / "checkpoint.jsonl"
+    entry = {"task_id": "task_1", "completion_idx": 0, "result": {"returncode": 0}}
+    path.write_text(json.dumps(entry) + "\n" + '{"task_id": "task_1", "compl')
+
+    assert list(read_checkpoint(path)) == [("", "task_1", 0)]
+
+
+def test_iter_results_log_truncates_partial_line(tmp_path: Path) -> None:
+    """It should yield complete results and cut off a trailing partial line."""
+    path = tmp_path / "results.jsonl"
+    complete = json.dumps({"task_id": "task_1", "passed_any": True}) + "\n"
+    path.write_text(complete + '{"task_id": "task_2", "pas')
+
+    results = list(iter_results_log(path))
+
+    assert [r["task_id"] for r in results] == ["task_1"]
+    assert path.read_text() == complete
+
+
+def test_iter_results_log_missing_file(tmp_path: Path) -> None:
+    """It should yield nothing when no results were written yet."""
+    assert list(iter_results_log(tmp_path / "results.jsonl")) == []
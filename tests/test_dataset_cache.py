@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from typer.testing import CliRunner
+from coder_eval.dataset_cache import DatasetCache, app
+from coder_eval.prepare import prepare
+from coder_eval.types import BenchmarkConfig, DatasetSource, Task
+
+SOURCE = DatasetSource(path="org/bench", name="sanitized", revision="abc123")
+TASKS: list[Task] = [
+    {
+        "id": "1",
+        "benchmark": "mbpp",
+        "prompt": "Add two numbers.",
+        "reference_solution": "def add(a, b): return a + b",
+        "tests": ["assert add(1, 2) == 3", "assert add(0, 0) == 0"],
+        "test_setup": "",
+    },
+    {
+        "id": "HumanEval/0",
+        "benchmark": "humaneval",
+        "prompt": "def add(a, b):\n",
+        "entry_point": "add",
+        "reference_solution": "    return a + b\n",
+        "tests": ["def check(f):\n    assert f(1, 2) == 3"],
+    },
+]
+
+
+def test_put_then_get_round_trips_tasks(tmp_path: Path) -> None:
+    """It should return the stored tasks, omitting fields a task never had."""
+    cache = DatasetCache(tmp_path)
+
+    assert cache.get(SOURCE) is None
+    cache.put(SOURCE, TASKS)
+
+    assert cache.get(SOURCE) == TASKS
+    assert cache.get(DatasetSource(**{**SOURCE, "revision": "def456"})) is None
+
+
+def test_export_and_import_seed_another_cache(tmp_path: Path) -> None:
+    """It should move cached datasets between caches through an archive."""
+    DatasetCache(tmp_path / "online").put(SOURCE, TASKS)
+    archive = tmp_path / "datasets.tar"
+    runner = CliRunner()
+
+    exported = runner.invoke(
+        app,
+        ["export", "--archive", str(archive), "--cache-dir", str(tmp_path / "online")],
+    )
+    imported = runner.invoke(
+        app,
+        ["import", "--archive", str(archive), "--cache-dir", str(tmp_path / "offline")],
+    )
+
+    assert exported.exit_code == 0, exported.output
+    assert imported.exit_code == 0, imported.output
+    assert "Imported org/bench (sanitized) @ abc123" in imported.output
+    assert DatasetCache(tmp_path / "offline").get(SOURCE) == TASKS
+
+
+def test_prepare_reads_cached_dataset_without_fetching(tmp_path: Path) -> None:
+    """It should fetch once, then prepare from the cache."""
+    fetch = MagicMock(return_value=TASKS)
+    config: BenchmarkConfig = {
+        "name": "MBPP",
+        "fetch": fetch,
+        "evaluate": MagicMock(),
+        "build_script": MagicMock(),
+        "source": SOURCE,
+    }
+    cache_dir = str(tmp_path / "cache")
+
+    with patch("coder_eval.prepare.get_benchmark_or_exit", return_value=config):
+        prepare(
+            benchmark="mbpp", path=str(tmp_path / "a"), cache=True, cache_dir=cache_dir
+        )
+        prepare(
+            benchmark="mbpp", path=str(tmp_path / "b"), cache=True, cache_dir=cache_dir
+        )
+
+    assert fetch.call_count == 1
+    lines = (tmp_path / "b" / "tasks.jsonl").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == TASKS
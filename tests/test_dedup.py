@@ -0,0 +1,38 @@
+from coder_eval.dedup import group_duplicates, normalize
+
+
+def test_normalize_ignores_formatting_and_comments() -> None:
+    """It should treat scripts that differ only in layout and comments as equal."""
+    a = "def add(a, b):\n    return a + b\n"
+    b = "def add(a,b):  # sum\n\n    return (a + b)\n"
+
+    assert normalize(a) == normalize(b)
+
+
+def test_normalize_keeps_literals() -> None:
+    """It should distinguish scripts whose string literals differ."""
+    assert normalize("print('a  b')") != normalize("print('a b')")
+
+
+def test_normalize_falls_back_to_text_for_syntax_errors() -> None:
+    """It should compare unparsable scripts by exact text."""
+    assert normalize("def f(:") == normalize("def f(:")
+    assert normalize("def f(:") != normalize("def f( :")
+
+
+def test_normalize_falls_back_to_text_for_deep_nesting() -> None:
+    """It should compare scripts too deeply nested to parse by exact text."""
+    deep = "def f():\n    return " + "+".join(["0"] * 3000)
+
+    assert normalize(deep) == normalize(deep)
+    assert normalize(deep) != normalize(deep + " ")
+    assert group_duplicates({0: deep, 1: deep}) == {0: [0, 1]}
+
+
+def test_group_duplicates() -> None:
+    """It should group indices under the first occurrence of each program."""
+    groups = group_duplicates(
+        {0: "x = 1", 1: "y = 2", 2: "x  =  1  # same", 4: "y = 2"}
+    )
+
+    assert groups == {0: [0, 2], 1: [1, 4]}
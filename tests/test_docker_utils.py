@@ -0,0 +1,292 @@
+import asyncio
+import json
+import subprocess
+import sys
+from contextlib import ExitStack
+from unittest.mock import patch
+from coder_eval.docker_utils import (
+    BATCH_RUNNER_PATH,
+    FORK_SERVER_PATH,
+    ContainerPool,
+    _write_batch,
+    run_batch,
+    run_script,
+    run_script_async,
+    sandbox_script_source,
+)
+from coder_eval.types import ExecResult
+
+
+class FakeDocker:
+    """Records docker CLI calls and simulates container lifecycle."""
+
+    def __init__(self, exec_returncode: int = 0, timeout: bool = False) -> None:
+        self.exec_returncode = exec_returncode
+        self.timeout = timeout
+        self.started = 0
+        self.removed: list[str] = []
+        self.execs: list[str] = []
+        self.commands: list[tuple[list[str], bytes | None]] = []
+
+    async def execute(
+        self, cmd: list[str], script: str, timeout: float, **kwargs
+    ) -> ExecResult:
+        self.commands.append((cmd, kwargs.get("stdin")))
+        if cmd[1] == "run":
+            self.started += 1
+            return {"stdout": f"cid{self.started}", "stderr": "", "returncode": 0}
+        if cmd[1] == "rm":
+            self.removed.append(cmd[-1])
+            return {"stdout": "", "stderr": "", "returncode": 0}
+        self.execs.append(cmd[3] if cmd[2] == "-i" else cmd[2])
+        if self.timeout:
+            return {"script": script, "returncode": -1, "error": "timeout"}
+        return {"script": script, "stdout": "ok", "returncode": self.exec_returncode}
+
+    def run(self, cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+        self.removed.append(cmd[-1])
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    def patch(self) -> ExitStack:
+        stack = ExitStack()
+        stack.enter_context(patch("coder_eval.docker_utils.execute", self.execute))
+        stack.enter_context(
+            patch("coder_eval.docker_utils.subprocess.run", side_effect=self.run)
+        )
+        return stack
+
+
+def test_pool_reuses_container() -> None:
+    """It should dispatch consecutive scripts into the same warm container."""
+    fake = FakeDocker()
+    with fake.patch():
+        with ContainerPool(size=1, max_uses=10) as pool:
+            first = pool.run("print('ok')")
+            second = pool.run("print('ok')")
+
+    assert first["returncode"] == 0
+    assert second["stdout"] == "ok"
+    assert fake.started == 1
+    assert fake.execs == ["cid1", "cid1"]
+    assert fake.removed == ["cid1"]
+
+
+def test_pool_recycles_after_max_uses() -> None:
+    """It should replace a container once it reaches max_uses executions."""
+    fake = FakeDocker()
+    with fake.patch():
+        with ContainerPool(size=1, max_uses=2) as pool:
+            for _ in range(3):
+                pool.run("print('ok')")
+
+    assert fake.execs == ["cid1", "cid1", "cid2"]
+    assert fake.removed == ["cid1", "cid2"]
+
+
+def test_pool_recycles_after_timeout() -> None:
+    """It should discard a container whose script timed out."""
+    fake = FakeDocker(timeout=True)
+    with fake.patch():
+        with ContainerPool(size=1) as pool:
+            result = pool.run("while True: pass")
+            pool.run("while True: pass")
+
+    assert result.get("error") == "timeout"
+    assert fake.execs == ["cid1", "cid2"]
+    assert fake.removed == ["cid1", "cid2"]
+
+
+def test_pool_reuses_container_with_stdin_delivery() -> None:
+    """It should keep a warm container across scripts piped over stdin."""
+    fake = FakeDocker()
+    with fake.patch():
+        with ContainerPool(size=1, delivery="stdin") as pool:
+            pool.run("print('ok')")
+            pool.run("print('ok')")
+
+    assert fake.started == 1
+    assert fake.execs == ["cid1", "cid1"]
+
+
+def test_stdin_delivery_writes_no_host_files(tmp_path) -> None:
+    """It should pipe scripts into containers that only have a scratch tmpfs."""
+    fake = FakeDocker()
+    with fake.patch(), patch("tempfile.tempdir", str(tmp_path)):
+        with ContainerPool(size=1, delivery="stdin") as pool:
+            pooled = pool.run("print('ok')")
+        one_shot = run_script("print('ok')", delivery="stdin")
+
+    assert pooled["returncode"] == 0 and one_shot["returncode"] == 0
+    assert list(tmp_path.iterdir()) == []
+    start, exec_, run = fake.commands
+    assert "--tmpfs" in start[0] and "-v" not in start[0]
+    assert exec_[0][:4] == ["docker", "exec", "-i", "cid1"]
+    assert exec_[0][-1].endswith("exec python -")
+    assert exec_[1] == b"print('ok')"
+    assert "--tmpfs" in run[0] and run[0][-2:] == ["python", "-"]
+    assert run[1] == b"print('ok')"
+
+
+def test_batch_runner_isolates_scripts(tmp_path) -> None:
+    """It should run each script in its own process with a per-script timeout."""
+    scripts = [
+        "print('hello')",
+        "import sys; sys.exit(3)",
+        "while True: pass",
+        "raise AssertionError('bad')",
+    ]
+    _write_batch(str(tmp_path), scripts)
+
+    proc = subprocess.run(
+        [sys.executable, "runner.py", "1", str(len(scripts))],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    runs = json.loads(proc.stdout)
+
+    assert [r["returncode"] for r in runs] == [0, 3, -1, 1]
+    assert runs[0]["stdout"] == "hello\n"
+    assert runs[2]["error"] == "timeout"
+    assert "AssertionError: bad" in runs[3]["stderr"]
+
+
+def test_batch_runner_caps_output(tmp_path) -> None:
+    """It should truncate long output and kill scripts past the hard limit."""
+    scripts = [
+        "print('a' * 5000)",
+        "while True: print('b' * 1000)",
+        "print('ok')",
+    ]
+    _write_batch(str(tmp_path), scripts)
+
+    proc = subprocess.run(
+        [sys.executable, "runner.py", "10", str(len(scripts)), "1000", "100000"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    runs = json.loads(proc.stdout)
+
+    assert runs[0]["returncode"] == 0
+    assert runs[0]["truncated"] is True
+    assert "bytes truncated" in runs[0]["stdout"]
+    assert runs[1]["error"] == "output_limit"
+    assert runs[2] == {**runs[2], "stdout": "ok\n", "returncode": 0}
+    assert "truncated" not in runs[2]
+
+
+def test_batch_runner_reads_scripts_from_stdin(tmp_path) -> None:
+    """It should take the scripts as JSON on stdin and clear the old batch."""
+    (tmp_path / "runs").mkdir()
+    (tmp_path / "leftover.txt").write_text("previous batch")
+
+    proc = subprocess.run(
+        [sys.executable, "-c", sandbox_script_source(BATCH_RUNNER_PATH), "5", "-"],
+        input=json.dumps(["print('a')", "import os; print(sorted(os.listdir('..')))"]),
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    runs = json.loads(proc.stdout)
+
+    assert [r["stdout"] for r in runs] == ["a\n", "['0', '1']\n"]
+    assert not (tmp_path / "leftover.txt").exists()
+
+
+def test_fork_server_runs_each_script_in_fresh_child(tmp_path) -> None:
+    """It should isolate scripts from each other and kill timed-out ones."""
+    source = sandbox_script_source(FORK_SERVER_PATH).replace(
+        'RUN_DIR = "/workspace"', f"RUN_DIR = {str(tmp_path)!r}"
+    )
+    requests = [
+        "import math; x = 1; print(math.sqrt(x))",
+        "print('x' in globals())",
+        "import sys; sys.exit(3)",
+        "while True: pass",
+        "raise AssertionError('bad')",
+    ]
+    stdin = "".join(json.dumps({"script": s, "timeout": 1}) + "\n" for s in requests)
+    flood = {
+        "script": "while True: print('b' * 1000)",
+        "timeout": 10,
+        "output_limit": 1000,
+        "hard_output_limit": 100000,
+    }
+    stdin += json.dumps(flood) + "\n"
+    stdin += json.dumps({"script": "open('scratch', 'w').close()", "timeout": 1})
+    stdin += "\n" + json.dumps(
+        {"script": "import os; print(os.listdir())", "timeout": 1, "clear": True}
+    )
+    stdin += "\n"
+
+    proc = subprocess.run(
+        [sys.executable, "-c", source, "math"],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    ready, *runs = [json.loads(line) for line in proc.stdout.splitlines()]
+
+    assert ready == {"ready": True}
+    assert [r["returncode"] for r in runs] == [0, 0, 3, -1, 1, -1, 0, 0]
+    assert runs[0]["stdout"] == "1.0\n"
+    assert runs[1]["stdout"] == "False\n"
+    assert runs[3]["error"] == "timeout"
+    assert "AssertionError: bad" in runs[4]["stderr"]
+    assert runs[5]["error"] == "output_limit"
+    assert runs[5]["truncated"] is True
+    assert runs[7]["stdout"] == "[]\n"
+
+
+def test_run_batch_fails_all_scripts_when_container_fails() -> None:
+    """It should mark every script as failed when the batch container errors."""
+
+    async def fake_execute(
+        cmd: list[str], script: str, timeout: float, **kwargs
+    ) -> ExecResult:
+        return {"stdout": "", "stderr": "docker: image not found", "returncode": 125}
+
+    with patch("coder_eval.docker_utils.execute", fake_execute):
+        results = run_batch(["print(1)", "print(2)"])
+
+    assert [r["script"] for r in results] == ["print(1)", "print(2)"]
+    assert all(r["returncode"] == -1 for r in results)
+    assert all(r["error"] == "exception" for r in results)
+
+
+def test_one_shot_containers_are_killed_with_their_client() -> None:
+    """It should kill a container by name when its docker run client is killed."""
+    commands: list[list[str]] = []
+
+    async def fake_execute(
+        cmd: list[str], script: str, timeout: float, **kwargs
+    ) -> ExecResult:
+        commands.append(cmd)
+        if cmd[1] == "kill":
+            return {"stdout": "", "stderr": "", "returncode": 0}
+        if "hang" in script:
+            await asyncio.sleep(10)
+        return {"script": script, "returncode": -1, "error": "timeout"}
+
+    async def cancel_hanging_run() -> None:
+        job = asyncio.ensure_future(run_script_async("hang"))
+        await asyncio.sleep(0.01)
+        job.cancel()
+        await asyncio.gather(job, return_exceptions=True)
+
+    with patch("coder_eval.docker_utils.execute", fake_execute):
+        result = run_script("while True: print('x')")
+        run_batch(["while True: pass"])
+        asyncio.run(cancel_hanging_run())
+
+    assert result["error"] == "timeout"
+    runs = [cmd for cmd in commands if cmd[1] == "run"]
+    kills = [cmd for cmd in commands if cmd[1] == "kill"]
+    assert len(runs) == len(kills) == 3
+    for run_cmd, kill_cmd in zip(runs, kills):
+        assert kill_cmd == ["docker", "kill", run_cmd[run_cmd.index("--name") + 1]]
@@ -0,0 +1,379 @@
+import asyncio
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+import pytest
+from coder_eval.engine import evaluate_samples
+from coder_eval.evaluators import humaneval_eval
+from coder_eval.process_sandbox import ProcessSandbox
+from coder_eval.types import Task, Sample, ExecResult
+
+
+def make_task(task_id: str) -> Task:
+    return {
+        "id": task_id,
+        "benchmark": "humaneval",
+        "prompt": "def add(a, b):",
+        "entry_point": "add",
+        "reference_solution": "    return a + b",
+        "tests": ["def check(f):\n    assert f(1, 2) == 3"],
+    }
+
+
+def test_evaluate_samples_preserves_order() -> None:
+    """It should rebuild SampleResults in input order regardless of finish order."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(f"task_{i}"),
+            {
+                "task_id": f"task_{i}",
+                "model_name": "test-model",
+                "completions": ["    return a + b", "    return a - b"],
+            },
+        )
+        for i in range(4)
+    ]
+
+    def fake_run(script: str) -> ExecResult:
+        passed = "a + b" in script
+        # Make passing jobs finish last to scramble completion order
+        time.sleep(0.02 if passed else 0.0)
+        return {"script": script, "returncode": 0 if passed else 1, "exec_time": 0.0}
+
+    results = list(
+        evaluate_samples(pairs, humaneval_eval.build_script, run=fake_run, workers=4)
+    )
+
+    assert [r["task_id"] for r in results] == [f"task_{i}" for i in range(4)]
+    for r in results:
+        assert r["num_passed"] == 1
+        assert r["num_failed"] == 1
+        assert r.get("passed_any") is True
+        assert [er["returncode"] for er in r["results"]] == [0, 1]
+
+
+def test_evaluate_samples_runs_in_parallel() -> None:
+    """It should execute completions concurrently up to the worker count."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task("task_1"),
+            {
+                "task_id": "task_1",
+                "model_name": "test-model",
+                "completions": ["    return a + b"] * 4,
+            },
+        )
+    ]
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def fake_run(script: str) -> ExecResult:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return {"script": script, "returncode": 0, "exec_time": 0.05}
+
+    results = list(
+        evaluate_samples(pairs, humaneval_eval.build_script, run=fake_run, workers=4)
+    )
+
+    assert peak > 1
+    assert results[0]["num_passed"] == 4
+
+
+def test_evaluate_samples_batches_per_task() -> None:
+    """It should send all completions of a task to run_batch as one job."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(f"task_{i}"),
+            {
+                "task_id": f"task_{i}",
+                "model_name": "test-model",
+                "completions": ["    return a + b", "    return a - b"],
+            },
+        )
+        for i in range(3)
+    ]
+    batches: list[list[str]] = []
+
+    def fake_run_batch(scripts: list[str]) -> list[ExecResult]:
+        batches.append(scripts)
+        return [
+            {"script": s, "returncode": 0 if "a + b" in s else 1, "exec_time": 0.0}
+            for s in scripts
+        ]
+
+    def fail_run(script: str) -> ExecResult:
+        raise AssertionError("run should not be called in batch mode")
+
+    results = list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fail_run,
+            workers=2,
+            run_batch=fake_run_batch,
+        )
+    )
+
+    assert len(batches) == 3
+    assert all(len(batch) == 2 for batch in batches)
+    assert [r["num_passed"] for r in results] == [1, 1, 1]
+
+
+def test_evaluate_samples_early_stop_skips_after_pass() -> None:
+    """It should cancel queued completions once one of the task's completions passes."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task("task_1"),
+            {
+                "task_id": "task_1",
+                "model_name": "test-model",
+                "completions": ["    return a - b", "    return a + b"]
+                + ["    return a * b"] * 3,
+            },
+        )
+    ]
+    scripts: list[str] = []
+
+    def fake_run(script: str) -> ExecResult:
+        scripts.append(script)
+        return {"script": script, "returncode": 0 if "a + b" in script else 1}
+
+    results = list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fake_run,
+            workers=1,
+            early_stop=True,
+        )
+    )
+
+    assert len(scripts) == 2
+    assert results[0]["num_passed"] == 1
+    assert results[0]["num_failed"] == 1
+    assert results[0]["skipped"] == [2, 3, 4]
+
+
+def test_evaluate_samples_limits_async_concurrency() -> None:
+    """It should keep at most `workers` async jobs in flight on one thread."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(f"task_{i}"),
+            {
+                "task_id": f"task_{i}",
+                "model_name": "test-model",
+                "completions": ["    return a + b"] * 10,
+            },
+        )
+        for i in range(30)
+    ]
+    active = 0
+    peak = 0
+
+    async def fake_run(script: str) -> ExecResult:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"script": script, "returncode": 0}
+
+    results = list(
+        evaluate_samples(pairs, humaneval_eval.build_script, run=fake_run, workers=100)
+    )
+
+    assert peak == 100
+    assert len(results) == 30
+    assert all(r["num_passed"] == 10 for r in results)
+
+
+def test_evaluate_samples_dedup_runs_unique_programs_once() -> None:
+    """It should run duplicate completions once and fan the result out."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task("task_1"),
+            {
+                "task_id": "task_1",
+                "model_name": "test-model",
+                "completions": [
+                    "    return a + b",
+                    "    return a - b",
+                    "    return a + b  # add",
+                    "    return (a - b)",
+                ],
+            },
+        )
+    ]
+    scripts: list[str] = []
+    recorded: list[int] = []
+
+    def fake_run(script: str) -> ExecResult:
+        scripts.append(script)
+        return {"script": script, "returncode": 0 if "a + b" in script else 1}
+
+    results = list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fake_run,
+            on_exec=lambda model, task_id, idx, result: recorded.append(idx),
+            dedup=True,
+        )
+    )
+
+    assert len(scripts) == 2
+    assert sorted(recorded) == [0, 1, 2, 3]
+    exec_results = results[0]["results"]
+    assert [r["returncode"] for r in exec_results] == [0, 1, 0, 1]
+    assert exec_results[2]["duplicate_of"] == 0
+    assert exec_results[3]["duplicate_of"] == 1
+    assert "# add" in exec_results[2]["script"]
+    assert results[0]["num_passed"] == 2
+
+
+def test_evaluate_samples_passes_task_timeouts() -> None:
+    """It should run each task's scripts with that task's timeout, if any."""
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(f"task_{i}"),
+            {
+                "task_id": f"task_{i}",
+                "model_name": "test-model",
+                "completions": ["    return a + b"] * 2,
+            },
+        )
+        for i in range(3)
+    ]
+    seen: list[tuple[float, ...]] = []
+
+    def fake_run(script: str, *timeout: float) -> ExecResult:
+        seen.append(timeout)
+        return {"script": script, "returncode": 0}
+
+    def fake_run_batch(scripts: list[str], *timeout: float) -> list[ExecResult]:
+        seen.append(timeout)
+        return [{"script": script, "returncode": 0} for script in scripts]
+
+    timeouts = {"task_0": 0.5, "task_1": None, "task_2": 2.0}
+    list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fake_run,
+            task_timeout=lambda task: timeouts[task["id"]],
+        )
+    )
+    assert seen == [(0.5,), (0.5,), (), (), (2.0,), (2.0,)]
+
+    seen.clear()
+    list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fake_run,
+            run_batch=fake_run_batch,
+            task_timeout=lambda task: timeouts[task["id"]],
+        )
+    )
+    assert seen == [(0.5,), (), (2.0,)]
+
+
+def test_evaluate_samples_starts_longest_jobs_first() -> None:
+    """It should start waiting jobs by expected cost but yield in input order."""
+    costs = {"task_0": 1.0, "task_1": 3.0, "task_2": 2.0, "task_3": 4.0}
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(task_id),
+            {
+                "task_id": task_id,
+                "model_name": "test-model",
+                "completions": [f"    return a + b  # {task_id}"],
+            },
+        )
+        for task_id in costs
+    ]
+    started: list[str] = []
+
+    async def fake_run(script: str) -> ExecResult:
+        started.append(script.split("# ")[1].split("\n")[0])
+        await asyncio.sleep(0.01)
+        return {"script": script, "returncode": 0, "exec_time": 0.0}
+
+    results = list(
+        evaluate_samples(
+            pairs,
+            humaneval_eval.build_script,
+            run=fake_run,
+            workers=1,
+            job_cost=lambda task: costs[task["id"]],
+        )
+    )
+
+    assert started == ["task_3", "task_1", "task_2", "task_0"]
+    assert [r["task_id"] for r in results] == list(costs)
+
+
+def _running(pid: int) -> bool:
+    """Whether a process exists and hasn't exited yet (zombies don't count)."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        return False
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="needs /proc")
+def test_interrupted_run_kills_sandboxed_scripts(tmp_path: Path) -> None:
+    """It should kill in-flight scripts when Ctrl-C stops the run."""
+    pid_dir = tmp_path / "pids"
+    pid_dir.mkdir()
+    completion = (
+        "    import os, time\n"
+        f"    open(os.path.join({str(pid_dir)!r}, str(os.getpid())), 'w').close()\n"
+        "    time.sleep(40)"
+    )
+    pairs: list[tuple[Task, Sample]] = [
+        (
+            make_task(f"task_{i}"),
+            {
+                "task_id": f"task_{i}",
+                "model_name": "test-model",
+                "completions": [completion + f"  # {i}"],
+            },
+        )
+        for i in range(4)
+    ]
+
+    def interrupt_once_started() -> None:
+        deadline = time.monotonic() + 20
+        while len(list(pid_dir.iterdir())) < 4 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # A real SIGINT, like Ctrl-C, so it also wakes the loop's select()
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=interrupt_once_started, daemon=True).start()
+    with pytest.raises(KeyboardInterrupt):
+        list(
+            evaluate_samples(
+                pairs,
+                humaneval_eval.build_script,
+                run=ProcessSandbox().run_async,
+                workers=4,
+            )
+        )
+
+    pids = [int(path.name) for path in pid_dir.iterdir()]
+    assert len(pids) == 4
+    deadline = time.monotonic() + 5
+    while any(_running(pid) for pid in pids) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(_running(pid) for pid in pids)
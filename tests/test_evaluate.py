@@ -1,5 +1,7 @@
 from pathlib import Path
-from coder_eval.evaluate import create_results_dir, read_tasks, read_samples
+from unittest.mock import patch
+from coder_eval.evaluate import app, create_results_dir, read_tasks, read_samples
+from typer.testing import CliRunner, Result
 import re
 import json
 import pytest
@@ -171,3 +173,213 @@ def test_read_samples_empty_file(tmp_path: Path) -> None:
 
     with pytest.raises(typer.BadParameter, match="No samples found in samples.jsonl"):
         read_samples(samples_file)
+
+
+def write_jsonl(path: Path, rows: list[dict]) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def write_add_benchmark(
+    tmp_path: Path, num_tasks: int, samples: list[dict]
+) -> tuple[Path, Path]:
+    """Write HumanEval-style ``add`` tasks and the given samples."""
+    bench_path: Path = tmp_path / "bench"
+    bench_path.mkdir()
+    write_jsonl(
+        bench_path / "tasks.jsonl",
+        [
+            {
+                "id": f"task_{i}",
+                "benchmark": "humaneval",
+                "prompt": "def add(a, b):",
+                "entry_point": "add",
+                "reference_solution": "    return a + b",
+                "tests": ["def check(f):\n    assert f(1, 2) == 3"],
+            }
+            for i in range(num_tasks)
+        ],
+    )
+    samples_path: Path = tmp_path / "samples.jsonl"
+    write_jsonl(samples_path, samples)
+    return bench_path, samples_path
+
+
+def make_sample(task_id: str, *completions: str, model: str = "test-model") -> dict:
+    return {"task_id": task_id, "model_name": model, "completions": list(completions)}
+
+
+def invoke_evaluate(
+    bench_path: Path, samples_path: Path, *args: str
+) -> tuple[Result, list[str]]:
+    """Run evaluate with a fake sandbox in which only ``a + b`` passes.
+
+    Returns the CLI result and the scripts that reached the sandbox.
+    """
+    scripts: list[str] = []
+
+    async def fake_run(
+        script: str, timeout: float = 10, delivery: str = "mount"
+    ) -> dict:
+        scripts.append(script)
+        return {"script": script, "returncode": 0 if "a + b" in script else 1}
+
+    with (
+        patch("coder_eval.sandbox.ensure_docker_image"),
+        patch("coder_eval.sandbox.run_script_async", fake_run),
+    ):
+        result = CliRunner().invoke(
+            app,
+            [
+                "--path",
+                str(bench_path),
+                "--samples",
+                str(samples_path),
+                "--no-cache",
+                *args,
+            ],
+        )
+    return result, scripts
+
+
+def test_evaluate_writes_results_incrementally(tmp_path: Path) -> None:
+    """It should stream samples through the sandbox and write one result per task."""
+    bench_path, samples_path = write_add_benchmark(
+        tmp_path,
+        3,
+        [
+            make_sample("task_0", "    return a + b", "    return a - b"),
+            make_sample("task_1", "    return a - b"),
+            make_sample("task_0", "    return a + b"),
+        ],
+    )
+
+    result, _ = invoke_evaluate(
+        bench_path,
+        samples_path,
+        "--output-dir",
+        str(tmp_path / "out"),
+        "--workers",
+        "2",
+        "--k",
+        "1,2",
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "appears again" in result.output
+    assert "Evaluated 2/3 tasks" in result.output
+
+    results_file = next((tmp_path / "out").glob("*/results.jsonl"))
+    rows = [json.loads(line) for line in results_file.read_text().splitlines()]
+    assert [r["task_id"] for r in rows] == ["task_0", "task_1"]
+    assert [r["num_passed"] for r in rows] == [1, 0]
+
+    summary = json.loads((results_file.parent / "summary.json").read_text())
+    assert summary["evaluated_tasks"] == 2
+    assert summary["pass_at_k"] == {"1": 0.25, "2": 1.0}
+    assert "pass@1: 25.0%" in result.output
+
+
+def test_evaluate_resume_skips_finished_work(tmp_path: Path) -> None:
+    """It should only run executions missing from an interrupted run."""
+    bench_path, samples_path = write_add_benchmark(
+        tmp_path,
+        3,
+        [
+            make_sample(f"task_{i}", "    return a + b", "    return a - b")
+            for i in range(3)
+        ],
+    )
+
+    # task_0 was written, task_1 was half done and task_2 never started
+    results_dir: Path = tmp_path / "out" / "interrupted"
+    results_dir.mkdir(parents=True)
+    finished = {
+        "task_id": "task_0",
+        "model_name": "test-model",
+        "passed_any": True,
+        "num_passed": 1,
+        "num_failed": 1,
+        "results": [{"returncode": 0}, {"returncode": 1}],
+    }
+    (results_dir / "results.jsonl").write_text(
+        json.dumps(finished) + "\n" + '{"task_id": "task_1"'
+    )
+    write_jsonl(
+        results_dir / "checkpoint.jsonl",
+        [{"task_id": "task_1", "completion_idx": 0, "result": {"returncode": 0}}],
+    )
+
+    result, scripts = invoke_evaluate(
+        bench_path, samples_path, "--resume", str(results_dir)
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(scripts) == 3
+    assert "Evaluated 3/3 tasks" in result.output
+    assert not (results_dir / "checkpoint.jsonl").exists()
+
+    lines = (results_dir / "results.jsonl").read_text().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [r["task_id"] for r in rows] == ["task_0", "task_1", "task_2"]
+    assert rows[1]["num_passed"] == 1
+
+
+def test_evaluate_multiple_models_in_one_run(tmp_path: Path) -> None:
+    """It should score every model and write per-model files and a combined summary."""
+    bench_path, samples_path = write_add_benchmark(
+        tmp_path,
+        2,
+        [
+            make_sample(f"task_{i}", completion, model=model)
+            for model, completion in [
+                ("good/model", "    return a + b"),
+                ("bad-model", "    return a - b"),
+            ]
+            for i in range(2)
+        ],
+    )
+
+    result, _ = invoke_evaluate(
+        bench_path, samples_path, "--output-dir", str(tmp_path / "out"), "--k", "1"
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "appears again" not in result.output
+    assert "Evaluated 2/2 tasks on HumanEval with model good/model" in result.output
+    assert "Evaluated 2/2 tasks on HumanEval with model bad-model" in result.output
+
+    run_dir = next((tmp_path / "out").iterdir())
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["models"]["good/model"]["pass_at_k"] == {"1": 1.0}
+    assert summary["models"]["bad-model"]["pass_at_k"] == {"1": 0.0}
+
+    good_rows = (run_dir / "models" / "good_model" / "results.jsonl").read_text()
+    assert [json.loads(line)["task_id"] for line in good_rows.splitlines()] == [
+        "task_0",
+        "task_1",
+    ]
+    bad_summary = json.loads(
+        (run_dir / "models" / "bad-model" / "summary.json").read_text()
+    )
+    assert bad_summary["passed_any"] == 0
+
+
+def test_evaluate_rejects_pass_at_k_with_early_stop(tmp_path: Path) -> None:
+    """It should refuse pass@k when skipped completions would bias it."""
+    result = CliRunner().invoke(
+        app,
+        [
+            "--path",
+            str(tmp_path),
+            "--samples",
+            str(tmp_path / "samples.jsonl"),
+            "--early-stop",
+            "--k",
+            "1",
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "--early-stop" in result.output
@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+from typer.testing import CliRunner
+from coder_eval.dedup import group_duplicates
+from coder_eval.evaluate import app
+from coder_eval.evaluators.mbpp_eval import build_script, read_test_report
+from coder_eval.process_sandbox import ProcessSandbox
+from coder_eval.stub_sandbox import StubSandbox
+from coder_eval.types import ExecResult, Task
+
+TASK: Task = {
+    "id": "2",
+    "benchmark": "mbpp",
+    "prompt": "Write a function to add two numbers.",
+    "reference_solution": "def add(a, b):\n    return a + b",
+    "tests": [
+        "assert add(1, 2) == 3",
+        "assert add(0, 0) == 0",
+        "assert add(2, 2) == 4",
+    ],
+    "test_setup": "import math",
+}
+
+
+def run(completion: str, fail_fast: bool = True) -> ExecResult:
+    script = build_script(TASK, completion, fail_fast=fail_fast)
+    return read_test_report(TASK, ProcessSandbox().run(script))
+
+
+def test_per_test_report_for_passing_completion() -> None:
+    """It should run every test and strip the report from stdout."""
+    result = run("def add(a, b):\n    print('adding')\n    return a + b")
+
+    assert result["returncode"] == 0
+    assert result["stdout"] == "adding\nadding\nadding"
+    assert result["num_tests"] == 3
+    assert [t["passed"] for t in result["tests"]] == [True, True, True]
+    assert all(t["time"] >= 0 for t in result["tests"])
+
+
+def test_fail_fast_stops_at_first_failing_test() -> None:
+    """It should stop after the first failure unless fail-fast is off."""
+    completion = "def add(a, b):\n    return a * b"
+
+    result = run(completion)
+    assert result["returncode"] == 1
+    assert result["tests"] == [
+        {"passed": False, "time": result["tests"][0]["time"], "error": "AssertionError"}
+    ]
+    assert "assert add(1, 2) == 3" in result["stderr"]
+
+    result = run(completion, fail_fast=False)
+    assert result["returncode"] == 1
+    assert [t["passed"] for t in result["tests"]] == [False, True, True]
+
+
+def test_report_survives_hijacked_stdout() -> None:
+    """It should report tests even if the completion closes sys.stdout."""
+    result = run("import sys\nsys.stdout.close()\ndef add(a, b):\n    return a + b")
+
+    assert result["returncode"] == 0
+    assert result["num_tests"] == 3
+
+
+def test_exit_before_tests_fails() -> None:
+    """It should fail a completion that exits cleanly before the tests ran."""
+    result = run("import sys\nsys.exit(0)")
+
+    assert result["returncode"] == 1
+    assert result["tests"] == [] and result["num_tests"] == 3
+    assert "Tests did not run to completion" in result["stderr"]
+
+
+def test_crash_before_tests_counts_every_test() -> None:
+    """It should count all tests of a completion that crashes at top level."""
+    result = run("raise RuntimeError('boom')")
+
+    assert result["returncode"] == 1
+    assert result["tests"] == [] and result["num_tests"] == 3
+    assert "RuntimeError: boom" in result["stderr"]
+
+
+def test_stub_sandbox_reports_tests() -> None:
+    """It should get a test report for MBPP scripts from the stub sandbox."""
+    script = build_script(TASK, "def add(a, b):\n    return a + b")
+
+    passed = read_test_report(TASK, StubSandbox(failure_rate=0.0).run(script))
+    assert passed["returncode"] == 0
+    assert passed["stdout"] == ""
+    assert [t["passed"] for t in passed["tests"]] == [True, True, True]
+
+    failed = read_test_report(TASK, StubSandbox(failure_rate=1.0).run(script))
+    assert failed["returncode"] == 1
+    assert [t["passed"] for t in failed["tests"]] == [False]
+    assert failed["num_tests"] == 3
+
+
+def test_formatting_variants_still_deduplicate() -> None:
+    """It should keep completions that differ in formatting in one group."""
+    scripts = {
+        0: build_script(TASK, "def add(a, b):\n    return a + b"),
+        1: build_script(TASK, "def add(a,b):  # sum\n    return a+b"),
+        2: build_script(TASK, "def add(a, b):\n    return b + a"),
+    }
+
+    assert group_duplicates(scripts) == {0: [0, 1], 2: [2]}
+
+
+def test_evaluate_reports_test_pass_rate(tmp_path: Path) -> None:
+    """It should read per-test reports during evaluate and score partial credit."""
+    bench_path = tmp_path / "bench"
+    bench_path.mkdir()
+    (bench_path / "tasks.jsonl").write_text(json.dumps(TASK) + "\n")
+    samples_path = tmp_path / "samples.jsonl"
+    sample = {
+        "task_id": "2",
+        "model_name": "m",
+        "completions": [
+            "def add(a, b):\n    return a + b",
+            "def add(a, b):\n    return 0",
+            "raise RuntimeError('boom')",
+            "",
+        ],
+    }
+    samples_path.write_text(json.dumps(sample) + "\n")
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "--path",
+            str(bench_path),
+            "--samples",
+            str(samples_path),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--sandbox",
+            "process",
+            "--no-cache",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    run_dir = next((tmp_path / "out").iterdir())
+    row = json.loads((run_dir / "results.jsonl").read_text())
+    assert [er["num_tests"] for er in row["results"]] == [3, 3, 3, 3]
+    assert row["results"][3]["error"] == "empty"
+    assert "__coder_eval_tests__" not in row["results"][0]["stdout"]
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["test_pass_rate"] == 3 / 12
+    assert "Tests passed: 3/12" in result.output
@@ -0,0 +1,42 @@
+import math
+import numpy as np
+from coder_eval.metrics import mean_pass_at_k, pass_at_k
+
+
+def reference_pass_at_k(n: int, c: int, k: int) -> float:
+    if n - c < k:
+        return 1.0
+    return 1.0 - math.comb(n - c, k) / math.comb(n, k)
+
+
+def test_pass_at_k_matches_combinatorial_definition() -> None:
+    """It should match 1 - C(n-c, k) / C(n, k) for every task."""
+    rng = np.random.default_rng(0)
+    n = rng.integers(1, 200, size=500)
+    c = rng.integers(0, n + 1)
+
+    for k in (1, 10, 100):
+        estimates = pass_at_k(n, c, k)
+        for ni, ci, est in zip(n, c, estimates):
+            if ni < k:
+                assert math.isnan(est)
+            else:
+                assert math.isclose(
+                    est, reference_pass_at_k(int(ni), int(ci), k), abs_tol=1e-9
+                )
+
+
+def test_pass_at_1_is_fraction_correct() -> None:
+    """It should reduce to c / n for k = 1."""
+    estimates = pass_at_k([4, 10, 3], [1, 0, 3], 1)
+    assert np.allclose(estimates, [0.25, 0.0, 1.0])
+
+
+def test_mean_pass_at_k_ignores_tasks_with_too_few_samples() -> None:
+    """It should average only over tasks with at least k samples."""
+    scores = mean_pass_at_k([1, 2, 2], [1, 0, 2], [1, 2, 5])
+
+    assert scores[1] is not None
+    assert math.isclose(scores[1], (1.0 + 0.0 + 1.0) / 3)
+    assert scores[2] == 0.5
+    assert scores[5] is None
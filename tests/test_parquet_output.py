@@ -0,0 +1,78 @@
+from pathlib import Path
+import pyarrow.parquet as pq
+from typer.testing import CliRunner
+from coder_eval.bench import write_synthetic_benchmark
+from coder_eval.evaluate import app
+from coder_eval.parquet_output import (
+    OUTPUT_PREVIEW_CHARS,
+    ParquetResultsWriter,
+    flatten_result,
+)
+from coder_eval.types import SampleResult
+
+
+def test_flatten_result_recovers_completion_indices() -> None:
+    """It should number executions around skipped completions and drop scripts."""
+    result = SampleResult(
+        task_id="t1",
+        model_name="m",
+        results=[
+            {"script": "a", "returncode": 1, "stderr": "x" * 5000},
+            {"script": "b", "returncode": 0, "exec_time": 0.5},
+        ],
+        skipped=[1, 3],
+    )
+
+    rows = list(flatten_result(result))
+
+    assert [r["completion_idx"] for r in rows] == [0, 2]
+    assert [r["passed"] for r in rows] == [False, True]
+    assert len(rows[0]["stderr"]) == OUTPUT_PREVIEW_CHARS
+    assert all("script" not in r for r in rows)
+
+
+def test_writer_flushes_row_groups(tmp_path: Path) -> None:
+    """It should write buffered rows in row groups and on close."""
+    path = tmp_path / "results.parquet"
+    result = SampleResult(
+        task_id="t1",
+        model_name="m",
+        results=[{"returncode": 0}, {"returncode": 1, "error": "timeout"}],
+    )
+    with ParquetResultsWriter(path, row_group_size=3) as writer:
+        for _ in range(4):
+            writer.add(result)
+
+    table = pq.read_table(path, columns=["task_id", "passed", "error"])
+    assert table.num_rows == 8
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert table.column("error").to_pylist()[:2] == [None, "timeout"]
+
+
+def test_evaluate_writes_parquet_alongside_jsonl(tmp_path: Path) -> None:
+    """It should write one Parquet row per execution next to results.jsonl."""
+    bench_path, samples_path = write_synthetic_benchmark(tmp_path, 25, 10)
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "--path",
+            str(bench_path),
+            "--samples",
+            str(samples_path),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--sandbox",
+            "stub",
+            "--no-cache",
+            "--output-format",
+            "parquet",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    run_dir = next((tmp_path / "out").iterdir())
+    assert (run_dir / "results.jsonl").exists()
+    table = pq.read_table(run_dir / "results.parquet")
+    assert table.num_rows == 25
+    assert table.column("passed").to_pylist() == [True] * 25
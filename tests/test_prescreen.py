@@ -0,0 +1,90 @@
+from coder_eval.engine import evaluate_samples
+from coder_eval.evaluators import humaneval_eval, mbpp_eval
+from coder_eval.evaluators.common import prescreen
+from coder_eval.types import ExecResult, Sample, Task
+
+TASK: Task = {
+    "id": "t",
+    "benchmark": "humaneval",
+    # The prompt describes the function rather than starting it
+    "prompt": "# Write a function add(a, b) that returns the sum of a and b.\n",
+    "entry_point": "add",
+    "reference_solution": "def add(a, b):\n    return a + b\n",
+    "tests": ["def check(f):\n    assert f(1, 2) == 3"],
+}
+
+
+def screen(completion: str, task: Task = TASK) -> ExecResult | None:
+    return prescreen(task, completion, humaneval_eval.build_script(task, completion))
+
+
+def test_prescreen_rejects_broken_completions() -> None:
+    """It should fail empty, unparseable and entry-point-less completions."""
+    empty = screen("  \n")
+    assert empty is not None and empty["error"] == "empty"
+
+    syntax = screen("def add(a, b)\n    return a + b")
+    assert syntax is not None and syntax["error"] == "syntax"
+    assert syntax["returncode"] == 1
+    assert "SyntaxError" in syntax["stderr"]
+
+    missing = screen("def plus(a, b):\n    return a + b")
+    assert missing is not None and missing["error"] == "missing_entry_point"
+
+
+def test_prescreen_entry_point_defined_by_prompt() -> None:
+    """It should count the prompt's own definition of the entry point."""
+    humaneval_task: Task = {
+        **TASK,
+        "prompt": 'def add(a, b):\n    """Return the sum of a and b."""\n',
+    }
+
+    assert screen("    return a + b", humaneval_task) is None
+    assert screen("def plus(a, b):\n    return a + b", humaneval_task) is None
+    broken = screen("    return a +", humaneval_task)
+    assert broken is not None and broken["error"] == "syntax"
+
+
+def test_prescreen_passes_plausible_completions() -> None:
+    """It should let anything that might define the entry point through."""
+    for completion in [
+        "def add(a, b):\n    return a + b",
+        "add = lambda a, b: a + b",
+        "from operator import add",
+        "from operator import *",
+        "if True:\n    def add(a, b):\n        return a + b",
+    ]:
+        assert screen(completion) is None, completion
+
+    # MBPP tasks have no entry point, so only parsing is checked
+    mbpp_task: Task = {"id": "m", "tests": ["assert f() == 1"], "test_setup": ""}
+    script = mbpp_eval.build_script(mbpp_task, "def f():\n    return 1")
+    assert prescreen(mbpp_task, "def f():\n    return 1", script) is None
+
+
+def test_engine_skips_sandbox_for_prescreened_completions() -> None:
+    """It should record pre-screened failures without calling the runner."""
+    sample: Sample = {
+        "task_id": "t",
+        "model_name": "m",
+        "completions": ["def add(a, b):\n    return a + b", "", "def add(:"],
+    }
+    ran: list[str] = []
+    recorded: list[int] = []
+
+    def fake_run(script: str) -> ExecResult:
+        ran.append(script)
+        return {"script": script, "returncode": 0}
+
+    [result] = evaluate_samples(
+        [(TASK, sample)],
+        humaneval_eval.build_script,
+        run=fake_run,
+        on_exec=lambda model, task_id, idx, result: recorded.append(idx),
+        prescreen=prescreen,
+    )
+
+    assert len(ran) == 1
+    assert sorted(recorded) == [0, 1, 2]
+    assert [er.get("error") for er in result["results"]] == [None, "empty", "syntax"]
+    assert result["num_passed"] == 1 and result["num_failed"] == 2
@@ -0,0 +1,76 @@
+import shutil
+import subprocess
+from unittest.mock import patch
+import pytest
+from coder_eval.process_sandbox import ProcessSandbox, UNSHARE_CMD
+
+
+def test_run_passing_script() -> None:
+    """It should capture stdout and a zero return code."""
+    result = ProcessSandbox().run("print('hello')")
+
+    assert result["returncode"] == 0
+    assert result["stdout"] == "hello"
+    assert result["script"] == "print('hello')"
+
+
+def test_run_failing_script() -> None:
+    """It should report the traceback and a non-zero return code."""
+    result = ProcessSandbox().run("assert 1 == 2, 'mismatch'")
+
+    assert result["returncode"] == 1
+    assert "AssertionError: mismatch" in result["stderr"]
+
+
+def test_run_timeout() -> None:
+    """It should kill scripts that run past the timeout."""
+    result = ProcessSandbox().run("while True: pass", timeout=1)
+
+    assert result["returncode"] == -1
+    assert result.get("error") == "timeout"
+
+
+def test_run_limits_file_size() -> None:
+    """It should stop scripts from writing files past the size limit."""
+    with patch("coder_eval.process_sandbox.FILE_SIZE_LIMIT_BYTES", 1024):
+        result = ProcessSandbox().run(
+            "import signal\n"
+            "signal.signal(signal.SIGXFSZ, signal.SIG_IGN)\n"
+            "with open('big.txt', 'w') as f:\n"
+            "    f.write('x' * 4096)\n"
+        )
+
+    assert result["returncode"] != 0
+    assert "File too large" in result["stderr"]
+
+
+def test_run_uses_private_directory() -> None:
+    """It should run each script in its own temporary working directory."""
+    sandbox = ProcessSandbox()
+    first = sandbox.run(
+        "open('state.txt', 'w').write('x'); import os; print(os.getcwd())"
+    )
+    second = sandbox.run("import os; print(os.path.exists('state.txt'))")
+
+    assert first["returncode"] == 0
+    assert second["stdout"] == "False"
+
+
+def namespaces_available() -> bool:
+    if shutil.which("unshare") is None:
+        return False
+    proc = subprocess.run([*UNSHARE_CMD, "true"], capture_output=True)
+    return proc.returncode == 0
+
+
+@pytest.mark.skipif(not namespaces_available(), reason="user namespaces unavailable")
+def test_run_with_namespaces_has_no_network() -> None:
+    """It should cut scripts off from the network inside new namespaces."""
+    result = ProcessSandbox(namespaces=True).run(
+        "import socket\n"
+        "s = socket.socket()\n"
+        "s.settimeout(1)\n"
+        "s.connect(('1.1.1.1', 53))\n"
+    )
+
+    assert result["returncode"] != 0
@@ -0,0 +1,58 @@
+import pytest
+from coder_eval.process_sandbox import ProcessSandbox
+from coder_eval.profiling import PhaseProfile, PhaseTimer
+from coder_eval.types import ExecResult, SampleResult
+
+
+def test_phase_timer_accumulates_repeated_phases() -> None:
+    """It should add up every interval spent in the same phase."""
+    timer = PhaseTimer()
+    with timer.phase("run"):
+        pass
+    first = timer.phases["run"]
+    with timer.phase("run"):
+        pass
+
+    assert timer.phases["run"] >= first
+    assert timer.attach(ExecResult())["phases"] == timer.phases
+
+
+def test_phase_timer_splits_batches_evenly() -> None:
+    """It should charge each script in a batch an equal share of every phase."""
+    timer = PhaseTimer()
+    timer.phases = {"prepare": 0.2, "run": 1.0}
+
+    results = timer.attach_all([ExecResult(), ExecResult()])
+
+    assert [r["phases"] for r in results] == [{"prepare": 0.1, "run": 0.5}] * 2
+
+
+def test_profile_percentiles_skip_results_that_never_ran() -> None:
+    """It should time executed scripts only, not duplicates or cache hits."""
+    profile = PhaseProfile()
+    result = SampleResult(
+        task_id="t1",
+        results=[
+            ExecResult(phases={"prepare": 0.001, "run": 0.1}),
+            ExecResult(phases={"prepare": 0.003, "run": 0.3}),
+            ExecResult(phases={"prepare": 0.003, "run": 0.3}, duplicate_of=1),
+            ExecResult(returncode=0),
+        ],
+    )
+    profile.add("mbpp", result)
+
+    report = profile.percentiles()["mbpp"]
+
+    assert list(report) == ["prepare", "run", "total"]
+    assert report["run"]["count"] == 2
+    assert report["run"]["p50"] == pytest.approx(0.2)
+    assert report["run"]["max"] == pytest.approx(0.3)
+    assert report["total"]["max"] == pytest.approx(0.303)
+
+
+def test_process_sandbox_records_phases() -> None:
+    """It should time each phase of a local execution."""
+    result = ProcessSandbox().run("print('hello')")
+
+    assert list(result["phases"]) == ["prepare", "run", "teardown"]
+    assert result["phases"]["run"] > 0
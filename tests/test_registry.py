@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+from coder_eval.registry import BENCHMARK_CONFIG, LazyCallable, load_benchmark
+
+HEAVY_MODULES = ["datasets", "pandas", "pyarrow", "numpy"]
+
+
+def test_cli_startup_skips_heavy_imports() -> None:
+    """It should not import dataset or array libraries when loading the CLI."""
+    check = (
+        "import sys, coder_eval.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+
+    assert proc.stdout.strip() == ""
+
+
+def test_lazy_callable_resolves_on_first_call() -> None:
+    """It should import the referenced attribute only when called."""
+    lazy = LazyCallable("os.path:join")
+
+    assert lazy._target is None
+    assert lazy("a", "b") == os.path.join("a", "b")
+    assert lazy._target is not None
+
+
+def test_load_benchmark_returns_builtins_and_none_for_unknown() -> None:
+    """It should return built-in configs, and None for names nothing defines."""
+    assert load_benchmark("humaneval") is BENCHMARK_CONFIG["humaneval"]
+    assert load_benchmark("fakebench") is None
@@ -0,0 +1,49 @@
+import json
+from pathlib import Path
+from coder_eval.schedule import SECONDS_PER_TEST, expected_cost, read_exec_times
+from coder_eval.types import SampleResult, Task
+
+
+def test_read_exec_times_averages_runs_that_ran(tmp_path: Path) -> None:
+    """It should average exec_time per task, skipping copies and rejections."""
+    results = [
+        SampleResult(
+            task_id="a",
+            model_name="m",
+            results=[
+                {"returncode": 0, "exec_time": 1.0},
+                {"returncode": -1, "exec_time": 3.0, "error": "timeout"},
+                {"returncode": 0, "exec_time": 1.0, "duplicate_of": 0},
+                {"returncode": 1, "exec_time": 0.0, "error": "syntax"},
+            ],
+        ),
+        SampleResult(task_id="b", model_name="m", results=[{"exec_time": 0.5}]),
+    ]
+    path = tmp_path / "results.jsonl"
+    path.write_text(
+        "".join(json.dumps(r) + "\n" for r in results) + '{"task_id": "c", "res'
+    )
+
+    assert read_exec_times([path]) == {"a": 2.0, "b": 0.5}
+    assert path.read_text().endswith('"res')
+
+
+def test_expected_cost_falls_back_in_order() -> None:
+    """It should prefer history, then calibration, then the number of tests."""
+    task = Task(id="a", tests=["t1", "t2"], reference_runtime=0.3)
+
+    assert expected_cost(task, {"a": 4.0}) == 4.0
+    assert expected_cost(task, {"a": 4.0}, timeout=1.5) == 1.5
+    assert expected_cost(task, {}) == 0.3
+    del task["reference_runtime"]
+    assert expected_cost(task, {}) == 2 * SECONDS_PER_TEST
+
+
+def test_expected_cost_ignores_runtimes_from_other_sandboxes() -> None:
+    """It should only use a runtime calibrated under the given profile."""
+    task = Task(
+        id="a", tests=["t1", "t2"], reference_runtime=0.3, reference_sandbox="warm"
+    )
+
+    assert expected_cost(task, {}, sandbox="warm") == 0.3
+    assert expected_cost(task, {}, sandbox="cold") == 2 * SECONDS_PER_TEST
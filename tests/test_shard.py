@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+import pytest
+from typer.testing import CliRunner
+from coder_eval import evaluate, merge
+from coder_eval.bench import write_synthetic_benchmark
+from coder_eval.shard import in_shard, merge_sample_results, parse_shard
+from coder_eval.types import SampleResult
+
+
+def test_parse_shard() -> None:
+    """It should parse i/N and reject indices outside 1..N."""
+    assert parse_shard(None) is None
+    assert parse_shard("2/4") == (2, 4)
+    for value in ["0/4", "5/4", "1/0", "1-4", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_in_shard_partitions_completions() -> None:
+    """It should put every completion in exactly one shard, roughly evenly."""
+    keys = [("m", f"task_{t}", idx) for t in range(50) for idx in range(20)]
+    counts = [sum(in_shard(*key, (i, 4)) for key in keys) for i in range(1, 5)]
+
+    assert sum(counts) == len(keys)
+    assert all(
+        sum(in_shard(*key, (i, 4)) for i in range(1, 5)) == 1 for key in keys[:100]
+    )
+    assert min(counts) > len(keys) / 4 * 0.8
+
+
+def test_merge_sample_results_checks_coverage() -> None:
+    """It should reorder executions by index and reject gaps and overlaps."""
+    first = SampleResult(
+        task_id="t",
+        model_name="m",
+        results=[{"returncode": 1}],
+        completion_indices=[2],
+        num_completions=3,
+    )
+    second = SampleResult(
+        task_id="t",
+        model_name="m",
+        results=[{"returncode": 0}, {"returncode": 1}],
+        completion_indices=[0, 1],
+        num_completions=3,
+    )
+
+    merged = merge_sample_results([first, second])
+    assert [r["returncode"] for r in merged["results"]] == [0, 1, 1]
+    assert merged["num_passed"] == 1 and merged["passed_any"]
+    assert "completion_indices" not in merged
+
+    with pytest.raises(ValueError, match="more than one shard"):
+        merge_sample_results([first, second, first])
+    with pytest.raises(ValueError, match="in no shard"):
+        merge_sample_results([second])
+
+
+def test_sharded_runs_merge_to_the_full_run(tmp_path: Path) -> None:
+    """It should score merged shards exactly like one unsharded run."""
+    bench_path, samples_path = write_synthetic_benchmark(tmp_path, 60, 6)
+
+    def run(out: str, *extra: str) -> Path:
+        result = CliRunner().invoke(
+            evaluate.app,
+            [
+                "--path",
+                str(bench_path),
+                "--samples",
+                str(samples_path),
+                "--output-dir",
+                str(tmp_path / out),
+                "--sandbox",
+                "stub",
+                "--stub-failure-rate",
+                "0.5",
+                "--no-cache",
+                "--k",
+                "1,5",
+                *extra,
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        return next((tmp_path / out).iterdir())
+
+    def shard_args(dirs: list[Path]) -> list[str]:
+        return [arg for d in dirs for arg in ["--shard-dir", str(d)]]
+
+    full_dir = run("full")
+    shard_dirs = [run(f"shard{i}", "--shard", f"{i}/3") for i in range(1, 3)]
+    merged_dir = tmp_path / "merged"
+
+    incomplete = CliRunner().invoke(
+        merge.app, [*shard_args(shard_dirs), "--output-dir", str(merged_dir)]
+    )
+    assert incomplete.exit_code != 0
+    assert "Missing shards: 3/3" in incomplete.output
+
+    shard_dirs.append(run("shard3", "--shard", "3/3"))
+    result = CliRunner().invoke(
+        merge.app,
+        [*shard_args(shard_dirs), "--output-dir", str(merged_dir), "--k", "1,5"],
+    )
+    assert result.exit_code == 0, result.output
+
+    def load(results_dir: Path) -> tuple[list[dict], dict]:
+        rows = [json.loads(line) for line in (results_dir / "results.jsonl").open()]
+        summary = json.loads((results_dir / "summary.json").read_text())
+        return rows, summary
+
+    full_rows, full_summary = load(full_dir)
+    merged_rows, merged_summary = load(merged_dir)
+    assert [(r["task_id"], r["num_passed"]) for r in merged_rows] == [
+        (r["task_id"], r["num_passed"]) for r in full_rows
+    ]
+    assert [[er["script"] for er in r["results"]] for r in merged_rows] == [
+        [er["script"] for er in r["results"]] for r in full_rows
+    ]
+    assert merged_summary["pass_at_k"] == full_summary["pass_at_k"]
+    assert json.loads((shard_dirs[0] / "summary.json").read_text())["shard"] == "1/3"
+
+    duplicated = CliRunner().invoke(
+        merge.app,
+        [*shard_args([*shard_dirs, shard_dirs[0]]), "--output-dir", str(merged_dir)],
+    )
+    assert duplicated.exit_code != 0
+    assert "given twice" in duplicated.output